@@ -0,0 +1,74 @@
+import time
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core import signing
+from django.http import HttpResponse
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework.renderers import JSONRenderer
+
+from .tokens import read_token, revocations, stamps, user_from_claims
+
+
+class NotAuthenticated(Exception):
+    pass
+
+
+def json_response(data, status=200):
+    return HttpResponse(JSONRenderer().render(data), content_type="application/json", status=status)
+
+
+async def aauthenticate(request):
+    """
+    Async counterpart of the DRF authenticator in settings: a signed bearer
+    token. Raises NotAuthenticated with the same messages DRF would use.
+    """
+    header = request.headers.get("Authorization", "").split()
+    if header and header[0].lower() == "bearer":
+        if len(header) != 2:
+            raise NotAuthenticated("Invalid token header.")
+        try:
+            claims = read_token(header[1])
+        except signing.SignatureExpired:
+            raise NotAuthenticated("Token has expired.")
+        except signing.BadSignature:
+            raise NotAuthenticated("Invalid token.")
+
+        # the revocation list only hits the DB when its sync is due
+        if time.time() - revocations.synced_at >= settings.REVOCATION_SYNC_SECONDS:
+            await sync_to_async(revocations.sync)()
+        if stamps.due(claims["u"]):
+            await sync_to_async(stamps.fetch)(claims["u"])
+        if claims["j"] in revocations.revoked or not stamps.current(claims):
+            raise NotAuthenticated("Token has been revoked.")
+
+        return user_from_claims(claims)
+
+    raise NotAuthenticated("Authentication credentials were not provided.")
+
+
+def async_read_view(sync_view):
+    """
+    Serve GET/HEAD from the decorated coroutine `(request, user, ...)` and
+    hand every other method to `sync_view`, the DRF view for the same URL,
+    which keeps its own CSRF and permission handling.
+    """
+    def decorator(handler):
+        @csrf_exempt
+        @wraps(handler)
+        async def view(request, *args, **kwargs):
+            if request.method not in ("GET", "HEAD"):
+                return await sync_to_async(sync_view)(request, *args, **kwargs)
+            try:
+                user = await aauthenticate(request)
+            except NotAuthenticated as e:
+                response = json_response({"detail": str(e)}, status=401)
+                response["WWW-Authenticate"] = "Bearer"
+                return response
+            request.user = user
+            return await handler(request, user, *args, **kwargs)
+        # the profiler runs this instead, as it can't follow the coroutine
+        view.sync_view = sync_view
+        return view
+    return decorator
@@ -0,0 +1,57 @@
+import base64
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.test.utils import (
+    setup_databases, setup_test_environment, teardown_databases, teardown_test_environment,
+)
+from rest_framework.authentication import BasicAuthentication
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from accounts.authentication import SignedTokenAuthentication
+from accounts.tokens import issue_token
+from startups.cache import isolated_version_cache
+
+
+class Command(BaseCommand):
+    help = "Compare per-request authentication cost: HTTP Basic vs signed tokens."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=50)
+
+    def time_auth(self, authenticator, header, n):
+        factory = APIRequestFactory()
+        start = time.perf_counter()
+        for _ in range(n):
+            request = Request(factory.get("/api/startups/", HTTP_AUTHORIZATION=header))
+            user, _auth = authenticator.authenticate(request)
+            assert user is not None
+        return (time.perf_counter() - start) * 1000 / n
+
+    def handle(self, *args, **options):
+        n = options["requests"]
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            with isolated_version_cache():
+                user = User.objects.create_user("bench-auth-user", password="bench-auth-password")
+                basic = "Basic " + base64.b64encode(b"bench-auth-user:bench-auth-password").decode()
+                bearer = "Bearer " + issue_token(user)
+
+                # warm up the revocation list so its periodic sync isn't timed
+                self.time_auth(SignedTokenAuthentication(), bearer, 1)
+
+                basic_ms = self.time_auth(BasicAuthentication(), basic, n)
+                token_ms = self.time_auth(SignedTokenAuthentication(), bearer, n)
+        finally:
+            connections.close_all()
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+
+        self.stdout.write(f"requests:       {n}")
+        self.stdout.write(f"basic auth:     {basic_ms:.3f} ms/request")
+        self.stdout.write(f"signed token:   {token_ms:.3f} ms/request")
+        self.stdout.write(f"speedup:        {basic_ms / token_ms:.0f}x")
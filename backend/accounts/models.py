@@ -10,4 +10,14 @@ class Profile(models.Model):
     role = models.CharField(max_length=20, choices=ROLE_CHOICES)
 
     def __str__(self):
-        return f"{self.user.username} - {self.role}"
\ No newline at end of file
+        return f"{self.user.username} - {self.role}"
+
+
+class RevokedToken(models.Model):
+    """Signed-out auth tokens, kept until they would have expired anyway."""
+    jti = models.CharField(max_length=64, unique=True)
+    expires_at = models.DateTimeField()
+    revoked_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def __str__(self):
+        return self.jti
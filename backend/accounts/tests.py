@@ -1,3 +1,77 @@
-from django.test import TestCase
+from django.contrib.auth.models import User
+from django.test import AsyncClient, TestCase, override_settings
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from .models import Profile
+from .tokens import stamps
+
+
+# re-read stamps on every request, as every worker will within the window
+@override_settings(REVOCATION_SYNC_SECONDS=0)
+class TokenRevocationTests(TestCase):
+    URL = "/api/startups/"
+
+    def setUp(self):
+        self.user = User.objects.create_user("founder", password="pw-one-two-three")
+        Profile.objects.create(user=self.user, role="Founder")
+        self.client = APIClient()
+        response = self.client.post(
+            "/api/signin/", {"username": "founder", "password": "pw-one-two-three"}, format="json"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.bearer = {"HTTP_AUTHORIZATION": "Bearer " + response.json()["token"]}
+        self.addCleanup(stamps.stamps.clear)
+
+    def get(self):
+        return APIClient().get(self.URL, **self.bearer).status_code
+
+    def test_signin_creates_no_session(self):
+        self.assertNotIn("sessionid", self.client.cookies)
+        self.assertEqual(self.get(), 200)
+
+    def test_signout_revokes_the_token(self):
+        self.client.post("/api/signout/", **self.bearer)
+        self.assertEqual(self.get(), 401)
+
+    def test_password_change_revokes_the_token(self):
+        self.user.set_password("pw-four-five-six")
+        self.user.save()
+        self.assertEqual(self.get(), 401)
+
+    def test_deactivation_revokes_the_token(self):
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        self.assertEqual(self.get(), 401)
+
+    def test_demotion_revokes_the_token(self):
+        User.objects.filter(pk=self.user.pk).update(is_staff=True)
+        staff_token = {"HTTP_AUTHORIZATION": "Bearer " + APIClient().post(
+            "/api/signin/", {"username": "founder", "password": "pw-one-two-three"}, format="json"
+        ).json()["token"]}
+        User.objects.filter(pk=self.user.pk).update(is_staff=False)
+        self.assertEqual(APIClient().get(self.URL, **staff_token).status_code, 401)
+
+    def test_deletion_revokes_the_token(self):
+        self.user.delete()
+        self.assertEqual(self.get(), 401)
+
+
+class AsyncSessionTests(TestCase):
+    """The session, CSRF and messages middleware still work when run inline under ASGI."""
+
+    def setUp(self):
+        User.objects.create_user("staff", password="pw-one-two-three", is_staff=True, is_superuser=True)
+        self.login = {"username": "staff", "password": "pw-one-two-three", "next": "/admin/"}
+
+    async def test_admin_login_keeps_its_session(self):
+        client = AsyncClient()
+        response = await client.post("/admin/login/", self.login)
+        self.assertEqual(response.status_code, 302)
+        self.assertIn("sessionid", response.cookies)
+
+        response = await client.get("/admin/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["X-Frame-Options"], "DENY")
+
+    async def test_csrf_is_still_enforced(self):
+        client = AsyncClient(enforce_csrf_checks=True)
+        self.assertEqual((await client.post("/admin/login/", self.login)).status_code, 403)
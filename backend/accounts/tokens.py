@@ -0,0 +1,148 @@
+import secrets
+import threading
+import time
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.core import signing
+from django.utils.crypto import constant_time_compare, salted_hmac
+
+
+SALT = "accounts.tokens"
+
+# users whose stamps UserStamps keeps before dropping the stale ones
+MAX_CACHED_STAMPS = 10_000
+
+
+def user_stamp(password, is_active, is_staff):
+    """
+    Fingerprint of what a token must not outlive: the password hash, the
+    active flag and staff status. Changing any of them changes the stamp.
+    """
+    return salted_hmac(SALT, f"{password}|{is_active}|{is_staff}").hexdigest()[:16]
+
+
+def issue_token(user):
+    """
+    Signed, expiring token carrying everything authentication needs, so
+    verifying it is one HMAC check with no password hash and, most of the
+    time, no DB read (see UserStamps).
+    """
+    claims = {
+        "u": user.pk,
+        "n": user.get_username(),
+        "s": user.is_staff,
+        "v": user_stamp(user.password, user.is_active, user.is_staff),
+        "j": secrets.token_urlsafe(12),
+        "i": int(time.time()),
+    }
+    return signing.dumps(claims, salt=SALT)
+
+
+def read_token(token):
+    """Claims of a valid, unexpired token; raises signing.BadSignature otherwise."""
+    return signing.loads(token, salt=SALT, max_age=settings.AUTH_TOKEN_TTL)
+
+
+def user_from_claims(claims):
+    """User instance rebuilt from token claims without a query."""
+    from django.contrib.auth.models import User
+
+    user = User(pk=claims["u"], username=claims["n"], is_staff=claims["s"], is_active=True)
+    user._state.adding = False
+    user._state.db = "default"
+    return user
+
+
+def token_expiry(claims):
+    return datetime.fromtimestamp(claims["i"] + settings.AUTH_TOKEN_TTL, tz=dt_timezone.utc)
+
+
+class RevocationList:
+    """
+    In-process copy of revoked token ids. The shared RevokedToken table is
+    re-read at most every REVOCATION_SYNC_SECONDS, so a signout reaches every
+    worker within that window while normal requests never touch the DB.
+    """
+
+    def __init__(self):
+        self.revoked = {}  # jti -> expiry timestamp
+        self.synced_at = 0.0
+        self.lock = threading.Lock()
+
+    def add(self, jti, expires_at):
+        with self.lock:
+            self.revoked[jti] = expires_at.timestamp()
+
+    def sync(self):
+        from .models import RevokedToken
+
+        now = time.time()
+        if now - self.synced_at < settings.REVOCATION_SYNC_SECONDS:
+            return
+        with self.lock:
+            if now - self.synced_at < settings.REVOCATION_SYNC_SECONDS:
+                return
+            since = datetime.fromtimestamp(self.synced_at, tz=dt_timezone.utc)
+            for jti, expires_at in RevokedToken.objects.filter(
+                revoked_at__gte=since - timedelta(seconds=settings.REVOCATION_SYNC_SECONDS)
+            ).values_list("jti", "expires_at"):
+                self.revoked[jti] = expires_at.timestamp()
+            self.revoked = {j: exp for j, exp in self.revoked.items() if exp > now}
+            self.synced_at = now
+
+    def __contains__(self, jti):
+        self.sync()
+        return jti in self.revoked
+
+
+revocations = RevocationList()
+
+
+class UserStamps:
+    """
+    In-process copy of users' current stamps. A user's stamp is re-read at
+    most every REVOCATION_SYNC_SECONDS, so deleting or deactivating a user,
+    demoting them or changing their password cuts off their tokens on every
+    worker within that window, at one primary-key query per active user per
+    window.
+    """
+
+    def __init__(self):
+        self.stamps = {}  # user pk -> (stamp, or None for no such active user, fetched_at)
+        self.lock = threading.Lock()
+
+    def due(self, pk):
+        entry = self.stamps.get(pk)
+        return entry is None or time.time() - entry[1] >= settings.REVOCATION_SYNC_SECONDS
+
+    def fetch(self, pk):
+        from django.contrib.auth.models import User
+
+        row = (
+            User.objects.filter(pk=pk, is_active=True)
+            .values_list("password", "is_active", "is_staff").first()
+        )
+        now = time.time()
+        with self.lock:
+            if len(self.stamps) >= MAX_CACHED_STAMPS:
+                cutoff = now - settings.REVOCATION_SYNC_SECONDS
+                self.stamps = {k: v for k, v in self.stamps.items() if v[1] > cutoff}
+            self.stamps[pk] = (user_stamp(*row) if row else None, now)
+
+    def forget(self, pk):
+        with self.lock:
+            self.stamps.pop(pk, None)
+
+    def current(self, claims):
+        """Whether the claims' stamp is still the user's; checks the cached copy only."""
+        entry = self.stamps.get(claims["u"])
+        return bool(entry and entry[0] and constant_time_compare(entry[0], claims.get("v", "")))
+
+    def valid(self, claims):
+        if self.due(claims["u"]):
+            self.fetch(claims["u"])
+        return self.current(claims)
+
+
+stamps = UserStamps()
@@ -1,10 +1,12 @@
 from django.contrib.auth.forms import UserCreationForm, AuthenticationForm
-from django.contrib.auth import authenticate, login, logout
+from django.contrib.auth import authenticate
 from django.contrib.auth.models import User
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
-from .models import Profile
+from django.utils import timezone
+from .models import Profile, RevokedToken
+from .tokens import issue_token, revocations, token_expiry
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
@@ -48,13 +50,12 @@ def signin(request):
     if user is None:
         return Response({"error": "Invalid credentials"}, status=400)
 
-    # optional: log user into Django session (not needed if React just uses tokens/localStorage)
-    login(request, user)
-
     return Response({
         "message": "Login successful",
         "username": user.username,
-        "role": getattr(user.profile, "role", None)
+        "role": getattr(user.profile, "role", None),
+        # send as "Authorization: Bearer <token>"; checked without a DB hit
+        "token": issue_token(user),
     })
 
 @api_view(['GET'])
@@ -70,5 +71,11 @@ def check_auth(request):
 @api_view(['POST'])
 @permission_classes([AllowAny])
 def signout(request):
-    logout(request)  # only relevant if using Django sessions
+    # revoke the bearer token, if the request carried one
+    claims = request.auth if isinstance(request.auth, dict) else None
+    if claims:
+        expires_at = token_expiry(claims)
+        RevokedToken.objects.filter(expires_at__lt=timezone.now()).delete()
+        RevokedToken.objects.get_or_create(jti=claims["j"], defaults={"expires_at": expires_at})
+        revocations.add(claims["j"], expires_at)
     return Response({"message": "Logged out successfully"})
\ No newline at end of file
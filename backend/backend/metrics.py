@@ -0,0 +1,341 @@
+"""
+Per-view request metrics in Prometheus text format.
+
+Each worker process aggregates into a dict in memory and writes a snapshot
+to its own file under METRICS_DIR every METRICS_FLUSH_SECONDS; the scrape
+endpoint sums the snapshots of every process, so any worker can answer.
+The worker answering a scrape absorbs the snapshots of processes that have
+exited into its own totals, so the directory stays bounded and counters
+never go backwards.
+"""
+import bisect
+import contextvars
+import functools
+import hmac
+import json
+import os
+import threading
+import time
+import uuid
+from collections import defaultdict
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.http import HttpResponse, HttpResponseForbidden
+
+
+# request latency histogram buckets, in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+METRICS = {
+    # name: (type, help)
+    "http_requests_total": ("counter", "Requests by view, method and status code."),
+    "http_request_duration_seconds": ("histogram", "Request latency by view."),
+    "http_request_db_queries": ("summary", "Database queries per request by view."),
+    "http_request_db_seconds": ("summary", "Database time per request by view."),
+    "http_response_bytes": ("summary", "Response body size by view."),
+}
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class Registry:
+    """
+    Metric samples for this process, keyed by (name, labels). Histograms
+    keep per-bucket (not cumulative) counts until they are rendered.
+    """
+
+    def __init__(self, directory, flush_seconds):
+        self.directory = directory
+        self.flush_seconds = flush_seconds
+        self.pid = os.getpid()
+        # unique per process start, so a recycled pid never overwrites a file
+        self.path = os.path.join(directory, f"{self.pid}-{uuid.uuid4().hex[:8]}.json")
+        self.samples = defaultdict(float)
+        self.lock = threading.Lock()
+        self.flushed_at = time.monotonic()
+
+    def observe(self, view, method, status_code, seconds, queries, db_seconds, size):
+        labels = (("view", view),)
+        index = bisect.bisect_left(LATENCY_BUCKETS, seconds)
+        le = str(LATENCY_BUCKETS[index]) if index < len(LATENCY_BUCKETS) else "+Inf"
+        samples = self.samples
+        with self.lock:
+            samples["http_requests_total", labels + (("method", method), ("status", str(status_code)))] += 1
+            samples["http_request_duration_seconds_bucket", labels + (("le", le),)] += 1
+            samples["http_request_duration_seconds_sum", labels] += seconds
+            samples["http_request_duration_seconds_count", labels] += 1
+            samples["http_request_db_queries_sum", labels] += queries
+            samples["http_request_db_queries_count", labels] += 1
+            samples["http_request_db_seconds_sum", labels] += db_seconds
+            samples["http_request_db_seconds_count", labels] += 1
+            samples["http_response_bytes_sum", labels] += size
+            samples["http_response_bytes_count", labels] += 1
+        if time.monotonic() - self.flushed_at >= self.flush_seconds:
+            self.flush()
+
+    def flush(self):
+        """Write this process's totals to its snapshot file."""
+        with self.lock:
+            self.flushed_at = time.monotonic()
+            snapshot = [[name, list(labels), value] for (name, labels), value in self.samples.items()]
+        os.makedirs(self.directory, exist_ok=True)
+        tmp = f"{self.path}.{threading.get_ident()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(snapshot, f)
+        os.replace(tmp, self.path)
+
+    def collect(self):
+        """Sum of the snapshots of every process, this one flushed first."""
+        self.absorb_dead()
+        self.flush()
+        totals = defaultdict(float)
+        for entry in os.scandir(self.directory):
+            if not entry.name.endswith(".json"):
+                continue
+            snapshot = _read_snapshot(entry.path)
+            if snapshot is None:
+                continue  # replaced or half-written mid-read; next scrape gets it
+            for name, labels, value in snapshot:
+                totals[name, tuple(tuple(pair) for pair in labels)] += value
+        return totals
+
+    def absorb_dead(self):
+        """Move the totals of exited processes into this one's, deleting their files."""
+        os.makedirs(self.directory, exist_ok=True)
+        for entry in os.scandir(self.directory):
+            pid = _snapshot_pid(entry.name)
+            if pid is None or pid == self.pid or _process_alive(pid):
+                continue
+            # renaming claims the file: concurrent scrapes can't both absorb it
+            claimed = f"{entry.path}.{self.pid}.absorbing"
+            try:
+                os.rename(entry.path, claimed)
+            except OSError:
+                continue
+            snapshot = _read_snapshot(claimed)
+            if snapshot is not None:
+                with self.lock:
+                    for name, labels, value in snapshot:
+                        self.samples[name, tuple(tuple(pair) for pair in labels)] += value
+                self.flush()
+            os.remove(claimed)
+
+
+def _read_snapshot(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _snapshot_pid(filename):
+    pid, sep, rest = filename.partition("-")
+    if not sep or not rest.endswith(".json") or not pid.isdigit():
+        return None
+    return int(pid)
+
+
+def _process_alive(pid):
+    if os.name != "posix":
+        return True  # os.kill(pid, 0) would terminate it on Windows; keep the file
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass  # exists, owned by another user
+    return True
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_registry():
+    global _registry
+    # first use in this process, or a worker forked after the parent made one
+    if _registry is None or _registry.pid != os.getpid():
+        with _registry_lock:
+            if _registry is None or _registry.pid != os.getpid():
+                _registry = Registry(settings.METRICS_DIR, settings.METRICS_FLUSH_SECONDS)
+    return _registry
+
+
+def _escape(value):
+    return value.replace("\\", r"\\").replace('"', r"\"").replace("\n", r"\n")
+
+
+def _format(name, labels, value):
+    if labels:
+        rendered = ",".join(f'{key}="{_escape(val)}"' for key, val in labels)
+        name = f"{name}{{{rendered}}}"
+    return f"{name} {int(value) if value.is_integer() else repr(value)}"
+
+
+def render(totals):
+    """Prometheus text exposition of `totals`."""
+    by_metric = defaultdict(list)
+    for (name, labels), value in sorted(totals.items()):
+        base = name
+        for suffix in ("_bucket", "_sum", "_count"):
+            if name.endswith(suffix) and name[: -len(suffix)] in METRICS:
+                base = name[: -len(suffix)]
+        by_metric[base].append((name, labels, value))
+
+    lines = []
+    for base, (kind, help_text) in METRICS.items():
+        samples = by_metric.get(base)
+        if not samples:
+            continue
+        lines.append(f"# HELP {base} {help_text}")
+        lines.append(f"# TYPE {base} {kind}")
+        if kind != "histogram":
+            lines.extend(_format(*sample) for sample in samples)
+            continue
+
+        buckets = defaultdict(dict)
+        for name, labels, value in samples:
+            if name.endswith("_bucket"):
+                le = dict(labels)["le"]
+                buckets[tuple(p for p in labels if p[0] != "le")][le] = value
+        for labels, counts in buckets.items():
+            running = 0.0
+            for le in [str(b) for b in LATENCY_BUCKETS] + ["+Inf"]:
+                running += counts.get(le, 0)
+                lines.append(_format(f"{base}_bucket", labels + (("le", le),), running))
+        lines.extend(
+            _format(name, labels, value) for name, labels, value in samples
+            if not name.endswith("_bucket")
+        )
+    return "\n".join(lines) + "\n"
+
+
+class QueryTimer:
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+
+# the timer of the request being served; a context variable so it follows
+# sync_to_async into the thread (and thread-local connection) running the ORM
+_current_timer = contextvars.ContextVar("query_timer", default=None)
+
+
+def _time_query(execute, sql, params, many, context):
+    timer = _current_timer.get()
+    if timer is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timer.seconds += time.perf_counter() - start
+        timer.count += 1
+
+
+def _install_query_timer(sender=None, connection=None, **kwargs):
+    if _time_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_time_query)
+
+
+connection_created.connect(_install_query_timer, dispatch_uid="metrics_query_timer")
+
+
+class MetricsMiddleware:
+    """Record count, latency, DB queries/time, size and status per resolved view."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        # connections opened before the middleware loaded missed the signal
+        for connection in connections.all(initialized_only=True):
+            _install_query_timer(connection=connection)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        timer = QueryTimer()
+        token = _current_timer.set(timer)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current_timer.reset(token)
+        self.record(request, response, time.perf_counter() - start, timer)
+        return response
+
+    async def __acall__(self, request):
+        timer = QueryTimer()
+        token = _current_timer.set(timer)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current_timer.reset(token)
+        self.record(request, response, time.perf_counter() - start, timer)
+        return response
+
+    def record(self, request, response, seconds, timer):
+        match = getattr(request, "resolver_match", None)
+        view = match.view_name if match else "<unresolved>"
+        observe = functools.partial(
+            get_registry().observe,
+            view, request.method, response.status_code, seconds, timer.count, timer.seconds,
+        )
+        if not response.streaming:
+            observe(len(response.content))
+        elif response.has_header("Content-Length"):
+            # file downloads: left unwrapped so wsgi.file_wrapper still applies
+            observe(int(response["Content-Length"]))
+        else:
+            # exports: the size is known once the last chunk has gone out
+            content = response.streaming_content
+            counted = _acount_bytes if response.is_async else _count_bytes
+            response.streaming_content = counted(content, observe)
+
+
+def _count_bytes(chunks, done):
+    size = 0
+    try:
+        for chunk in chunks:
+            size += len(chunk)
+            yield chunk
+    finally:
+        done(size)
+
+
+async def _acount_bytes(chunks, done):
+    size = 0
+    try:
+        async for chunk in chunks:
+            size += len(chunk)
+            yield chunk
+    finally:
+        done(size)
+
+
+def _may_scrape(request):
+    token = settings.METRICS_TOKEN
+    if token:
+        supplied = request.headers.get("Authorization", "").removeprefix("Bearer ").strip()
+        if hmac.compare_digest(supplied.encode(), token.encode()):
+            return True
+    return request.META.get("REMOTE_ADDR") in settings.METRICS_ALLOWED_IPS
+
+
+def metrics_view(request):
+    """
+    Prometheus scrape endpoint for holders of METRICS_TOKEN and clients in
+    METRICS_ALLOWED_IPS; closed to everyone while neither is set.
+    """
+    if not _may_scrape(request):
+        return HttpResponseForbidden()
+    return HttpResponse(render(get_registry().collect()), content_type=CONTENT_TYPE)
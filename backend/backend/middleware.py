@@ -0,0 +1,81 @@
+"""
+Stock Django middleware, minus the thread hops under ASGI.
+
+MiddlewareMixin runs process_request and process_response through
+sync_to_async, one hop to the shared sync thread each, even when the hook
+only reads and sets headers. That is most of what an async read view costs
+over the sync one. These subclasses run such hooks inline on the event loop,
+and only hop when the hook may reach the session store.
+"""
+from asgiref.sync import sync_to_async
+from django.contrib.auth import middleware as auth
+from django.contrib.messages import middleware as messages
+from django.contrib.sessions import middleware as sessions
+from django.middleware import clickjacking, common, csrf, security
+
+
+class InlineHooksMixin:
+    """Run the hooks on the event loop; for hooks that do no I/O."""
+
+    def needs_thread(self, request):
+        return False
+
+    async def __acall__(self, request):
+        response = None
+        if hasattr(self, "process_request"):
+            response = self.process_request(request)
+        response = response or await self.get_response(request)
+        if hasattr(self, "process_response"):
+            if self.needs_thread(request):
+                return await sync_to_async(self.process_response, thread_sensitive=True)(request, response)
+            response = self.process_response(request, response)
+        return response
+
+
+class SecurityMiddleware(InlineHooksMixin, security.SecurityMiddleware):
+    pass
+
+
+class SessionMiddleware(InlineHooksMixin, sessions.SessionMiddleware):
+    # process_request only builds the lazy store; the response saves it
+    # once it has been read or written
+    def needs_thread(self, request):
+        return request.session.accessed
+
+
+class CommonMiddleware(InlineHooksMixin, common.CommonMiddleware):
+    pass
+
+
+class CsrfViewMiddleware(InlineHooksMixin, csrf.CsrfViewMiddleware):
+    # the token lives in a cookie (CSRF_USE_SESSIONS is off)
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        if self.async_mode:
+            # the handler adapts view middleware to its mode; give it a native one
+            self.process_view = self.aprocess_view
+
+    async def aprocess_view(self, request, callback, callback_args, callback_kwargs):
+        # only unsafe methods on protected views read the body
+        if getattr(callback, "csrf_exempt", False) or request.method in ("GET", "HEAD", "OPTIONS", "TRACE"):
+            return super().process_view(request, callback, callback_args, callback_kwargs)
+        return await sync_to_async(super().process_view, thread_sensitive=True)(
+            request, callback, callback_args, callback_kwargs
+        )
+
+
+class AuthenticationMiddleware(InlineHooksMixin, auth.AuthenticationMiddleware):
+    # request.user stays lazy; the session and user are loaded on first use
+    pass
+
+
+class MessageMiddleware(InlineHooksMixin, messages.MessageMiddleware):
+    # the storage only writes when messages were read or added
+    def needs_thread(self, request):
+        storage = getattr(request, "_messages", None)
+        return storage is not None and (storage.used or storage.added_new)
+
+
+class XFrameOptionsMiddleware(InlineHooksMixin, clickjacking.XFrameOptionsMiddleware):
+    pass
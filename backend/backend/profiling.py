@@ -0,0 +1,319 @@
+"""
+Opt-in per-request profiling.
+
+A request is profiled when a staff user asks for it (``X-Profile: 1``
+header or ``?_profile=1``) or when it is picked by PROFILING_SAMPLE_RATE.
+The view runs under cProfile with every SQL statement captured; SELECTs
+are EXPLAINed afterwards. cProfile can't follow a coroutine across awaits,
+nor the ORM onto its worker thread, so a coroutine view is profiled through
+the sync view it stands in for (see async_read_view), and skipped with a
+warning when it has none. Reports go to PROFILING_DIR, which keeps only the
+newest PROFILING_MAX_REPORTS, and are listed and downloaded by staff from
+/api/debug/profiles/.
+"""
+import cProfile
+import io
+import json
+import logging
+import os
+import pstats
+import random
+import re
+import time
+import uuid
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core import signing
+from django.db import DatabaseError, connections
+from django.http import FileResponse, Http404
+from django.utils import timezone
+from rest_framework import permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from accounts.tokens import read_token, revocations
+
+
+logger = logging.getLogger(__name__)
+
+REPORT_ID_RE = re.compile(r"^\d+-[0-9a-f]{8}$")
+
+# statements EXPLAINed per report, slowest first
+MAX_EXPLAINED = 25
+# functions listed in the text summary
+MAX_STATS_ROWS = 60
+
+
+def _is_staff(request):
+    # the API authenticates in DRF, after middleware, so read the token here;
+    # staff is checked against the DB, not the claim, as the report leaks
+    # other users' requests. Only reached when profiling is asked for.
+    from django.contrib.auth.models import User
+
+    header = request.headers.get("Authorization", "").split()
+    if len(header) == 2 and header[0].lower() == "bearer":
+        try:
+            claims = read_token(header[1])
+        except signing.BadSignature:
+            return False
+        if claims["j"] in revocations:
+            return False
+        return User.objects.filter(pk=claims["u"], is_active=True, is_staff=True).exists()
+    user = getattr(request, "user", None)
+    return bool(user and user.is_authenticated and user.is_active and user.is_staff)
+
+
+def _requested(request):
+    return request.headers.get("X-Profile") == "1" or request.GET.get("_profile") == "1"
+
+
+class QueryLog:
+    """execute_wrapper recording every statement with its time and connection."""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append({
+                "alias": context["connection"].alias,
+                "sql": sql,
+                "params": params,
+                "many": many,
+                "ms": round((time.perf_counter() - start) * 1000, 3),
+            })
+
+
+def explain(queries):
+    """Attach a plan to the slowest distinct SELECTs."""
+    seen = set()
+    for query in sorted(queries, key=lambda q: -q["ms"]):
+        if len(seen) >= MAX_EXPLAINED:
+            break
+        sql = query["sql"]
+        if query["many"] or sql in seen or not sql.lstrip().upper().startswith("SELECT"):
+            continue
+        seen.add(sql)
+        connection = connections[query["alias"]]
+        prefix = "EXPLAIN QUERY PLAN " if connection.vendor == "sqlite" else "EXPLAIN "
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(prefix + sql, query["params"])
+                query["plan"] = [" | ".join(str(col) for col in row) for row in cursor.fetchall()]
+        except DatabaseError as e:
+            query["plan"] = [f"EXPLAIN failed: {e}"]
+
+
+class ReportStore:
+    """Profiling reports on disk, keeping the newest `max_reports`."""
+
+    def __init__(self, directory, max_reports):
+        self.directory = directory
+        self.max_reports = max_reports
+
+    def path(self, report_id, ext):
+        if not REPORT_ID_RE.match(report_id):
+            raise Http404("No such report.")
+        return os.path.join(self.directory, f"{report_id}.{ext}")
+
+    def save(self, report, profile):
+        os.makedirs(self.directory, exist_ok=True)
+        report_id = report["id"]
+        profile.dump_stats(self.path(report_id, "prof"))
+        # JSON last: a report is listed only once both files exist
+        tmp = self.path(report_id, "json") + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(report, f)
+        os.replace(tmp, self.path(report_id, "json"))
+        self.trim()
+
+    def ids(self):
+        """Report ids, newest first."""
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        ids = [n[:-5] for n in names if n.endswith(".json") and REPORT_ID_RE.match(n[:-5])]
+        return sorted(ids, key=lambda i: int(i.split("-")[0]), reverse=True)
+
+    def trim(self):
+        for report_id in self.ids()[self.max_reports:]:
+            for ext in ("json", "prof"):
+                try:
+                    os.remove(self.path(report_id, ext))
+                except FileNotFoundError:
+                    pass  # another worker trimmed it first
+
+    def load(self, report_id):
+        try:
+            with open(self.path(report_id, "json")) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            raise Http404("No such report.")
+
+
+def get_store():
+    return ReportStore(settings.PROFILING_DIR, settings.PROFILING_MAX_REPORTS)
+
+
+class ProfilingMiddleware:
+    """
+    Profile the view for requests that opt in. Goes last in MIDDLEWARE, so
+    CSRF and the other view middleware have already run. Runs natively in
+    both modes, so ASGI requests aren't funnelled through one thread.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+            # the handler adapts view middleware to its mode; give it a native one
+            self.process_view = self.aprocess_view
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        return await self.get_response(request)
+
+    def should_profile(self, request):
+        if _requested(request) and _is_staff(request):
+            return "requested"
+        return self.sampled()
+
+    def sampled(self):
+        rate = settings.PROFILING_SAMPLE_RATE
+        if rate and random.random() < rate:
+            return "sampled"
+        return None
+
+    def profiled_view(self, request, view_func):
+        """The view to run under the profiler, or None to skip the request."""
+        if not iscoroutinefunction(view_func):
+            return view_func
+        sync_view = getattr(view_func, "sync_view", None)
+        if sync_view is None:
+            logger.warning(
+                "Profiling skipped for %s %s: coroutine view without a sync counterpart",
+                request.method, request.path,
+            )
+        return sync_view
+
+    async def aprocess_view(self, request, view_func, view_args, view_kwargs):
+        # the staff check reads the DB; skip the thread hop when not asked
+        if _requested(request):
+            trigger = await sync_to_async(self.should_profile)(request)
+        else:
+            trigger = self.sampled()
+        if not trigger:
+            return None
+        profiled = self.profiled_view(request, view_func)
+        if profiled is None:
+            return None
+        # sync views run on the thread Django would have used for them anyway
+        return await sync_to_async(self.profile_view)(
+            request, trigger, profiled, view_args, view_kwargs, async_view=profiled is not view_func
+        )
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        trigger = self.should_profile(request)
+        if not trigger:
+            return None
+        profiled = self.profiled_view(request, view_func)
+        if profiled is None:
+            return None
+        return self.profile_view(
+            request, trigger, profiled, view_args, view_kwargs, async_view=profiled is not view_func
+        )
+
+    def profile_view(self, request, trigger, view_func, view_args, view_kwargs, async_view=False):
+
+        log = QueryLog()
+        profile = cProfile.Profile()
+        started = timezone.now()
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(log))
+            profile.enable()
+            try:
+                response = view_func(request, *view_args, **view_kwargs)
+                # DRF renders lazily; include it in the profile
+                if hasattr(response, "render") and callable(response.render):
+                    response = response.render()
+            finally:
+                profile.disable()
+        elapsed = time.perf_counter() - start
+
+        explain(log.queries)
+        stats = io.StringIO()
+        pstats.Stats(profile, stream=stats).sort_stats("cumulative").print_stats(MAX_STATS_ROWS)
+
+        report_id = f"{time.time_ns()}-{uuid.uuid4().hex[:8]}"
+        match = request.resolver_match
+        user = getattr(request, "user", None)
+        get_store().save({
+            "id": report_id,
+            "created_at": started.isoformat(),
+            "trigger": trigger,
+            "method": request.method,
+            "path": request.get_full_path(),
+            "view": match.view_name if match else None,
+            # the sync view profiled in place of the coroutine one routed to
+            "async_view": async_view,
+            "user": user.pk if user is not None and user.is_authenticated else None,
+            "status": response.status_code,
+            "duration_ms": round(elapsed * 1000, 3),
+            "sql_count": len(log.queries),
+            "sql_ms": round(sum(q["ms"] for q in log.queries), 3),
+            # params are other users' data (passwords, emails); EXPLAIN used them already
+            "sql": [{k: v for k, v in q.items() if k != "params"} for q in log.queries],
+            "stats": stats.getvalue(),
+        }, profile)
+        response["X-Profile-Id"] = report_id
+        return response
+
+
+# Staff: list stored profiling reports, newest first
+class ProfileReportList(APIView):
+    permission_classes = [permissions.IsAdminUser]
+
+    SUMMARY_FIELDS = ("id", "created_at", "trigger", "method", "path", "view", "user",
+                      "async_view", "status", "duration_ms", "sql_count", "sql_ms")
+
+    def get(self, request):
+        store = get_store()
+        reports = []
+        for report_id in store.ids():
+            try:
+                report = store.load(report_id)
+            except Http404:
+                continue  # trimmed while listing
+            reports.append({field: report.get(field) for field in self.SUMMARY_FIELDS})
+        return Response(reports, status=status.HTTP_200_OK)
+
+
+# Staff: one report as JSON, or ?download=prof for the raw cProfile dump
+# (open with snakeviz, or pstats / flameprof for a flame graph)
+class ProfileReportDetail(APIView):
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request, report_id):
+        store = get_store()
+        if request.query_params.get("download") == "prof":
+            path = store.path(report_id, "prof")
+            if not os.path.exists(path):
+                raise Http404("No such report.")
+            return FileResponse(open(path, "rb"), as_attachment=True, filename=f"{report_id}.prof")
+        return Response(store.load(report_id), status=status.HTTP_200_OK)
@@ -10,6 +10,8 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
+import tempfile
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -52,33 +54,73 @@ INSTALLED_APPS = [
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
+# Pitch deck uploads are streamed to disk and hashed on the way in
+# (startups.uploads.HashedUploadsMixin); anything over the limit is dropped
+# mid-stream.
+PITCH_DECK_MAX_SIZE = 20 * 1024 * 1024
+
+# Let the front-end server push pitch deck bytes: None (stream from Django),
+# "x-sendfile" (Apache/lighttpd) or "x-accel-redirect" (nginx, internal
+# location mapped at PITCH_DECK_ACCEL_PREFIX onto MEDIA_ROOT).
+PITCH_DECK_SENDFILE = os.environ.get('PITCH_DECK_SENDFILE') or None
+PITCH_DECK_ACCEL_PREFIX = '/protected-media/'
+
 
 MIDDLEWARE = [
-    'django.middleware.security.SecurityMiddleware',
-    'django.contrib.sessions.middleware.SessionMiddleware',
-    'django.middleware.common.CommonMiddleware',
-    'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
-    'django.contrib.messages.middleware.MessageMiddleware',
-    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    # outermost, so its timings cover the rest of the stack
+    'backend.metrics.MetricsMiddleware',
+    # the stock middleware, with hooks that do no I/O run inline under ASGI
+    'backend.middleware.SecurityMiddleware',
+    'backend.middleware.SessionMiddleware',
+    'backend.middleware.CommonMiddleware',
+    'backend.middleware.CsrfViewMiddleware',
+    'backend.middleware.AuthenticationMiddleware',
+    'backend.middleware.MessageMiddleware',
+    'backend.middleware.XFrameOptionsMiddleware',
     
     #
     'corsheaders.middleware.CorsMiddleware',
+    # last, so its process_view runs after CSRF and wraps only the view
+    'backend.profiling.ProfilingMiddleware',
 
 ]
 
 # REST Framework settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.SessionAuthentication',
-        "rest_framework.authentication.BasicAuthentication",
-
+        # signed bearer tokens only: no password hash or DB read per request,
+        # and no session for the API to keep
+        'accounts.authentication.SignedTokenAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
 }
 
+# Signed auth tokens (accounts.tokens)
+AUTH_TOKEN_TTL = 12 * 60 * 60  # seconds
+REVOCATION_SYNC_SECONDS = 5
+
+# Per-view request metrics (backend.metrics), scraped at /metrics/. Each
+# worker writes its totals under METRICS_DIR. Scrapers send
+# "Authorization: Bearer <METRICS_TOKEN>" or connect from an address in
+# METRICS_ALLOWED_IPS (comma-separated); REMOTE_ADDR is the proxy's behind
+# one, so prefer the token there.
+METRICS_DIR = os.environ.get('METRICS_DIR') or os.path.join(tempfile.gettempdir(), 'findfund-metrics')
+METRICS_FLUSH_SECONDS = 5
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+METRICS_ALLOWED_IPS = [ip.strip() for ip in os.environ.get('METRICS_ALLOWED_IPS', '').split(',') if ip.strip()]
+
+# Opt-in request profiling (backend.profiling): staff send "X-Profile: 1"
+# or ?_profile=1; PROFILING_SAMPLE_RATE also profiles that share of all
+# requests. Only the newest PROFILING_MAX_REPORTS are kept.
+PROFILING_DIR = os.environ.get('PROFILING_DIR') or os.path.join(tempfile.gettempdir(), 'findfund-profiles')
+PROFILING_MAX_REPORTS = 50
+PROFILING_SAMPLE_RATE = float(os.environ.get('PROFILING_SAMPLE_RATE') or 0)
+
+# Serve the read-heavy GET endpoints from native async views (set by asgi.py)
+ASYNC_READ_VIEWS = os.environ.get('ASYNC_READ_VIEWS') == '1'
+
 # # Allow frontend requests
 CORS_ALLOW_CREDENTIALS = True
 CORS_ALLOWED_ORIGINS = [
@@ -120,9 +162,68 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {
+            # take the write lock at BEGIN so concurrent writers queue on the
+            # busy timeout instead of failing mid-transaction
+            'transaction_mode': 'IMMEDIATE',
+            'timeout': 20,
+        },
+        # on-disk test database so concurrency tests see real SQLite locking
+        # (the default in-memory shared cache fails fast instead of waiting),
+        # kept out of the source tree
+        'TEST': {
+            'NAME': os.path.join(tempfile.gettempdir(), 'findfund-test.sqlite3'),
+        },
     }
 }
 
+# tests keep their cache version counters apart from the dev server's
+TEST_RUNNER = 'backend.test_runner.TestRunner'
+
+
+# Caches
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+#
+# "catalogue" holds rendered browse / startup detail payloads keyed on a
+# version counter bumped whenever a startup or founder profile changes.
+# CATALOGUE_CACHE=file shares it between worker processes; locmem (default)
+# is per process. Both evict least recently used entries past MAX_ENTRIES,
+# and drop them after CATALOGUE_TTL whatever the version says.
+#
+# "versions" holds the counters themselves and must be shared by every
+# worker, or a write bumps them in one process only: by default a file
+# cache under the temp dir (one host); point it at memcached / redis when
+# workers span hosts.
+
+CATALOGUE_CACHE = os.environ.get('CATALOGUE_CACHE', 'locmem')
+CATALOGUE_TTL = 300  # seconds
+VERSION_CACHE_DIR = (
+    os.environ.get('VERSION_CACHE_DIR') or os.path.join(tempfile.gettempdir(), 'findfund-versions')
+)
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'catalogue': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'catalogue',
+        'TIMEOUT': CATALOGUE_TTL,
+        'OPTIONS': {'MAX_ENTRIES': 1000, 'CULL_FREQUENCY': 4},
+    },
+    'versions': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': VERSION_CACHE_DIR,
+        'TIMEOUT': None,
+    },
+}
+
+if CATALOGUE_CACHE == 'file':
+    CACHES['catalogue'].update({
+        'BACKEND': 'startups.cache.LRUFileBasedCache',
+        'LOCATION': BASE_DIR / 'cache' / 'catalogue',
+    })
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
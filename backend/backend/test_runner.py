@@ -0,0 +1,16 @@
+from django.test.runner import DiscoverRunner
+
+from startups.cache import isolated_version_cache
+
+
+class TestRunner(DiscoverRunner):
+    """DiscoverRunner with the version counters in a per-run directory."""
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self._version_cache = isolated_version_cache()
+        self._version_cache.__enter__()
+
+    def teardown_test_environment(self, **kwargs):
+        self._version_cache.__exit__(None, None, None)
+        super().teardown_test_environment(**kwargs)
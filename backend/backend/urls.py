@@ -3,6 +3,8 @@ from django.contrib import admin
 from django.urls import path,include
 from django.conf.urls.static import static
 from django.conf import settings
+from .metrics import metrics_view
+from .profiling import ProfileReportDetail, ProfileReportList
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -10,6 +12,9 @@ urlpatterns = [
     path('api/startups/',include('startups.urls')),
     path('api/investors/',include('investors.urls')),
     path("api/profiles/", include("profiles.urls")),
+    path("metrics/", metrics_view, name="metrics"),
+    path("api/debug/profiles/", ProfileReportList.as_view(), name="profile-report-list"),
+    path("api/debug/profiles/<str:report_id>/", ProfileReportDetail.as_view(), name="profile-report-detail"),
 ]
 
 if settings.DEBUG:
@@ -0,0 +1,74 @@
+from decimal import Decimal
+
+from django.db.models import Count, DecimalField, Q, Sum
+from django.db.models.functions import TruncMonth
+
+from .models import InvestmentRequest
+
+
+# sums of amount (max_digits=12) can outgrow the column's own precision
+TOTAL = DecimalField(max_digits=20, decimal_places=2)
+
+CENT = Decimal("0.01")
+
+# committed money is everything the investor hasn't had rejected
+COMMITTED = ~Q(status="rejected")
+
+
+def _sums():
+    return {
+        "requests": Count("id"),
+        "committed": Sum("amount", filter=COMMITTED, output_field=TOTAL),
+        "accepted": Sum("amount", filter=Q(status="accepted"), output_field=TOTAL),
+        "pending": Sum("amount", filter=Q(status="pending"), output_field=TOTAL),
+    }
+
+
+def _amounts(row):
+    return {
+        "requests": row["requests"],
+        # SQLite returns computed decimals unquantized; match the "1000.00" of the API
+        **{key: f"{(row[key] or Decimal(0)).quantize(CENT):f}" for key in ("committed", "accepted", "pending")},
+    }
+
+
+def _breakdown(requests, field, key):
+    rows = (
+        requests.values(field)
+        .annotate(**_sums())
+        .order_by("-committed", field)
+    )
+    return [{key: row[field], **_amounts(row)} for row in rows]
+
+
+def portfolio_analytics(investor):
+    """
+    Totals, industry and stage breakdowns and a monthly series of an
+    investor's requests: four grouped aggregate queries whatever the
+    number of requests.
+    """
+    requests = InvestmentRequest.objects.filter(investor=investor)
+
+    totals = requests.aggregate(
+        **_sums(),
+        accepted_count=Count("id", filter=Q(status="accepted")),
+        pending_count=Count("id", filter=Q(status="pending")),
+        rejected_count=Count("id", filter=Q(status="rejected")),
+    )
+
+    monthly = (
+        requests.annotate(month=TruncMonth("created_at"))
+        .values("month")
+        .annotate(**_sums())
+        .order_by("month")
+    )
+
+    return {
+        "totals": {
+            **_amounts(totals),
+            **{key: totals[key] for key in ("accepted_count", "pending_count", "rejected_count")},
+        },
+        "by_industry": _breakdown(requests, "startup__industry", "industry"),
+        "by_stage": _breakdown(requests, "startup__stage", "stage"),
+        "monthly": [{"month": row["month"].strftime("%Y-%m"), **_amounts(row)} for row in monthly],
+    }
@@ -0,0 +1,79 @@
+from accounts.async_api import async_read_view, json_response
+from startups.cache import ACTIVITY, CATALOGUE, acached_json, async_conditional
+from startups.fieldsets import InvalidFieldset, parse_fieldsets
+from startups.models import Startup
+from startups.projection import json_response as rows_response, projection
+from startups.serializers import StartupSerializer
+from .filters import InvalidFilter, afacet_counts, apply_filters, parse_filters
+from .models import InvestmentRequest, SavedStartup
+from .pagination import KEYSET_FIELDS, InvalidCursor, apaginate_keyset
+from .serializers import InvestmentRequestSerializer, SavedStartupSerializer
+from .views import (
+    BrowseStartups, FounderInvestmentRequests, MyInvestments, SavedStartups,
+    browse_cache_key,
+)
+
+# Async GET handlers for the read-heavy investor endpoints, served when the
+# app runs under ASGI (settings.ASYNC_READ_VIEWS). Each returns the same body
+# as the DRF view it stands in for; writes still go through that view.
+
+
+@async_read_view(BrowseStartups.as_view())
+async def browse_startups(request, user):
+    return await acached_json(browse_cache_key(request.GET), lambda: _build_browse(request))
+
+
+async def _build_browse(request):
+    try:
+        filters = parse_filters(request.GET)
+        rows = projection(StartupSerializer, *parse_fieldsets(request.GET))
+    except (InvalidFilter, InvalidFieldset) as e:
+        return json_response({"error": str(e)}, status=400)
+
+    startups = apply_filters(Startup.objects.all(), filters)
+
+    if request.GET.get("all") in ("1", "true"):
+        return rows_response(await rows.arows(startups.order_by("-created_at", "-id")))
+
+    try:
+        page, next_cursor = await apaginate_keyset(rows.queryset(startups, extra=KEYSET_FIELDS), request)
+    except InvalidCursor as e:
+        return json_response({"error": str(e)}, status=400)
+
+    data = {"results": [rows.build(raw) for raw in page], "next": next_cursor}
+    if not request.GET.get("cursor"):
+        data["facets"] = await afacet_counts(Startup.objects.all(), filters)
+    return rows_response(data)
+
+
+@async_read_view(FounderInvestmentRequests.as_view())
+@async_conditional(CATALOGUE, ACTIVITY)
+async def founder_investment_requests(request, user):
+    requests = InvestmentRequest.objects.filter(startup__founder=user).order_by("-created_at")
+    try:
+        rows = projection(InvestmentRequestSerializer, *parse_fieldsets(request.GET))
+    except InvalidFieldset as e:
+        return json_response({"error": str(e)}, status=400)
+    return rows_response(await rows.arows(requests))
+
+
+@async_read_view(MyInvestments.as_view())
+@async_conditional(CATALOGUE, ACTIVITY)
+async def my_investments(request, user):
+    accepted = InvestmentRequest.objects.filter(investor=user, status="accepted").order_by("-created_at")
+    try:
+        rows = projection(InvestmentRequestSerializer, *parse_fieldsets(request.GET))
+    except InvalidFieldset as e:
+        return json_response({"error": str(e)}, status=400)
+    return rows_response(await rows.arows(accepted))
+
+
+@async_read_view(SavedStartups.as_view())
+@async_conditional(CATALOGUE, ACTIVITY)
+async def saved_startups(request, user):
+    saved = SavedStartup.objects.filter(investor=user).order_by("-created_at")
+    try:
+        rows = projection(SavedStartupSerializer, *parse_fieldsets(request.GET))
+    except InvalidFieldset as e:
+        return json_response({"error": str(e)}, status=400)
+    return rows_response(await rows.arows(saved))
@@ -0,0 +1,110 @@
+from decimal import Decimal, InvalidOperation
+
+from django.db.models import Count, F, Q
+
+from startups.tags import tag_key
+
+
+# facets returned with per-value counts
+FACET_FIELDS = ("industry", "stage", "location")
+
+# facets filtered through their tag table: any spelling of a name matches
+TAG_FILTERS = {"industry": "industry_tag__key__in"}
+
+# query param -> range lookup
+RANGE_FILTERS = {
+    "funding_goal_min": "funding_goal__gte",
+    "funding_goal_max": "funding_goal__lte",
+    "equity_min": "equity__gte",
+    "equity_max": "equity__lte",
+}
+
+# flag param value -> whether the filter applies
+BOOLEAN_VALUES = {"": False, "0": False, "false": False, "1": True, "true": True}
+
+
+class InvalidFilter(ValueError):
+    pass
+
+
+def _values(params, name):
+    # ?industry=Fintech&industry=Edtech and ?industry=Fintech,Edtech both work
+    values = []
+    for raw in params.getlist(name):
+        values.extend(v.strip() for v in raw.split(",") if v.strip())
+    return values
+
+
+def parse_filters(params):
+    """
+    Turn browse query params into a dict of facet name -> Q, so facet counts
+    can be computed with every filter except their own applied.
+    """
+    filters = {}
+    for field in FACET_FIELDS:
+        values = _values(params, field)
+        if values and field in TAG_FILTERS:
+            filters[field] = Q(**{TAG_FILTERS[field]: [tag_key(v) for v in values]})
+        elif values:
+            filters[field] = Q(**{f"{field}__in": values})
+
+    for param, lookup in RANGE_FILTERS.items():
+        raw = params.get(param)
+        if raw in (None, ""):
+            continue
+        try:
+            value = Decimal(raw)
+        except InvalidOperation:
+            value = None
+        if value is None or not value.is_finite():
+            raise InvalidFilter(f"{param} must be a number")
+        filters[param] = Q(**{lookup: value})
+
+    raising = params.get("raising", "")
+    if raising not in BOOLEAN_VALUES:
+        raise InvalidFilter("raising must be true or false")
+    if BOOLEAN_VALUES[raising]:
+        filters["raising"] = Q(amount_raised__lt=F("funding_goal"))
+    return filters
+
+
+def apply_filters(queryset, filters, exclude=None):
+    for name, q in filters.items():
+        if name != exclude:
+            queryset = queryset.filter(q)
+    return queryset
+
+
+def _facet_querysets(queryset, filters):
+    for field in FACET_FIELDS:
+        yield field, (
+            apply_filters(queryset, filters, exclude=field)
+            .exclude(**{field: ""})
+            .values(field)
+            .annotate(count=Count("id"))
+            .order_by("-count", field)
+        )
+
+
+def _raising_queryset(queryset, filters):
+    return apply_filters(queryset, filters, exclude="raising").filter(
+        amount_raised__lt=F("funding_goal")
+    )
+
+
+def facet_counts(queryset, filters):
+    """One grouped COUNT per facet, each ignoring that facet's own filter."""
+    facets = {}
+    for field, rows in _facet_querysets(queryset, filters):
+        facets[field] = [{"value": r[field], "count": r["count"]} for r in rows]
+    facets["raising"] = _raising_queryset(queryset, filters).count()
+    return facets
+
+
+async def afacet_counts(queryset, filters):
+    """`facet_counts` for async views."""
+    facets = {}
+    for field, rows in _facet_querysets(queryset, filters):
+        facets[field] = [{"value": r[field], "count": r["count"]} async for r in rows]
+    facets["raising"] = await _raising_queryset(queryset, filters).acount()
+    return facets
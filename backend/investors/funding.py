@@ -0,0 +1,161 @@
+import random
+import time
+
+from django.db import OperationalError, transaction
+from django.db.models import Case, DecimalField, F, Value, When
+
+from startups.cache import invalidate_activity, invalidate_catalogue
+from startups.models import Startup
+from .models import InvestmentRequest
+from .summary import record_transitions
+
+
+# retries when SQLite reports the database as locked under write contention
+LOCK_RETRIES = 8
+LOCK_BACKOFF = 0.01
+
+
+class FundingCapExceeded(Exception):
+    def __init__(self, available):
+        self.available = available
+        super().__init__(f"Cannot accept. Only {available} left to raise.")
+
+
+def _is_lock_error(exc):
+    return "locked" in str(exc).lower()
+
+
+def _set_status(req, status_choice):
+    """
+    Move `req` to `status_choice`. Accepting claims the request and bumps
+    amount_raised with conditional UPDATEs in one transaction, so concurrent
+    accepts can neither double count nor push the total past funding_goal;
+    leaving "accepted" gives the amount back the same way.
+    """
+    with transaction.atomic():
+        old_status = (
+            InvestmentRequest.objects.select_for_update()
+            .filter(pk=req.pk).values_list("status", flat=True).first()
+        )
+        if old_status is None:
+            return  # deleted since it was read
+        if status_choice != "accepted":
+            # only one caller can move a request out of "accepted"
+            released = (
+                InvestmentRequest.objects.filter(pk=req.pk, status="accepted")
+                .update(status=status_choice)
+            )
+            if released:
+                Startup.objects.filter(pk=req.startup_id).update(
+                    amount_raised=F("amount_raised") - req.amount
+                )
+                invalidate_catalogue()
+            else:
+                InvestmentRequest.objects.filter(pk=req.pk).update(status=status_choice)
+            record_transitions([(req.startup_id, req.amount, old_status, status_choice)])
+            invalidate_activity()
+            return
+
+        # only one caller can move a request into "accepted"
+        claimed = (
+            InvestmentRequest.objects.filter(pk=req.pk)
+            .exclude(status="accepted")
+            .update(status="accepted")
+        )
+        if not claimed:
+            return
+
+        raised = Startup.objects.filter(
+            pk=req.startup_id,
+            amount_raised__lte=F("funding_goal") - req.amount,
+        ).update(amount_raised=F("amount_raised") + req.amount)
+        if not raised:
+            startup = Startup.objects.only("funding_goal", "amount_raised").get(pk=req.startup_id)
+            raise FundingCapExceeded(startup.funding_goal - startup.amount_raised)
+        record_transitions([(req.startup_id, req.amount, old_status, "accepted")])
+        invalidate_catalogue()
+        invalidate_activity()
+
+
+def _retry_on_lock(func, *args):
+    """Call `func`, retrying with jittered backoff on lock errors."""
+    for attempt in range(LOCK_RETRIES):
+        try:
+            return func(*args)
+        except OperationalError as e:
+            if not _is_lock_error(e) or attempt == LOCK_RETRIES - 1:
+                raise
+            time.sleep(LOCK_BACKOFF * (2 ** attempt) * random.random())
+
+
+def set_request_status(req, status_choice):
+    _retry_on_lock(_set_status, req, status_choice)
+    req.status = status_choice
+
+
+def _apply_bulk(founder, updates):
+    with transaction.atomic():
+        ids = [u["id"] for u in updates]
+        reqs = InvestmentRequest.objects.select_for_update(of=("self",)).filter(
+            pk__in=ids, startup__founder=founder
+        ).only("id", "startup_id", "amount", "status").in_bulk()
+        startups = Startup.objects.select_for_update().filter(
+            pk__in={r.startup_id for r in reqs.values()}
+        ).only("id", "funding_goal", "amount_raised").in_bulk()
+        remaining = {pk: s.funding_goal - s.amount_raised for pk, s in startups.items()}
+
+        results = []
+        transitions = []
+        to_status = {"accepted": [], "rejected": []}
+        raised = {}
+        for item in updates:
+            req = reqs.get(item["id"])
+            result = {"id": item["id"], "status": item["status"]}
+            if req is None:
+                result["result"] = "not_found"
+            elif item["status"] == "accepted" and req.status == "accepted":
+                result["result"] = "unchanged"
+            elif item["status"] == "accepted" and req.amount > remaining[req.startup_id]:
+                result["result"] = "refused"
+                result["error"] = f"Cannot accept. Only {remaining[req.startup_id]} left to raise."
+            else:
+                if item["status"] == "accepted":
+                    change = req.amount
+                elif req.status == "accepted":
+                    change = -req.amount  # leaving "accepted" frees its amount
+                else:
+                    change = 0
+                if change:
+                    remaining[req.startup_id] -= change
+                    raised[req.startup_id] = raised.get(req.startup_id, 0) + change
+                to_status[item["status"]].append(req.pk)
+                transitions.append((req.startup_id, req.amount, req.status, item["status"]))
+                result["result"] = item["status"]
+            results.append(result)
+
+        for status_choice, pks in to_status.items():
+            if pks:
+                InvestmentRequest.objects.filter(pk__in=pks).update(status=status_choice)
+        if raised:
+            Startup.objects.filter(pk__in=raised).update(
+                amount_raised=F("amount_raised") + Case(
+                    *[When(pk=pk, then=Value(amount)) for pk, amount in raised.items()],
+                    output_field=DecimalField(max_digits=12, decimal_places=2),
+                )
+            )
+            invalidate_catalogue()
+        record_transitions(transitions)
+        if to_status["accepted"] or to_status["rejected"]:
+            invalidate_activity()
+        return results
+
+
+def apply_bulk_status(founder, updates):
+    """
+    Apply many {"id", "status"} updates for `founder`'s requests in one
+    transaction: one read of the requests and their startups, accepts checked
+    in order against each startup's remaining funding (which rejecting an
+    accepted request frees up), then one UPDATE per target status and one
+    for amount_raised. Returns a result per item.
+    """
+    return _retry_on_lock(_apply_bulk, founder, updates)
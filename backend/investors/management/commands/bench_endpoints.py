@@ -0,0 +1,447 @@
+import itertools
+import json
+import platform
+import subprocess
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone as dt_timezone
+
+from django.contrib.auth.models import User
+from django.core.files.base import ContentFile
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.client import MULTIPART_CONTENT, BOUNDARY, encode_multipart
+from django.test.utils import (
+    setup_databases, setup_test_environment, teardown_databases, teardown_test_environment,
+)
+from django.urls import get_resolver
+from rest_framework.renderers import JSONRenderer
+from rest_framework.serializers import ListSerializer, Serializer
+
+from accounts.tokens import issue_token
+from investors import exports
+from investors.models import InvestmentRequest, SavedStartup
+from investors.synthetic import Generator
+from startups.cache import get_cache, isolated_version_cache
+from startups import projection, search
+from startups.models import Startup
+
+
+# URLconfs whose every route must have a benchmark case
+URLCONFS = ("accounts.urls", "startups.urls", "investors.urls", "profiles.urls")
+
+PASSWORD = "loadtest-password"
+
+# smallest PDF pypdf will open, for the pitch deck download case
+MINIMAL_PDF = (
+    b"%PDF-1.4\n1 0 obj<</Type/Catalog/Pages 2 0 R>>endobj\n"
+    b"2 0 obj<</Type/Pages/Kids[3 0 R]/Count 1>>endobj\n"
+    b"3 0 obj<</Type/Page/Parent 2 0 R/MediaBox[0 0 612 792]>>endobj\n"
+    b"trailer<</Root 1 0 R>>\n%%EOF\n"
+)
+
+
+def bearer(user):
+    return {"Authorization": "Bearer " + issue_token(user)}
+
+
+def json_body(data):
+    return {"data": json.dumps(data), "content_type": "application/json"}
+
+
+def multipart_body(data):
+    # the test client only multipart-encodes POST bodies itself
+    return {"data": encode_multipart(BOUNDARY, data), "content_type": MULTIPART_CONTENT}
+
+
+class Context:
+    """Users and rows the cases point at, refreshed for each dataset size."""
+
+    # unique names for created rows, across sizes
+    counter = itertools.count()
+
+    def __init__(self):
+        self.founder = User.objects.get(username="bench0-founder-0")
+        self.investor = User.objects.get(username="bench0-investor-0")
+        self.founder_auth = bearer(self.founder)
+        self.investor_auth = bearer(self.investor)
+        self.own_startup = Startup.objects.filter(founder=self.founder).order_by("id").first()
+        self.other_startup = Startup.objects.exclude(founder=self.founder).order_by("id").first()
+
+        deck_startup = self.own_startup
+        if not deck_startup.pitch_deck:
+            deck_startup.pitch_deck.save("deck.pdf", ContentFile(MINIMAL_PDF))
+        self.deck_startup = deck_startup
+
+    def founder_request(self):
+        """A pending request on one of the founder's startups."""
+        return InvestmentRequest.objects.create(
+            investor=self.investor, startup=self.own_startup, amount=1000
+        )
+
+    def throwaway_startup(self):
+        return Startup.objects.create(founder=self.founder, name="Throwaway", funding_goal=1000)
+
+    def unsaved_startup(self):
+        SavedStartup.objects.filter(investor=self.investor, startup=self.other_startup).delete()
+        return self.other_startup
+
+    def saved_startup(self):
+        SavedStartup.objects.get_or_create(investor=self.investor, startup=self.other_startup)
+        return self.other_startup
+
+
+# (name, route, build) -- build(ctx) runs untimed before each call and
+# returns (method, path, client kwargs, expected status)
+CASES = [
+    ("signin", "api/signin/", lambda ctx: (
+        "post", "/api/signin/",
+        json_body({"username": ctx.investor.username, "password": PASSWORD}), 200)),
+    ("signup", "api/signup/", lambda ctx: (
+        "post", "/api/signup/",
+        json_body({
+            "username": f"bench-signup-{next(ctx.counter)}",
+            "password1": "Plum-harbor-4821", "password2": "Plum-harbor-4821",
+            "role": "Investor",
+        }), 201)),
+    ("signout", "api/signout/", lambda ctx: (
+        "post", "/api/signout/", {"headers": bearer(ctx.investor)}, 200)),
+    ("check-auth", "api/check-auth/", lambda ctx: (
+        "get", f"/api/check-auth/?username={ctx.investor.username}", {}, 200)),
+
+    ("startups:list", "api/startups/", lambda ctx: (
+        "get", "/api/startups/", {"headers": ctx.founder_auth}, 200)),
+    ("startups:create", "api/startups/", lambda ctx: (
+        "post", "/api/startups/",
+        {"headers": ctx.founder_auth, "data": {
+            "name": f"Bench startup {next(ctx.counter)}", "industry": "SaaS",
+            "stage": "Seed", "funding_goal": "250000",
+        }}, 201)),
+    ("startups:detail", "api/startups/<int:pk>/", lambda ctx: (
+        "get", f"/api/startups/{ctx.own_startup.pk}/", {"headers": ctx.founder_auth}, 200)),
+    ("startups:update", "api/startups/<int:pk>/", lambda ctx: (
+        "put", f"/api/startups/{ctx.own_startup.pk}/",
+        {"headers": ctx.founder_auth, **multipart_body({"description": f"rev {next(ctx.counter)}"})}, 200)),
+    ("startups:delete", "api/startups/<int:pk>/", lambda ctx: (
+        "delete", f"/api/startups/{ctx.throwaway_startup().pk}/",
+        {"headers": ctx.founder_auth}, 204)),
+    ("startups:pitch-deck", "api/startups/<int:pk>/pitch-deck/", lambda ctx: (
+        "get", f"/api/startups/{ctx.deck_startup.pk}/pitch-deck/", {"headers": ctx.investor_auth}, 200)),
+
+    ("browse", "api/investors/browse/", lambda ctx: (
+        "get", "/api/investors/browse/", {"headers": ctx.investor_auth}, 200)),
+    ("browse:filtered", "api/investors/browse/", lambda ctx: (
+        "get", "/api/investors/browse/?industry=SaaS&stage=Seed&funding_goal_min=100000",
+        {"headers": ctx.investor_auth}, 200)),
+    ("trending", "api/investors/trending/", lambda ctx: (
+        "get", "/api/investors/trending/", {"headers": ctx.investor_auth}, 200)),
+    ("search", "api/investors/search/", lambda ctx: (
+        "get", "/api/investors/search/?q=cloud", {"headers": ctx.investor_auth}, 200)),
+    ("recommended", "api/investors/recommended/", lambda ctx: (
+        "get", "/api/investors/recommended/", {"headers": ctx.investor_auth}, 200)),
+    ("requests:list", "api/investors/requests/", lambda ctx: (
+        "get", "/api/investors/requests/", {"headers": ctx.investor_auth}, 200)),
+    ("requests:create", "api/investors/requests/", lambda ctx: (
+        "post", "/api/investors/requests/",
+        {"headers": ctx.investor_auth, **json_body({"startup_id": ctx.own_startup.pk, "amount": "1000"})}, 201)),
+    ("founder-requests:list", "api/investors/founder/requests/", lambda ctx: (
+        "get", "/api/investors/founder/requests/", {"headers": ctx.founder_auth}, 200)),
+    ("founder-summary", "api/investors/founder/summary/", lambda ctx: (
+        "get", "/api/investors/founder/summary/", {"headers": ctx.founder_auth}, 200)),
+    ("founder-requests:export", "api/investors/founder/requests/export/<str:fmt>/", lambda ctx: (
+        "get", "/api/investors/founder/requests/export/csv/",
+        {"headers": {**ctx.founder_auth, "Accept-Encoding": "gzip"}}, 200)),
+    ("founder-requests:bulk", "api/investors/founder/requests/bulk/", lambda ctx: (
+        "post", "/api/investors/founder/requests/bulk/",
+        {"headers": ctx.founder_auth, **json_body({"updates": [
+            {"id": ctx.founder_request().pk, "status": "rejected"} for _ in range(10)
+        ]})}, 200)),
+    ("founder-requests:update", "api/investors/founder/requests/<int:pk>/", lambda ctx: (
+        "patch", f"/api/investors/founder/requests/{ctx.founder_request().pk}/",
+        {"headers": ctx.founder_auth, **json_body({"status": "rejected"})}, 200)),
+    ("my-investments", "api/investors/my-investments/", lambda ctx: (
+        "get", "/api/investors/my-investments/", {"headers": ctx.investor_auth}, 200)),
+    ("my-investments:export", "api/investors/my-investments/export/<str:fmt>/", lambda ctx: (
+        "get", "/api/investors/my-investments/export/ndjson/",
+        {"headers": {**ctx.investor_auth, "Accept-Encoding": "gzip"}}, 200)),
+    ("analytics", "api/investors/analytics/", lambda ctx: (
+        "get", "/api/investors/analytics/", {"headers": ctx.investor_auth}, 200)),
+    ("saved:list", "api/investors/saved/", lambda ctx: (
+        "get", "/api/investors/saved/", {"headers": ctx.investor_auth}, 200)),
+    ("saved:create", "api/investors/saved/", lambda ctx: (
+        "post", "/api/investors/saved/",
+        {"headers": ctx.investor_auth, **json_body({"startup": ctx.unsaved_startup().pk})}, 201)),
+    ("saved:delete", "api/investors/saved/", lambda ctx: (
+        "delete", "/api/investors/saved/",
+        {"headers": ctx.investor_auth, **json_body({"startup": ctx.saved_startup().pk})}, 204)),
+
+    ("founder-profile:get", "api/profiles/founder-profiles/me/", lambda ctx: (
+        "get", "/api/profiles/founder-profiles/me/", {"headers": ctx.founder_auth}, 200)),
+    ("founder-profile:update", "api/profiles/founder-profiles/me/", lambda ctx: (
+        "put", "/api/profiles/founder-profiles/me/",
+        {"headers": ctx.founder_auth, **json_body({"bio": f"rev {next(ctx.counter)}"})}, 200)),
+    ("investor-profile:get", "api/profiles/investor-profiles/me/", lambda ctx: (
+        "get", "/api/profiles/investor-profiles/me/", {"headers": ctx.investor_auth}, 200)),
+    ("investor-profile:update", "api/profiles/investor-profiles/me/", lambda ctx: (
+        "put", "/api/profiles/investor-profiles/me/",
+        {"headers": ctx.investor_auth, **json_body({"bio": f"rev {next(ctx.counter)}"})}, 200)),
+]
+
+
+def routes():
+    """Every route string under URLCONFS, e.g. "api/startups/<int:pk>/"."""
+    found = set()
+    for resolver in get_resolver().url_patterns:
+        module = getattr(resolver, "urlconf_module", None)
+        if getattr(module, "__name__", None) in URLCONFS:
+            for pattern in resolver.url_patterns:
+                found.add(str(resolver.pattern) + str(pattern.pattern))
+    return found
+
+
+# outermost calls of these are timed as serialization; `render` is also
+# patched where it was imported by name
+SERIALIZATION = [
+    (Serializer, "to_representation"),
+    (ListSerializer, "to_representation"),
+    (JSONRenderer, "render"),
+    (projection.Projection, "build"),
+    (projection.Projection, "rows"),
+    (projection, "render"),
+    (exports, "render"),
+]
+
+
+class Timings:
+    """
+    Query count, SQL time and serialization time (serializers and
+    projections plus JSON rendering, less any SQL they run) for calls in a
+    `measure()` block.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.queries = 0
+        self.sql = 0.0
+        self.serialize = 0.0
+        self.depth = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql += time.perf_counter() - start
+            self.queries += 1
+
+    def timed(self, original):
+        timings = self
+
+        def wrapper(*args, **kwargs):
+            # nested serializers run inside their parent's timing
+            if timings.depth:
+                return original(*args, **kwargs)
+            timings.depth += 1
+            start, sql = time.perf_counter(), timings.sql
+            try:
+                return original(*args, **kwargs)
+            finally:
+                # lazy querysets run inside: Projection.rows, N+1 relations
+                timings.serialize += time.perf_counter() - start - (timings.sql - sql)
+                timings.depth -= 1
+        return wrapper
+
+    @contextmanager
+    def measure(self):
+        originals = [(owner, name, owner.__dict__[name]) for owner, name in SERIALIZATION]
+        self.reset()
+        for owner, name, original in originals:
+            setattr(owner, name, self.timed(original))
+        try:
+            with connection.execute_wrapper(self):
+                yield self
+        finally:
+            for owner, name, original in originals:
+                setattr(owner, name, original)
+
+
+def percentile(samples, p):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * p / 100))]
+
+
+def summarize(samples):
+    def ms(values, p):
+        return round(percentile(values, p) * 1000, 3)
+
+    latency = [s["latency"] for s in samples]
+    return {
+        "p50_ms": ms(latency, 50),
+        "p95_ms": ms(latency, 95),
+        "p99_ms": ms(latency, 99),
+        "queries": percentile([s["queries"] for s in samples], 50),
+        "sql_ms": ms([s["sql"] for s in samples], 50),
+        "serialize_ms": ms([s["serialize"] for s in samples], 50),
+        "bytes": percentile([s["bytes"] for s in samples], 50),
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark every accounts/startups/investors/profiles route on seeded "
+        "datasets of increasing size; writes JSON results and optionally fails "
+        "on regressions against a baseline file."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes", default="100,1000,10000",
+            help="Comma-separated startup counts; other tables scale with them.",
+        )
+        parser.add_argument("--iterations", type=int, default=20)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--output", default="bench-results.json")
+        parser.add_argument("--baseline", help="Results file from an earlier run to compare against.")
+        parser.add_argument(
+            "--threshold", type=float, default=0.25,
+            help="Allowed relative p95 slowdown against the baseline (0.25 = 25%%).",
+        )
+        parser.add_argument(
+            "--min-delta-ms", type=float, default=1.0,
+            help="Ignore p95 slowdowns smaller than this, to absorb timer noise.",
+        )
+        parser.add_argument(
+            "--keep-cache", action="store_true",
+            help="Don't clear the catalogue cache between calls (measures cache hits).",
+        )
+
+    def grow(self, generator_seed, stage, previous, size):
+        """Add the rows that take the dataset from `previous` to `size` startups."""
+        added = size - previous
+        Generator(seed=generator_seed + stage, prefix=f"bench{stage}", password=PASSWORD).run(
+            founders=max(1, added // 10),
+            investors=max(1, added // 2),
+            startups=added,
+            requests=added * 5,
+            saved=added * 2,
+        )
+        if search.fts_enabled():
+            search.rebuild_index()
+
+    def run_case(self, client, ctx, build, iterations, keep_cache):
+        timings = Timings()
+        samples = []
+        for _ in range(iterations + 1):  # the first call warms up and isn't kept
+            if not keep_cache:
+                get_cache().clear()
+            method, path, kwargs, expected = build(ctx)
+            with timings.measure():
+                start = time.perf_counter()
+                response = getattr(client, method)(path, **kwargs)
+                body = b"".join(response.streaming_content) if response.streaming else response.content
+                latency = time.perf_counter() - start
+            if response.status_code != expected:
+                raise CommandError(f"{method.upper()} {path}: expected {expected}, got "
+                                   f"{response.status_code}: {body[:200]!r}")
+            samples.append({
+                "latency": latency, "queries": timings.queries, "sql": timings.sql,
+                "serialize": timings.serialize, "bytes": len(body),
+            })
+        return summarize(samples[1:])
+
+    def compare(self, results, baseline, threshold, min_delta_ms):
+        failures = []
+        for size, cases in results.items():
+            for name, now in cases.items():
+                before = baseline.get("results", {}).get(size, {}).get(name)
+                if not before:
+                    continue
+                slower = now["p95_ms"] - before["p95_ms"]
+                if slower > min_delta_ms and now["p95_ms"] > before["p95_ms"] * (1 + threshold):
+                    failures.append(f"{size}/{name}: p95 {before['p95_ms']} -> {now['p95_ms']} ms")
+                # query counts are deterministic, so any increase is a regression
+                if now["queries"] > before["queries"]:
+                    failures.append(f"{size}/{name}: queries {before['queries']} -> {now['queries']}")
+        return failures
+
+    def handle(self, *args, **options):
+        covered = {route for _name, route, _build in CASES}
+        missing = sorted(routes() - covered)
+        if missing:
+            raise CommandError("No benchmark case for: " + ", ".join(missing))
+
+        try:
+            sizes = sorted({int(s) for s in options["sizes"].split(",") if s.strip()})
+        except ValueError:
+            raise CommandError("--sizes must be comma-separated integers")
+        if not sizes or sizes[0] < 1:
+            raise CommandError("--sizes must be positive")
+
+        baseline = None
+        if options["baseline"]:
+            with open(options["baseline"]) as f:
+                baseline = json.load(f)
+
+        results = {}
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            with (
+                tempfile.TemporaryDirectory() as media,
+                override_settings(MEDIA_ROOT=media),
+                isolated_version_cache(),
+            ):
+                client = Client()
+                previous = 0
+                for stage, size in enumerate(sizes):
+                    self.grow(options["seed"], stage, previous, size)
+                    previous = size
+                    ctx = Context()
+                    results[str(size)] = {}
+                    for name, _route, build in CASES:
+                        stats = self.run_case(client, ctx, build, options["iterations"], options["keep_cache"])
+                        results[str(size)][name] = stats
+                        self.stdout.write(
+                            f"{size:>8} {name:<26} p50 {stats['p50_ms']:8.2f}  p95 {stats['p95_ms']:8.2f}  "
+                            f"p99 {stats['p99_ms']:8.2f} ms  {stats['queries']:>3} q  "
+                            f"sql {stats['sql_ms']:7.2f}  ser {stats['serialize_ms']:7.2f} ms  "
+                            f"{stats['bytes']:>8} B"
+                        )
+        finally:
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+
+        report = {
+            "meta": {
+                "commit": git_commit(),
+                "created": datetime.now(dt_timezone.utc).isoformat(),
+                "python": platform.python_version(),
+                "sizes": sizes,
+                "iterations": options["iterations"],
+                "seed": options["seed"],
+                "keep_cache": options["keep_cache"],
+            },
+            "results": results,
+        }
+        with open(options["output"], "w") as f:
+            json.dump(report, f, indent=2)
+        self.stdout.write(f"Wrote {options['output']}")
+
+        if baseline:
+            failures = self.compare(results, baseline, options["threshold"], options["min_delta_ms"])
+            if failures:
+                raise CommandError("Regressions against baseline:\n  " + "\n  ".join(failures))
+            self.stdout.write(self.style.SUCCESS("No regressions against baseline."))
@@ -0,0 +1,87 @@
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.test.utils import (
+    setup_databases, setup_test_environment, teardown_databases, teardown_test_environment,
+)
+
+from investors import matching
+from investors.matching import StartupMatrix, recommend_for, score_startups, top_matches
+from investors.synthetic import Generator
+from startups.cache import invalidate_catalogue, isolated_version_cache
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the investor-startup matching engine on synthetic startups in "
+        "a throwaway database: loading the matrix, scoring it, and whole "
+        "recommend_for calls with a cold cache, a warm one, and right after a "
+        "startup write (served from the previous matrix while it rebuilds)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=100_000)
+        parser.add_argument("--repeat", type=int, default=20)
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            with isolated_version_cache():
+                rows = options["rows"]
+                Generator(seed=options["seed"], prefix="benchmatch").run(
+                    founders=max(1, rows // 100), investors=max(1, rows // 100),
+                    startups=rows, requests=rows // 10, saved=0,
+                )
+                self.bench(rows, options["repeat"])
+        finally:
+            connections.close_all()
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+
+    def bench(self, rows, repeat):
+        investor = User.objects.filter(investor_profile__isnull=False).select_related("investor_profile").first()
+
+        load_ms = self.time(StartupMatrix.from_database, max(1, repeat // 4))
+        matrix = StartupMatrix.from_database()
+        prefs = {
+            "interests": set(investor.investor_profile.interest_tags.values_list("id", flat=True)),
+            "range_min": 50_000,
+            "range_max": 500_000,
+            "stage_affinity": {"seed": 0.6, "pre-seed": 0.4},
+        }
+        score_ms = self.time(lambda: top_matches(score_startups(matrix, **prefs), matrix.ids, 20), repeat)
+
+        def cold():
+            matching.matrix_cache = matching.MatrixCache()  # as in a fresh worker
+            recommend_for(investor, 20)
+
+        cold_ms = self.time(cold, max(1, repeat // 4))
+        matching.matrix_cache.get()
+        warm_ms = self.time(lambda: recommend_for(investor, 20), repeat)
+
+        def after_write():
+            invalidate_catalogue()  # as after any startup write
+            recommend_for(investor, 20)
+
+        write_ms = self.time(after_write, repeat)
+        while matching.matrix_cache.refreshing:  # let it finish before teardown
+            time.sleep(0.05)
+
+        self.stdout.write(f"rows:                    {len(matrix)} open of {rows}")
+        self.stdout.write(f"load matrix:             median {load_ms:.1f} ms")
+        self.stdout.write(f"score+top20:             median {score_ms:.2f} ms")
+        self.stdout.write(f"recommend (cold):        median {cold_ms:.1f} ms")
+        self.stdout.write(f"recommend (cached):      median {warm_ms:.2f} ms")
+        self.stdout.write(f"recommend (after write): median {write_ms:.2f} ms")
+
+    def time(self, func, repeat):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            timings.append((time.perf_counter() - start) * 1000)
+        return sorted(timings)[len(timings) // 2]
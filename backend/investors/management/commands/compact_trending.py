@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from investors import trending
+from startups.cache import invalidate_activity
+
+
+class Command(BaseCommand):
+    help = (
+        "Renormalize the trending scores to an epoch of now and drop the ones "
+        "that have decayed away. Run it daily, e.g. from cron."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rebuild", action="store_true",
+            help="Recompute every score from the full save and request history instead.",
+        )
+
+    def handle(self, *args, **options):
+        count = trending.rebuild() if options["rebuild"] else trending.compact()
+        # dropped scores leave the feed
+        invalidate_activity()
+        self.stdout.write(self.style.SUCCESS(f"{count} trending scores kept."))
@@ -0,0 +1,65 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from investors.synthetic import Generator
+from startups import search
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk-create synthetic founders, investors, startups, investment requests "
+        "and saved startups for load and scaling tests. Same seed, same data."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--founders", type=int, default=1_000)
+        parser.add_argument("--investors", type=int, default=5_000)
+        parser.add_argument("--startups", type=int, default=10_000)
+        parser.add_argument("--requests", type=int, default=100_000)
+        parser.add_argument("--saved", type=int, default=50_000)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--batch-size", type=int, default=5_000)
+        parser.add_argument(
+            "--prefix", default="gen",
+            help="Username prefix; use a new one to add to data generated earlier.",
+        )
+        parser.add_argument("--password", default="loadtest-password")
+        parser.add_argument(
+            "--skip-search-index", action="store_true",
+            help="Don't rebuild the full-text index afterwards.",
+        )
+
+    def handle(self, *args, **options):
+        if options["startups"] and not options["founders"]:
+            raise CommandError("--startups needs at least one founder.")
+        if (options["requests"] or options["saved"]) and not (options["startups"] and options["investors"]):
+            raise CommandError("--requests and --saved need startups and investors.")
+
+        verbosity = options["verbosity"]
+        generator = Generator(
+            seed=options["seed"],
+            batch_size=options["batch_size"],
+            prefix=options["prefix"],
+            password=options["password"],
+            log=(lambda message: self.stdout.write(message)) if verbosity > 1 else None,
+        )
+
+        start = time.perf_counter()
+        totals = generator.run(
+            founders=options["founders"],
+            investors=options["investors"],
+            startups=options["startups"],
+            requests=options["requests"],
+            saved=options["saved"],
+        )
+        elapsed = time.perf_counter() - start
+
+        for name, count in totals.items():
+            self.stdout.write(f"{name + ':':<12} {count}")
+        self.stdout.write(f"{'elapsed:':<12} {elapsed:.1f} s ({sum(totals.values()) / elapsed:,.0f} rows/s)")
+
+        # bulk_create bypasses the post_save hook that keeps the index current
+        if not options["skip_search_index"] and search.fts_enabled():
+            count = search.rebuild_index()
+            self.stdout.write(f"{'indexed:':<12} {count}")
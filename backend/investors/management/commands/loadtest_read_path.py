@@ -0,0 +1,157 @@
+import asyncio
+import importlib
+import time
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.test import AsyncClient, Client, override_settings
+from django.test.utils import (
+    setup_databases, setup_test_environment, teardown_databases, teardown_test_environment,
+)
+from django.urls import clear_url_caches
+
+from accounts.tokens import issue_token
+from profiles.models import FounderProfile, InvestorProfile
+from startups.cache import get_cache, isolated_version_cache
+from startups.models import Startup
+from investors.models import InvestmentRequest, SavedStartup
+
+
+PATHS = [
+    "/api/investors/browse/",
+    "/api/investors/my-investments/",
+    "/api/investors/saved/",
+    "/api/investors/founder/requests/",
+    "/api/profiles/founder-profiles/me/",
+    "/api/profiles/investor-profiles/me/",
+]
+
+URLCONFS = ("investors.urls", "profiles.urls", "backend.urls")
+
+
+def use_async_views(enabled):
+    """Rebuild the URLconf so it picks the sync or async read views."""
+    with override_settings(ASYNC_READ_VIEWS=enabled):
+        for name in URLCONFS:
+            importlib.reload(importlib.import_module(name))
+    clear_url_caches()
+
+
+def percentile(samples, p):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * p / 100))]
+
+
+class Command(BaseCommand):
+    help = (
+        "Load test the read endpoints through the WSGI handler (thread pool) and "
+        "the ASGI handler with the async views (event loop); reports rps, mean, p50 and p99."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=600)
+        parser.add_argument("--concurrency", type=int, default=16)
+        parser.add_argument("--startups", type=int, default=200)
+
+    def seed(self, n_startups):
+        founder = User.objects.create_user("loadtest-founder")
+        investor = User.objects.create_user("loadtest-investor")
+        FounderProfile.objects.create(user=founder, full_name="Load Test Founder")
+        InvestorProfile.objects.create(user=investor, full_name="Load Test Investor")
+        startups = Startup.objects.bulk_create(
+            Startup(
+                founder=founder,
+                name=f"Startup {i}",
+                description="Load test startup",
+                industry=("Fintech", "Health", "AI")[i % 3],
+                stage=("Seed", "Series A")[i % 2],
+                location="Remote",
+                funding_goal=Decimal("1000000"),
+                amount_raised=Decimal("0"),
+            )
+            for i in range(n_startups)
+        )
+        InvestmentRequest.objects.bulk_create(
+            InvestmentRequest(startup=s, investor=investor, amount=Decimal("100"), status="accepted")
+            for s in startups[:50]
+        )
+        SavedStartup.objects.bulk_create(
+            SavedStartup(startup=s, investor=investor) for s in startups[:50]
+        )
+        # the founder sees their requests, the investor everything else
+        return {"founder": issue_token(founder), "investor": issue_token(investor)}
+
+    def plan(self, tokens, n):
+        for i in range(n):
+            path = PATHS[i % len(PATHS)]
+            who = "founder" if "founder" in path else "investor"
+            yield path, "Bearer " + tokens[who]
+
+    def run_wsgi(self, requests, concurrency):
+        def call(item):
+            path, auth = item
+            start = time.perf_counter()
+            response = Client().get(path, headers={"Authorization": auth})
+            assert response.status_code == 200, (path, response.status_code, response.content)
+            return time.perf_counter() - start
+
+        def close_connections(_):
+            connections.close_all()
+
+        with ThreadPoolExecutor(concurrency) as pool:
+            start = time.perf_counter()
+            latencies = list(pool.map(call, requests))
+            elapsed = time.perf_counter() - start
+            list(pool.map(close_connections, range(concurrency)))
+        return latencies, elapsed
+
+    def run_asgi(self, requests, concurrency):
+        async def worker(queue, latencies):
+            client = AsyncClient()
+            while queue:
+                path, auth = queue.pop()
+                start = time.perf_counter()
+                response = await client.get(path, headers={"Authorization": auth})
+                assert response.status_code == 200, (path, response.status_code, response.content)
+                latencies.append(time.perf_counter() - start)
+
+        async def main():
+            queue, latencies = list(requests), []
+            start = time.perf_counter()
+            await asyncio.gather(*(worker(queue, latencies) for _ in range(concurrency)))
+            return latencies, time.perf_counter() - start
+
+        return asyncio.run(main())
+
+    def report(self, label, latencies, elapsed):
+        self.stdout.write(
+            f"{label:<6} {len(latencies) / elapsed:8.1f} rps   "
+            f"mean {sum(latencies) / len(latencies) * 1000:7.2f} ms   "
+            f"p50 {percentile(latencies, 50) * 1000:7.2f} ms   "
+            f"p99 {percentile(latencies, 99) * 1000:7.2f} ms"
+        )
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            with isolated_version_cache():
+                tokens = self.seed(options["startups"])
+                requests = list(self.plan(tokens, options["requests"]))
+                get_cache().clear()
+
+                use_async_views(False)
+                self.run_wsgi(requests[: len(PATHS)], 1)  # warm up
+                self.report("wsgi", *self.run_wsgi(requests, options["concurrency"]))
+
+                use_async_views(True)
+                self.run_asgi(requests[: len(PATHS)], 1)
+                self.report("asgi", *self.run_asgi(requests, options["concurrency"]))
+        finally:
+            use_async_views(False)
+            connections.close_all()
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from investors import summary
+
+
+class Command(BaseCommand):
+    help = "Recompute the per-startup funding summaries from the investment requests."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--startup", type=int, action="append", dest="startups",
+            help="Only this startup id; repeat for more. Default: every startup.",
+        )
+
+    def handle(self, *args, **options):
+        count = summary.rebuild(options["startups"])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {count} funding summaries."))
@@ -0,0 +1,222 @@
+import logging
+import threading
+import time
+
+import numpy as np
+from django.db import connection
+from django.db.models import Count, F
+from django.utils import timezone
+
+from startups.cache import catalogue_version
+from startups.models import Startup
+from .models import InvestmentRequest
+
+
+# relative weight of each signal in the final score
+WEIGHTS = {
+    "industry": 0.4,
+    "funding": 0.3,
+    "stage": 0.15,
+    "recency": 0.15,
+}
+
+# a startup created this many days ago scores 1/e on recency
+RECENCY_DAYS = 30.0
+
+SECONDS_PER_DAY = 86400.0
+
+# a cached matrix is rebuilt at most this often, however often startups change
+REFRESH_SECONDS = 5.0
+
+logger = logging.getLogger(__name__)
+
+
+class StartupMatrix:
+    """
+    Column arrays for every startup still raising, so a score for the whole
+    catalogue is a handful of NumPy operations instead of a loop per row.
+    Industries (tag ids, 0 for none) and stages are stored as integer codes
+    into `industries` / `stages`.
+    """
+
+    def __init__(self, ids, industries, stages, gap, created):
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self.industries, self.industry_codes = np.unique(
+            np.asarray(industries, dtype=object), return_inverse=True
+        )
+        self.stages, self.stage_codes = np.unique(
+            np.asarray(stages, dtype=object), return_inverse=True
+        )
+        self.gap = np.asarray(gap, dtype=np.float64)
+        self.created = np.asarray(created, dtype=np.float64)
+
+    def __len__(self):
+        return len(self.ids)
+
+    @classmethod
+    def from_database(cls):
+        rows = list(
+            Startup.objects.filter(amount_raised__lt=F("funding_goal")).values_list(
+                "id", "industry_tag_id", "stage", "funding_goal", "amount_raised", "created_at"
+            )
+        )
+        if not rows:
+            return cls([], [], [], [], [])
+        ids, industries, stages, goals, raised, created = zip(*rows)
+        return cls(
+            ids,
+            [i or 0 for i in industries],
+            [s.strip().lower() for s in stages],
+            np.asarray(goals, dtype=np.float64) - np.asarray(raised, dtype=np.float64),
+            [c.timestamp() for c in created],
+        )
+
+
+class MatrixCache:
+    """
+    The StartupMatrix of this process. Only the first call waits for a build.
+    After that, a catalogue version bump (any startup write, amount_raised
+    included) starts a rebuild on a background thread, at most one per
+    REFRESH_SECONDS, and callers keep getting the previous matrix until the
+    new one is ready: recommendations lag writes by seconds, but no request
+    pays for reloading the startup table.
+    """
+
+    def __init__(self):
+        self.version = None
+        self.matrix = None
+        self.built_at = 0.0
+        self.refreshing = False
+        self.lock = threading.Lock()
+
+    def get(self):
+        # read the version first: a write landing mid-build leaves the new
+        # matrix filed under the old version, so a later call rebuilds again
+        version = catalogue_version()
+        matrix = self.matrix
+        if matrix is None:
+            with self.lock:
+                if self.matrix is None:
+                    self.build(version)
+                return self.matrix
+        if self.version != version and self.refresh_due():
+            with self.lock:
+                if not self.refreshing:
+                    self.refreshing = True
+                    threading.Thread(target=self.refresh, args=(version,), daemon=True).start()
+        return matrix
+
+    def refresh_due(self):
+        return not self.refreshing and time.monotonic() - self.built_at >= REFRESH_SECONDS
+
+    def build(self, version):
+        matrix = StartupMatrix.from_database()
+        self.matrix, self.version, self.built_at = matrix, version, time.monotonic()
+
+    def refresh(self, version):
+        try:
+            self.build(version)
+        except Exception:
+            logger.exception("Rebuilding the startup matrix failed; serving the previous one")
+            self.built_at = time.monotonic()  # back off as after a build
+        finally:
+            self.refreshing = False
+            connection.close()  # this thread's own connection
+
+
+matrix_cache = MatrixCache()
+
+
+def _code_mask(vocabulary, wanted):
+    # boolean per vocabulary entry; index it with the per-row codes
+    return np.fromiter((v in wanted for v in vocabulary), dtype=bool, count=len(vocabulary))
+
+
+def score_startups(matrix, interests=(), range_min=None, range_max=None,
+                   stage_affinity=None, now=None):
+    """
+    Score every row of `matrix` in [0, 1] for one investor.
+
+    interests      -- set of industry tag ids the investor follows
+    range_min/max  -- the investor's ticket size
+    stage_affinity -- {stage: weight in [0, 1]} learnt from past requests
+    """
+    n = len(matrix)
+    if n == 0:
+        return np.zeros(0)
+
+    # industry overlap; no stated interests means no preference
+    if interests:
+        industry = _code_mask(matrix.industries, interests)[matrix.industry_codes].astype(np.float64)
+    else:
+        industry = np.full(n, 0.5)
+
+    # funding fit: 1 when the remaining gap can take a full ticket, falling off
+    # linearly below that, and halved when it can't even take the minimum
+    gap = matrix.gap
+    if range_max or range_min:
+        hi = float(range_max or range_min)
+        lo = float(range_min or 0)
+        funding = np.clip(gap / hi, 0.0, 1.0)
+        funding = np.where(gap < lo, funding * 0.5, funding)
+    else:
+        funding = np.full(n, 0.5)
+
+    if stage_affinity:
+        weights = np.fromiter(
+            (stage_affinity.get(s, 0.0) for s in matrix.stages),
+            dtype=np.float64,
+            count=len(matrix.stages),
+        )
+        stage = weights[matrix.stage_codes]
+    else:
+        stage = np.full(n, 0.5)
+
+    now = (now or timezone.now()).timestamp()
+    age_days = np.maximum(now - matrix.created, 0.0) / SECONDS_PER_DAY
+    recency = np.exp(-age_days / RECENCY_DAYS)
+
+    return (
+        WEIGHTS["industry"] * industry
+        + WEIGHTS["funding"] * funding
+        + WEIGHTS["stage"] * stage
+        + WEIGHTS["recency"] * recency
+    )
+
+
+def top_matches(scores, ids, limit):
+    """Return (ids, scores) of the `limit` best rows, best first."""
+    if len(scores) == 0:
+        return [], []
+    limit = min(limit, len(scores))
+    top = np.argpartition(-scores, limit - 1)[:limit]
+    top = top[np.argsort(-scores[top], kind="stable")]
+    return ids[top].tolist(), scores[top].tolist()
+
+
+def stage_affinity_for(user):
+    """Share of the investor's past requests made at each stage."""
+    rows = (
+        InvestmentRequest.objects.filter(investor=user)
+        .values("startup__stage")
+        .annotate(n=Count("id"))
+    )
+    counts = {r["startup__stage"].strip().lower(): r["n"] for r in rows}
+    total = sum(counts.values())
+    if not total:
+        return None
+    return {stage: n / total for stage, n in counts.items()}
+
+
+def recommend_for(user, limit):
+    """Best matching startup ids and their scores for `user`, best first."""
+    profile = getattr(user, "investor_profile", None)
+    matrix = matrix_cache.get()
+    scores = score_startups(
+        matrix,
+        interests=set(profile.interest_tags.values_list("id", flat=True)) if profile else (),
+        range_min=profile.investment_range_min if profile else None,
+        range_max=profile.investment_range_max if profile else None,
+        stage_affinity=stage_affinity_for(user),
+    )
+    return top_matches(scores, matrix.ids, limit)
@@ -0,0 +1,58 @@
+# Generated by Django 5.2.5 on 2026-10-17 21:40
+
+import django.db.models.deletion
+from decimal import Decimal
+
+from django.db import migrations, models
+from django.db.models import Count, Max, Q, Sum, Value
+from django.db.models.functions import Coalesce
+
+
+def build_summaries(apps, schema_editor):
+    # same counting as investors.summary.rebuild, against the historical models
+    Startup = apps.get_model('startups', 'Startup')
+    InvestmentRequest = apps.get_model('investors', 'InvestmentRequest')
+    StartupFundingSummary = apps.get_model('investors', 'StartupFundingSummary')
+    amount = models.DecimalField(max_digits=16, decimal_places=2)
+
+    aggregates = {'investors': Count('investor', distinct=True), 'last_activity_at': Max('created_at')}
+    for status in ('pending', 'accepted', 'rejected'):
+        aggregates[f'{status}_count'] = Count('id', filter=Q(status=status))
+        aggregates[f'{status}_amount'] = Coalesce(
+            Sum('amount', filter=Q(status=status)), Value(Decimal(0)), output_field=amount
+        )
+    rows = InvestmentRequest.objects.values('startup_id').annotate(**aggregates).order_by('startup_id')
+    StartupFundingSummary.objects.bulk_create(
+        [StartupFundingSummary(**row) for row in rows], batch_size=2000
+    )
+    StartupFundingSummary.objects.bulk_create(
+        [StartupFundingSummary(startup_id=pk)
+         for pk in Startup.objects.filter(funding_summary__isnull=True).values_list('pk', flat=True)],
+        batch_size=2000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('investors', '0003_savedstartup'),
+        ('startups', '0017_deck_processing'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StartupFundingSummary',
+            fields=[
+                ('startup', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='funding_summary', serialize=False, to='startups.startup')),
+                ('pending_count', models.PositiveIntegerField(default=0)),
+                ('accepted_count', models.PositiveIntegerField(default=0)),
+                ('rejected_count', models.PositiveIntegerField(default=0)),
+                ('pending_amount', models.DecimalField(decimal_places=2, default=0, max_digits=16)),
+                ('accepted_amount', models.DecimalField(decimal_places=2, default=0, max_digits=16)),
+                ('rejected_amount', models.DecimalField(decimal_places=2, default=0, max_digits=16)),
+                ('investors', models.PositiveIntegerField(default=0)),
+                ('last_activity_at', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+        migrations.RunPython(build_summaries, migrations.RunPython.noop),
+    ]
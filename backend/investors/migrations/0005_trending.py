@@ -0,0 +1,57 @@
+# Generated by Django 5.2.5 on 2026-10-17 21:51
+
+import django.db.models.deletion
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def seed_trends(apps, schema_editor):
+    # same scoring as investors.trending.rebuild, against the historical models
+    SavedStartup = apps.get_model('investors', 'SavedStartup')
+    InvestmentRequest = apps.get_model('investors', 'InvestmentRequest')
+    StartupTrend = apps.get_model('investors', 'StartupTrend')
+    TrendingEpoch = apps.get_model('investors', 'TrendingEpoch')
+    half_life = timedelta(days=3)
+    now = timezone.now()
+
+    scores = defaultdict(float)
+    for model, weight in ((SavedStartup, 1.0), (InvestmentRequest, 3.0)):
+        for startup_id, created_at in model.objects.values_list('startup_id', 'created_at').iterator(chunk_size=2000):
+            scores[startup_id] += weight * 2 ** ((created_at - now) / half_life)
+    TrendingEpoch.objects.create(pk=1, epoch=now)
+    StartupTrend.objects.bulk_create(
+        [StartupTrend(startup_id=pk, score=score) for pk, score in scores.items() if score >= 1e-3],
+        batch_size=2000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('investors', '0004_startupfundingsummary'),
+        ('startups', '0018_industry_tags'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrendingEpoch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('epoch', models.DateTimeField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name='StartupTrend',
+            fields=[
+                ('startup', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='trend', serialize=False, to='startups.startup')),
+                ('score', models.FloatField(default=0)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['-score', '-startup'], name='startuptrend_score_idx')],
+            },
+        ),
+        migrations.RunPython(seed_trends, migrations.RunPython.noop),
+    ]
@@ -1,7 +1,18 @@
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth.models import User
 from startups.models import Startup  # adjust if your Startup model is elsewhere
 
+class InvestmentRequestQuerySet(models.QuerySet):
+    def bulk_create(self, objs, *args, **kwargs):
+        # bulk inserts skip save(); recount the startups they touched instead
+        from .summary import rebuild
+
+        with transaction.atomic(using=self.db):
+            objs = super().bulk_create(objs, *args, **kwargs)
+            rebuild({obj.startup_id for obj in objs})
+        return objs
+
+
 class InvestmentRequest(models.Model):
     investor = models.ForeignKey(User, on_delete=models.CASCADE, related_name="investment_requests")
     startup = models.ForeignKey(Startup, on_delete=models.CASCADE, related_name="requests")
@@ -13,9 +24,27 @@ class InvestmentRequest(models.Model):
     default="pending"
     )
 
+    objects = InvestmentRequestQuerySet.as_manager()
+
 
     def __str__(self):
         return f"{self.investor} → {self.startup} ({self.amount})"
+
+    def save(self, *args, **kwargs):
+        # the startup's funding summary moves in the same transaction
+        from .summary import record_changed, record_created
+
+        with transaction.atomic():
+            old = None
+            if not self._state.adding:
+                old = InvestmentRequest.objects.filter(pk=self.pk).values(
+                    "startup_id", "investor_id", "status", "amount"
+                ).first()
+            super().save(*args, **kwargs)
+            if old is None:
+                record_created(self)
+            else:
+                record_changed(old, self)
     
 class SavedStartup(models.Model):
     investor = models.ForeignKey(User, on_delete=models.CASCADE, related_name="saved_startups")
@@ -26,4 +55,53 @@ class SavedStartup(models.Model):
         unique_together = ("investor", "startup")
 
     def __str__(self):
-        return f"{self.investor.username} saved {self.startup.name}"
\ No newline at end of file
+        return f"{self.investor.username} saved {self.startup.name}"
+
+class StartupFundingSummary(models.Model):
+    """
+    Per-startup request counts and amounts by status, kept current in the
+    same transaction as every request write (see investors/summary.py).
+    """
+    startup = models.OneToOneField(
+        Startup, on_delete=models.CASCADE, primary_key=True, related_name="funding_summary"
+    )
+    pending_count = models.PositiveIntegerField(default=0)
+    accepted_count = models.PositiveIntegerField(default=0)
+    rejected_count = models.PositiveIntegerField(default=0)
+    pending_amount = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+    accepted_amount = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+    rejected_amount = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+    investors = models.PositiveIntegerField(default=0)
+    last_activity_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"Funding summary of {self.startup_id}"
+
+
+class StartupTrend(models.Model):
+    """
+    A startup's time-decayed save and request activity, bumped on every new
+    save or request. `score` is relative to TrendingEpoch; see
+    investors/trending.py.
+    """
+    startup = models.OneToOneField(
+        Startup, on_delete=models.CASCADE, primary_key=True, related_name="trend"
+    )
+    score = models.FloatField(default=0)
+
+    class Meta:
+        indexes = [
+            # the trending feed reads this index in order and stops at the limit
+            models.Index(fields=["-score", "-startup"], name="startuptrend_score_idx"),
+        ]
+
+    def __str__(self):
+        return f"Trend of {self.startup_id}: {self.score:g}"
+
+
+class TrendingEpoch(models.Model):
+    """The single row holding the instant StartupTrend scores are relative to."""
+    epoch = models.DateTimeField()
+
+    def __str__(self):
+        return f"Trending epoch {self.epoch:%Y-%m-%d %H:%M}"
@@ -1,13 +1,14 @@
 # investors/serializers.py
 from rest_framework import serializers
-from .models import InvestmentRequest,SavedStartup
+from .models import InvestmentRequest,SavedStartup, StartupFundingSummary
 from startups.models import Startup
+from startups.fieldsets import SparseFieldsMixin
 from startups.serializers import StartupSerializer
 from profiles.serializers import InvestorProfileSerializer
 from decimal import Decimal
 
 
-class InvestmentRequestSerializer(serializers.ModelSerializer):
+class InvestmentRequestSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     startup = StartupSerializer(read_only=True)
     investor = InvestorProfileSerializer(source='investor.investor_profile', read_only=True)
 
@@ -46,9 +47,32 @@ class InvestmentRequestSerializer(serializers.ModelSerializer):
         return data
 
 
-class SavedStartupSerializer(serializers.ModelSerializer):
+class SavedStartupSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     startup = StartupSerializer(read_only=True)
 
     class Meta:
         model = SavedStartup
         fields = ["id", "startup", "created_at"]
+
+
+# Read-only: a founder dashboard row, the startup's own figures plus its summary
+class StartupFundingSummarySerializer(serializers.ModelSerializer):
+    id = serializers.IntegerField(source="startup_id", read_only=True)
+    name = serializers.CharField(source="startup.name", read_only=True)
+    funding_goal = serializers.DecimalField(
+        source="startup.funding_goal", max_digits=12, decimal_places=2, read_only=True
+    )
+    amount_raised = serializers.DecimalField(
+        source="startup.amount_raised", max_digits=12, decimal_places=2, read_only=True
+    )
+
+    class Meta:
+        model = StartupFundingSummary
+        fields = [
+            "id", "name", "funding_goal", "amount_raised",
+            "pending_count", "pending_amount",
+            "accepted_count", "accepted_amount",
+            "rejected_count", "rejected_amount",
+            "investors", "last_activity_at",
+        ]
+        read_only_fields = fields
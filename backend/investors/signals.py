@@ -0,0 +1,39 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from startups.cache import invalidate_activity
+from startups.models import Startup
+from .models import InvestmentRequest, SavedStartup
+from .summary import create_empty, record_deleted
+from . import trending
+
+
+@receiver(post_save, sender=InvestmentRequest)
+@receiver(post_delete, sender=InvestmentRequest)
+@receiver(post_save, sender=SavedStartup)
+@receiver(post_delete, sender=SavedStartup)
+def activity_changed(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    invalidate_activity()
+
+
+# deletes run in the collector's transaction, so the summary moves with them;
+# saves are handled in InvestmentRequest.save
+@receiver(post_delete, sender=InvestmentRequest)
+def request_deleted(sender, instance, **kwargs):
+    record_deleted(instance)
+
+
+@receiver(post_save, sender=Startup)
+def startup_created(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        create_empty(instance.pk)
+
+
+# bulk inserts skip this; trending.rebuild() catches up after them
+@receiver(post_save, sender=InvestmentRequest)
+@receiver(post_save, sender=SavedStartup)
+def activity_created(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        trending.record(instance.startup_id, trending.WEIGHTS[sender], instance.created_at)
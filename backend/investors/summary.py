@@ -0,0 +1,183 @@
+"""
+Upkeep of StartupFundingSummary.
+
+Every request write adjusts its startup's row with F() updates in the same
+transaction:
+- creation and admin edits go through InvestmentRequest.save;
+- status changes go through investors/funding.py;
+- deletes go through the post_delete signal;
+- bulk inserts recount their startups in InvestmentRequest.objects.bulk_create.
+Other queryset.update() calls on status bypass all of this.
+`rebuild()` recomputes rows from the requests themselves. It backs the
+rebuild_funding_summaries command, and it repairs a startup that has no
+row yet.
+"""
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, DecimalField, F, Max, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from startups.models import Startup
+from startups.projection import projection
+from .models import InvestmentRequest, StartupFundingSummary
+from .serializers import StartupFundingSummarySerializer
+
+
+STATUSES = ("pending", "accepted", "rejected")
+
+AMOUNT = DecimalField(max_digits=16, decimal_places=2)
+
+REBUILD_BATCH = 2000
+
+CENT = Decimal("0.01")
+
+
+def _contribution(deltas, status, amount, sign):
+    # unsaved instances may still hold what was passed in: "5", 5, 5.0
+    amount = InvestmentRequest._meta.get_field("amount").to_python(amount)
+    deltas[f"{status}_count"] = deltas.get(f"{status}_count", 0) + sign
+    deltas[f"{status}_amount"] = deltas.get(f"{status}_amount", 0) + sign * amount
+
+
+def _other_requests(startup_id, investor_id, pk):
+    return InvestmentRequest.objects.filter(
+        startup_id=startup_id, investor_id=investor_id
+    ).exclude(pk=pk).exists()
+
+
+def _distinct_investors():
+    return Coalesce(Subquery(
+        InvestmentRequest.objects.filter(startup_id=OuterRef("startup_id"))
+        .order_by().values("startup_id").annotate(n=Count("investor", distinct=True)).values("n")
+    ), 0)
+
+
+def _apply(startup_id, deltas, repair=True, **values):
+    """F() the non-zero `deltas` into the startup's row and stamp its activity."""
+    changes = {field: F(field) + delta for field, delta in deltas.items() if delta}
+    updated = StartupFundingSummary.objects.filter(startup_id=startup_id).update(
+        **changes, **values, last_activity_at=timezone.now()
+    )
+    if not updated and repair:
+        # a bulk-created startup that never got its row: count it from scratch
+        rebuild([startup_id])
+        StartupFundingSummary.objects.filter(startup_id=startup_id).update(last_activity_at=timezone.now())
+
+
+def record_created(req):
+    deltas = {}
+    _contribution(deltas, req.status, req.amount, 1)
+    if not _other_requests(req.startup_id, req.investor_id, req.pk):
+        deltas["investors"] = 1
+    _apply(req.startup_id, deltas)
+
+
+def record_changed(old, req):
+    """`old`: the startup_id, investor_id, status and amount `req` had before saving."""
+    if (old["startup_id"], old["investor_id"]) != (req.startup_id, req.investor_id):
+        record_deleted(InvestmentRequest(pk=req.pk, **old))
+        record_created(req)
+        return
+    deltas = {}
+    _contribution(deltas, old["status"], old["amount"], -1)
+    _contribution(deltas, req.status, req.amount, 1)
+    _apply(req.startup_id, deltas)
+
+
+def record_deleted(req):
+    deltas = {}
+    _contribution(deltas, req.status, req.amount, -1)
+    # investors is recounted, not decremented: post_delete fires once the
+    # whole batch is gone, so requests deleted together can't see each other.
+    # No repair: when the startup itself is being deleted its row goes too.
+    _apply(req.startup_id, deltas, repair=False, investors=_distinct_investors())
+
+
+def record_transitions(transitions):
+    """
+    Status changes made with queryset.update(): (startup_id, amount,
+    old_status, new_status) tuples, applied as one UPDATE per startup.
+    """
+    by_startup = {}
+    for startup_id, amount, old_status, new_status in transitions:
+        if old_status == new_status:
+            continue
+        deltas = by_startup.setdefault(startup_id, {})
+        _contribution(deltas, old_status, amount, -1)
+        _contribution(deltas, new_status, amount, 1)
+    for startup_id, deltas in by_startup.items():
+        _apply(startup_id, deltas)
+
+
+def _aggregates():
+    aggregates = {"investors": Count("investor", distinct=True), "last_activity_at": Max("created_at")}
+    for status in STATUSES:
+        aggregates[f"{status}_count"] = Count("id", filter=Q(status=status))
+        aggregates[f"{status}_amount"] = Coalesce(
+            Sum("amount", filter=Q(status=status)), Value(Decimal(0)), output_field=AMOUNT
+        )
+    return aggregates
+
+
+def rebuild(startup_ids=None):
+    """
+    Recompute the rows of `startup_ids`, or of every startup, from their
+    requests; startups without requests get an empty row. Status changes
+    leave no timestamp on the request, so a later last_activity_at already
+    recorded is kept. Returns the number of rows.
+    """
+    startups = Startup.objects.all()
+    requests = InvestmentRequest.objects.all()
+    summaries = StartupFundingSummary.objects.all()
+    if startup_ids is not None:
+        startups = startups.filter(pk__in=startup_ids)
+        requests = requests.filter(startup_id__in=startup_ids)
+        summaries = summaries.filter(startup_id__in=startup_ids)
+
+    with transaction.atomic():
+        previous = dict(summaries.exclude(last_activity_at=None).values_list("startup_id", "last_activity_at"))
+        summaries.delete()
+        rows, count = [], 0
+        grouped = requests.values("startup_id").annotate(**_aggregates()).order_by("startup_id")
+        for row in grouped.iterator(chunk_size=REBUILD_BATCH):
+            kept = previous.get(row["startup_id"])
+            if kept and kept > row["last_activity_at"]:
+                row["last_activity_at"] = kept
+            rows.append(StartupFundingSummary(**row))
+            if len(rows) == REBUILD_BATCH:
+                count += len(StartupFundingSummary.objects.bulk_create(rows))
+                rows = []
+        count += len(StartupFundingSummary.objects.bulk_create(rows))
+
+        empty = startups.filter(funding_summary__isnull=True).values_list("pk", flat=True)
+        rows = [StartupFundingSummary(startup_id=pk) for pk in empty.iterator(chunk_size=REBUILD_BATCH)]
+        count += len(StartupFundingSummary.objects.bulk_create(rows, batch_size=REBUILD_BATCH))
+    return count
+
+
+def create_empty(startup_id):
+    StartupFundingSummary.objects.get_or_create(startup_id=startup_id)
+
+
+def founder_dashboard(founder):
+    """
+    One row per startup of `founder` plus totals across them, from one query
+    over the summaries and one distinct count of investors (someone backing
+    two of the startups is one investor in the totals).
+    """
+    rows = projection(StartupFundingSummarySerializer)
+    raw_rows = list(rows.queryset(
+        StartupFundingSummary.objects.filter(startup__founder=founder)
+        .order_by("-startup__created_at", "-startup_id")
+    ))
+    investors = InvestmentRequest.objects.filter(startup__founder=founder).aggregate(
+        n=Count("investor", distinct=True)
+    )["n"]
+    totals = {"startups": len(raw_rows), "investors": investors}
+    for status in STATUSES:
+        totals[f"{status}_count"] = sum(r[f"{status}_count"] for r in raw_rows)
+        amount = sum((r[f"{status}_amount"] for r in raw_rows), Decimal(0))
+        totals[f"{status}_amount"] = f"{amount.quantize(CENT):f}"
+    return {"startups": [rows.build(raw) for raw in raw_rows], "totals": totals}
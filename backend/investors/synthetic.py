@@ -0,0 +1,249 @@
+import copy
+import random
+from datetime import datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from functools import lru_cache
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import transaction
+
+from accounts.models import Profile
+from profiles.models import FounderProfile, InvestorProfile
+from startups.cache import invalidate_activity, invalidate_catalogue
+from startups.models import Startup
+from .models import InvestmentRequest, SavedStartup, StartupFundingSummary
+from . import trending
+
+
+INDUSTRIES = [
+    "Fintech", "Edtech", "Healthtech", "Agritech", "SaaS", "Climate",
+    "AI", "E-commerce", "Logistics", "Gaming", "Biotech", "Proptech",
+]
+STAGES = ["Idea", "Pre-seed", "Seed", "Series A", "Series B"]
+LOCATIONS = [
+    "Bengaluru", "Mumbai", "Delhi", "Pune", "Hyderabad", "Chennai",
+    "London", "Berlin", "Singapore", "San Francisco", "New York", "Remote",
+]
+SKILLS = ["Product", "Engineering", "Sales", "Marketing", "Finance", "Design", "Operations", "Data"]
+WORDS = [
+    "smart", "cloud", "green", "rapid", "open", "micro", "hyper", "neo",
+    "pay", "learn", "farm", "care", "grid", "ship", "play", "lab",
+]
+STATUSES = ["pending", "accepted", "rejected"]
+STATUS_WEIGHTS = [0.5, 0.3, 0.2]
+
+# default spread of created_at values, ending at the seed's anchor
+HISTORY_DAYS = 730
+
+# seed n's timestamps end n days after this, whenever it runs
+ANCHOR = datetime(2025, 1, 1, tzinfo=dt_timezone.utc)
+
+CENT = Decimal("0.01")
+
+
+def _batches(total, size):
+    for start in range(0, total, size):
+        yield start, min(start + size, total)
+
+
+def _as_given(field):
+    # the same column with auto_now_add off: pre_save returns the value set
+    field = copy.copy(field)
+    field.auto_now_add = False
+    return field
+
+
+@lru_cache(maxsize=None)
+def _dated(queryset_class):
+    class DatedQuerySet(queryset_class):
+        def _batched_insert(self, objs, fields, *args, **kwargs):
+            fields = [_as_given(f) if f.name == "created_at" else f for f in fields]
+            return super()._batched_insert(objs, fields, *args, **kwargs)
+    return DatedQuerySet
+
+
+def _bulk_create_dated(model, objs, batch_size):
+    """
+    bulk_create `objs` keeping the created_at values they were given. The
+    insert goes through the model's own queryset (so its bulk_create hooks
+    still run) with a copy of the created_at field that has auto_now_add
+    off; the model's field itself is untouched, so nothing else saving in
+    the process meanwhile is affected.
+    """
+    queryset = model.objects.all()
+    queryset.__class__ = _dated(type(queryset))
+    return queryset.bulk_create(objs, batch_size=batch_size)
+
+
+class Generator:
+    """
+    Deterministic bulk data for load and scaling tests. The same seed and
+    counts produce the same rows, timestamps included; created_at values
+    are spread over the `history_days` before `now`, which defaults to a
+    fixed date derived from the seed.
+    """
+
+    def __init__(self, seed=0, batch_size=5000, prefix="gen", password="loadtest-password",
+                 now=None, history_days=HISTORY_DAYS, log=None):
+        self.rng = random.Random(seed)
+        self.batch_size = batch_size
+        self.prefix = prefix
+        self.password = make_password(password)  # hashed once, shared by every user
+        self.now = now or ANCHOR + timedelta(days=seed % 365)
+        self.history = history_days * 86400
+        self.log = log or (lambda message: None)
+
+    def created_at(self, after=None):
+        # uniform over the history window, never before `after`
+        low = 0 if after is None else int((after - self.now).total_seconds()) + self.history
+        return self.now - timedelta(seconds=self.history - self.rng.randint(max(low, 0), self.history))
+
+    def money(self, low, high, step=1000):
+        return Decimal(self.rng.randrange(low // step, high // step + 1) * step)
+
+    def users(self, role, count):
+        """Users with a Profile and a role profile; returns their ids."""
+        ids = []
+        profile_model = FounderProfile if role == "Founder" else InvestorProfile
+        for start, end in _batches(count, self.batch_size):
+            with transaction.atomic():
+                users = User.objects.bulk_create(
+                    User(
+                        username=f"{self.prefix}-{role.lower()}-{i}",
+                        email=f"{self.prefix}-{role.lower()}-{i}@example.com",
+                        password=self.password,
+                        date_joined=self.created_at(),
+                    )
+                    for i in range(start, end)
+                )
+                Profile.objects.bulk_create(Profile(user=u, role=role) for u in users)
+                profile_model.objects.bulk_create(self.role_profile(profile_model, u) for u in users)
+            ids.extend(u.pk for u in users)
+            self.log(f"{role.lower()}s: {end}/{count}")
+        return ids
+
+    def role_profile(self, model, user):
+        rng = self.rng
+        common = {
+            "user": user,
+            "full_name": user.username.replace("-", " ").title(),
+            "email": user.email,
+            "location": rng.choice(LOCATIONS),
+        }
+        if model is FounderProfile:
+            return FounderProfile(
+                company=f"{rng.choice(WORDS).title()}{rng.choice(WORDS)}",
+                skills=", ".join(rng.sample(SKILLS, rng.randint(1, 3))),
+                **common,
+            )
+        low = self.money(10_000, 200_000)
+        return InvestorProfile(
+            investment_range_min=low,
+            investment_range_max=low + self.money(50_000, 2_000_000),
+            industries_of_interest=", ".join(rng.sample(INDUSTRIES, rng.randint(1, 3))),
+            **common,
+        )
+
+    def startup(self, i, founder_id):
+        rng = self.rng
+        goal = self.money(100_000, 5_000_000, step=10_000)
+        equity = Decimal(rng.randint(2, 30))
+        return Startup(
+            founder_id=founder_id,
+            name=f"{rng.choice(WORDS).title()}{rng.choice(WORDS)} {i}",
+            industry=rng.choice(INDUSTRIES),
+            stage=rng.choice(STAGES),
+            funding_goal=goal,
+            equity=equity,
+            # Startup.save() is bypassed, so derive valuation the same way here
+            valuation=(goal / (equity / 100)).quantize(CENT),
+            description=" ".join(rng.choices(WORDS, k=12)),
+            team_size=rng.randint(1, 200),
+            location=rng.choice(LOCATIONS),
+            created_at=self.created_at(),
+        )
+
+    def requests_for(self, startup, investor_ids, count):
+        """
+        `count` requests on `startup`. Accepted amounts are capped by what is
+        left to raise and summed into startup.amount_raised.
+        """
+        rng = self.rng
+        rows = []
+        for investor_id in rng.choices(investor_ids, k=count):
+            status_choice = rng.choices(STATUSES, STATUS_WEIGHTS)[0]
+            amount = self.money(5_000, int(startup.funding_goal) // 4 or 5_000)
+            if status_choice == "accepted":
+                left = startup.funding_goal - startup.amount_raised
+                if amount > left:
+                    status_choice = "rejected"
+                else:
+                    startup.amount_raised += amount
+            rows.append(InvestmentRequest(
+                investor_id=investor_id,
+                amount=amount,
+                status=status_choice,
+                created_at=self.created_at(after=startup.created_at),
+            ))
+        return rows
+
+    def startups(self, count, founder_ids, investor_ids, requests, saved):
+        """
+        Startups with `requests` investment requests and `saved` saves spread
+        evenly across them, written one batch of startups at a time.
+        """
+        per_request, extra_requests = divmod(requests, count) if count else (0, 0)
+        per_saved, extra_saved = divmod(saved, count) if count else (0, 0)
+        totals = {"startups": 0, "requests": 0, "saved": 0}
+
+        for start, end in _batches(count, self.batch_size):
+            startups, pending_requests, pending_saved = [], [], []
+            for i in range(start, end):
+                startup = self.startup(i, founder_ids[i % len(founder_ids)])
+                startup.amount_raised = Decimal(0)
+                n = per_request + (i < extra_requests)
+                pending_requests.append(self.requests_for(startup, investor_ids, n) if n else [])
+                n = min(per_saved + (i < extra_saved), len(investor_ids))
+                pending_saved.append([
+                    SavedStartup(investor_id=investor_id,
+                                 created_at=self.created_at(after=startup.created_at))
+                    for investor_id in self.rng.sample(investor_ids, n)
+                ])
+                startups.append(startup)
+
+            with transaction.atomic():
+                _bulk_create_dated(Startup, startups, self.batch_size)
+                # bulk_create skips the post_save that gives a startup its
+                # summary row; InvestmentRequest.bulk_create fills them in,
+                # last_activity_at from the created_at values just inserted
+                StartupFundingSummary.objects.bulk_create(
+                    [StartupFundingSummary(startup_id=startup.pk) for startup in startups]
+                )
+                for startup, rows, saves in zip(startups, pending_requests, pending_saved):
+                    for row in rows:
+                        row.startup_id = startup.pk
+                    for row in saves:
+                        row.startup_id = startup.pk
+                batch_requests = [r for rows in pending_requests for r in rows]
+                batch_saved = [s for saves in pending_saved for s in saves]
+                _bulk_create_dated(InvestmentRequest, batch_requests, self.batch_size)
+                _bulk_create_dated(SavedStartup, batch_saved, self.batch_size)
+
+            totals["startups"] = end
+            totals["requests"] += len(batch_requests)
+            totals["saved"] += len(batch_saved)
+            self.log(f"startups: {end}/{count}")
+        return totals
+
+    def run(self, founders, investors, startups, requests, saved):
+        founder_ids = self.users("Founder", founders)
+        investor_ids = self.users("Investor", investors)
+        totals = {"founders": len(founder_ids), "investors": len(investor_ids)}
+        totals.update(self.startups(startups, founder_ids, investor_ids, requests, saved))
+
+        # bulk_create skips the signals that normally do this per row
+        trending.rebuild(self.now)
+        invalidate_catalogue()
+        invalidate_activity()
+        return totals
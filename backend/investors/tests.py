@@ -1,3 +1,849 @@
-from django.test import TestCase
+import base64
+import csv
+import gzip
+import io
+import json
+import shutil
+import tempfile
+import threading
+from datetime import datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.db import connection, connections
+from django.http import StreamingHttpResponse
+from django.test import AsyncRequestFactory, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from accounts.tokens import issue_token
+from backend.profiling import ProfilingMiddleware, get_store
+from profiles.models import FounderProfile, InvestorProfile
+from startups.models import Startup
+from startups.projection import projection, render
+from startups.serializers import StartupSerializer
+from . import async_views
+from .analytics import portfolio_analytics
+from .exports import CHUNK_SIZE, export_response
+from .funding import FundingCapExceeded, set_request_status
+from .models import InvestmentRequest, SavedStartup, StartupFundingSummary, StartupTrend
+from .synthetic import Generator
+from .serializers import InvestmentRequestSerializer, SavedStartupSerializer, StartupFundingSummarySerializer
+from .trending import compact, rebuild, record
+
+
+class ListQueryBudgetTests(TestCase):
+    """
+    Every list endpoint must load its nested relations in a fixed number of
+    queries, whatever the number of rows.
+    """
+
+    SIZES = (10, 100, 1000)
+
+    # endpoint -> max queries per request
+    BUDGETS = {
+        # first page: one page query + one grouped count per facet
+        "/api/investors/browse/": 5,
+        "/api/investors/browse/?industry=Fintech&raising=true": 5,
+        "/api/investors/browse/?all=true": 1,
+        "/api/investors/requests/": 1,
+        "/api/investors/founder/requests/": 1,
+        "/api/investors/my-investments/": 1,
+        "/api/investors/saved/": 1,
+        "/api/startups/": 1,
+    }
+
+    def seed(self, n):
+        # bulk_create sends no signals, so drop cached catalogue payloads by hand
+        caches["catalogue"].clear()
+        InvestmentRequest.objects.all().delete()
+        SavedStartup.objects.all().delete()
+        Startup.objects.all().delete()
+
+        startups = Startup.objects.bulk_create(
+            Startup(
+                founder=self.founder,
+                name=f"Startup {i}",
+                industry="Fintech",
+                funding_goal=Decimal("100000"),
+            )
+            for i in range(n)
+        )
+        InvestmentRequest.objects.bulk_create(
+            InvestmentRequest(
+                investor=self.investor,
+                startup=s,
+                amount=Decimal("10"),
+                status="accepted",
+            )
+            for s in startups
+        )
+        SavedStartup.objects.bulk_create(
+            SavedStartup(investor=self.investor, startup=s) for s in startups
+        )
+
+    def client_for(self, path):
+        client = APIClient()
+        if "founder" in path or path.startswith("/api/startups/"):
+            client.force_authenticate(self.founder)
+        else:
+            client.force_authenticate(self.investor)
+        return client
+
+    def setUp(self):
+        self.founder = User.objects.create_user("founder", password="pw")
+        self.investor = User.objects.create_user("investor", password="pw")
+        FounderProfile.objects.create(user=self.founder, full_name="Founder")
+        InvestorProfile.objects.create(user=self.investor, full_name="Investor")
+
+    def test_list_endpoints_stay_within_query_budget(self):
+        for n in self.SIZES:
+            self.seed(n)
+            for path, budget in self.BUDGETS.items():
+                with self.subTest(path=path, rows=n):
+                    client = self.client_for(path)
+                    with CaptureQueriesContext(connection) as ctx:
+                        response = client.get(path)
+                    self.assertEqual(response.status_code, 200)
+                    self.assertLessEqual(len(ctx.captured_queries), budget)
+
+    def test_nested_payload_is_populated(self):
+        self.seed(10)
+        data = self.client_for("/api/investors/my-investments/").get(
+            "/api/investors/my-investments/"
+        ).json()
+        self.assertEqual(len(data), 10)
+        self.assertEqual(data[0]["investor"]["full_name"], "Investor")
+        self.assertEqual(data[0]["startup"]["founder"]["full_name"], "Founder")
+
+
+class ProjectionParityTests(TestCase):
+    """
+    The projection read path behind every list endpoint renders the same
+    bytes as the DRF serializer and JSONRenderer for the same queryset.
+    """
+
+    # serializer, queryset the list endpoints serve it from, parsed ?fields= / ?expand=
+    CASES = [
+        (StartupSerializer, lambda: Startup.objects.select_related("founder__founder_profile"),
+         [(None, None), (("funding_goal", "founder.full_name", "valuation"), None), (None, ())]),
+        (InvestmentRequestSerializer, lambda: InvestmentRequest.objects.select_related(
+            "startup__founder__founder_profile", "investor__investor_profile",
+        ), [(None, None), (("amount", "created_at", "startup.valuation"), None), (None, ("startup",))]),
+        (SavedStartupSerializer, lambda: SavedStartup.objects.select_related("startup__founder__founder_profile"),
+         [(None, None), (None, ())]),
+        (StartupFundingSummarySerializer, lambda: StartupFundingSummary.objects.select_related("startup"),
+         [(None, None)]),
+    ]
+
+    def setUp(self):
+        founder = User.objects.create_user("founder", password="pw")
+        FounderProfile.objects.create(
+            user=founder, full_name="Fo\u2028under", bio="line\u2029break \"quoted\" \\ é 🚀", skills="Go, Rust",
+        )
+        investor = User.objects.create_user("investor", password="pw")
+        InvestorProfile.objects.create(
+            user=investor, full_name="Investor", investment_range_min=Decimal("0.5"),
+        )
+        # no investor profile and no founder: the nested objects are null
+        bare = User.objects.create_user("bare", password="pw")
+        described = Startup.objects.create(
+            founder=founder, name="Described", industry="Fintech", funding_goal=Decimal("1234567.5"),
+            equity=Decimal("7"), team_size=3, pitch_deck="pitch_decks/ab/deck.pdf",
+        )
+        orphan = Startup.objects.create(name="Orphan\u2028", funding_goal=Decimal("0.01"))
+        for startup in (described, orphan):
+            InvestmentRequest.objects.create(investor=investor, startup=startup, amount=Decimal("0.1"))
+            InvestmentRequest.objects.create(
+                investor=bare, startup=startup, amount=Decimal("99.99"), status="accepted"
+            )
+            SavedStartup.objects.create(investor=investor, startup=startup)
+        # no requests: a null last_activity_at in its summary
+        Startup.objects.create(founder=founder, name="Idle", funding_goal=Decimal("10"))
+        InvestmentRequest.objects.update(created_at=timezone.now().replace(microsecond=123456))
+
+    def assertParity(self, serializer_class, queryset, fields, expand):
+        kwargs = {} if fields is None and expand is None else {"fields": fields, "expand": expand}
+        expected = JSONRenderer().render(serializer_class(queryset, many=True, **kwargs).data)
+        actual = render(projection(serializer_class, fields, expand).rows(queryset))
+        self.assertEqual(actual, expected)
+
+    def test_projection_renders_the_serializer_bytes(self):
+        for serializer_class, queryset, fieldsets in self.CASES:
+            for fields, expand in fieldsets:
+                # datetimes render in the current timezone
+                for tz in ("UTC", "Pacific/Kiritimati"):
+                    with self.subTest(serializer_class.__name__, fields=fields, expand=expand, tz=tz), \
+                            timezone.override(tz):
+                        self.assertParity(serializer_class, queryset().order_by("-pk"), fields, expand)
+
+    def test_values_that_need_escaping_survive(self):
+        body = render(projection(StartupSerializer).rows(Startup.objects.order_by("pk")))
+        self.assertIn(b"\\u2028", body)
+        self.assertIn(b"\\u2029", body)
+        self.assertNotIn("\u2028".encode(), body)
+        described, orphan = json.loads(body)[:2]
+        self.assertEqual(described["funding_goal"], "1234567.50")
+        self.assertEqual(described["founder"]["skills"], ["Go", "Rust"])
+        # DRF leaves out a nested object whose source hop is null
+        self.assertNotIn("founder", orphan)
+        self.assertIsNone(orphan["equity"])
+
+
+class ConcurrentAcceptTests(TransactionTestCase):
+    """Hundreds of concurrent accepts against one startup must never lose an
+    update or overshoot funding_goal."""
+
+    REQUESTS = 300
+    THREADS = 16
+
+    def setUp(self):
+        self.founder = User.objects.create_user("founder", password="pw")
+        self.investor = User.objects.create_user("investor", password="pw")
+        # room for exactly 2/3 of the requests
+        self.startup = Startup.objects.create(
+            founder=self.founder, name="Hot", funding_goal=Decimal(self.REQUESTS * 2 // 3 * 10)
+        )
+        InvestmentRequest.objects.bulk_create(
+            InvestmentRequest(investor=self.investor, startup=self.startup, amount=Decimal("10"))
+            for _ in range(self.REQUESTS)
+        )
+
+    def accept_all(self, reqs):
+        results = {"accepted": 0, "refused": 0}
+        lock = threading.Lock()
+        barrier = threading.Barrier(self.THREADS)
+
+        def worker(chunk):
+            barrier.wait()
+            try:
+                for req in chunk:
+                    try:
+                        set_request_status(req, "accepted")
+                        outcome = "accepted"
+                    except FundingCapExceeded:
+                        outcome = "refused"
+                    with lock:
+                        results[outcome] += 1
+            finally:
+                connections.close_all()
+
+        threads = [
+            threading.Thread(target=worker, args=(reqs[i::self.THREADS],))
+            for i in range(self.THREADS)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        return results
+
+    def test_concurrent_accepts_are_exact(self):
+        reqs = list(InvestmentRequest.objects.all())
+        results = self.accept_all(reqs)
+
+        self.startup.refresh_from_db()
+        accepted = InvestmentRequest.objects.filter(status="accepted").count()
+        self.assertEqual(self.startup.amount_raised, self.startup.funding_goal)
+        self.assertEqual(accepted, self.REQUESTS * 2 // 3)
+        self.assertEqual(results["accepted"], accepted)
+        self.assertEqual(results["refused"], self.REQUESTS - accepted)
+
+    def test_same_request_accepted_concurrently_counts_once(self):
+        req = InvestmentRequest.objects.first()
+        self.accept_all([req] * self.THREADS * 4)
+
+        self.startup.refresh_from_db()
+        self.assertEqual(self.startup.amount_raised, req.amount)
+
+
+class FundingInvariantTests(TestCase):
+    """amount_raised must equal the accepted requests' total, and the funding
+    summary must agree with it, through every status transition."""
+
+    def setUp(self):
+        self.founder = User.objects.create_user("founder", password="pw")
+        self.investor = User.objects.create_user("investor", password="pw")
+        self.startup = Startup.objects.create(
+            founder=self.founder, name="Capped", funding_goal=Decimal("100")
+        )
+        self.first, self.second = [
+            InvestmentRequest.objects.create(investor=self.investor, startup=self.startup, amount=Decimal("60"))
+            for _ in range(2)
+        ]
+
+    def assertInvariant(self):
+        self.startup.refresh_from_db()
+        accepted = sum(
+            InvestmentRequest.objects.filter(startup=self.startup, status="accepted")
+            .values_list("amount", flat=True),
+            Decimal(0),
+        )
+        self.assertEqual(self.startup.amount_raised, accepted)
+        self.assertEqual(self.startup.funding_summary.accepted_amount, accepted)
+        self.assertLessEqual(self.startup.amount_raised, self.startup.funding_goal)
+
+    def test_rejecting_an_accepted_request_gives_its_amount_back(self):
+        set_request_status(self.first, "accepted")
+        with self.assertRaises(FundingCapExceeded):
+            set_request_status(self.second, "accepted")
+        set_request_status(self.first, "rejected")
+        self.assertInvariant()
+        self.assertEqual(self.startup.amount_raised, 0)
+
+        set_request_status(self.second, "accepted")
+        with self.assertRaises(FundingCapExceeded):
+            set_request_status(self.first, "accepted")
+        self.assertInvariant()
+        self.assertEqual(self.startup.amount_raised, Decimal("60"))
+
+    def test_repeated_rejects_count_once(self):
+        set_request_status(self.first, "accepted")
+        set_request_status(self.first, "rejected")
+        set_request_status(self.first, "rejected")
+        set_request_status(self.first, "pending")
+        self.assertInvariant()
+        self.assertEqual(self.startup.amount_raised, 0)
+
+    def test_bulk_reject_frees_room_for_later_accepts(self):
+        set_request_status(self.first, "accepted")
+        third = InvestmentRequest.objects.create(investor=self.investor, startup=self.startup, amount=Decimal("60"))
+        client = APIClient()
+        client.force_authenticate(self.founder)
+        response = client.post("/api/investors/founder/requests/bulk/", {"updates": [
+            {"id": self.first.pk, "status": "rejected"},
+            {"id": self.second.pk, "status": "accepted"},
+            {"id": third.pk, "status": "accepted"},
+        ]}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [r["result"] for r in response.json()["results"]], ["rejected", "accepted", "refused"]
+        )
+        self.assertInvariant()
+        self.assertEqual(self.startup.amount_raised, Decimal("60"))
+
+
+class FundingSummaryTests(TestCase):
+    def setUp(self):
+        self.founder = User.objects.create_user("founder", password="pw")
+        self.investor = User.objects.create_user("investor", password="pw")
+        self.startups = [
+            Startup.objects.create(founder=self.founder, name=f"Startup {i}", funding_goal=Decimal("1000"))
+            for i in range(2)
+        ]
+
+    def test_amount_given_as_text_or_number(self):
+        for amount in ("5", 7, 2.5):
+            InvestmentRequest.objects.create(investor=self.investor, startup=self.startups[0], amount=amount)
+        summary = self.startups[0].funding_summary
+        summary.refresh_from_db()
+        self.assertEqual(summary.pending_count, 3)
+        self.assertEqual(summary.pending_amount, Decimal("14.50"))
+
+    def test_dashboard_counts_each_investor_once(self):
+        other = User.objects.create_user("other", password="pw")
+        for startup in self.startups:
+            InvestmentRequest.objects.create(investor=self.investor, startup=startup, amount=Decimal("10"))
+        InvestmentRequest.objects.create(investor=other, startup=self.startups[0], amount=Decimal("10"))
+
+        client = APIClient()
+        client.force_authenticate(self.founder)
+        data = client.get("/api/investors/founder/summary/").json()
+        self.assertEqual([row["investors"] for row in data["startups"]], [1, 2])
+        self.assertEqual(data["totals"]["investors"], 2)
+        self.assertEqual(data["totals"]["pending_amount"], "30.00")
+
+
+class KeysetPaginationTests(TestCase):
+    URL = "/api/investors/browse/"
+
+    def setUp(self):
+        caches["catalogue"].clear()
+        founder = User.objects.create_user("founder", password="pw")
+        investor = User.objects.create_user("investor", password="pw")
+        Startup.objects.bulk_create(
+            Startup(founder=founder, name=f"Startup {i}", funding_goal=Decimal("1000"))
+            for i in range(11)
+        )
+        # most rows share a created_at, so only the id breaks the tie
+        now = timezone.now()
+        pks = list(Startup.objects.order_by("id").values_list("id", flat=True))
+        Startup.objects.filter(id__in=pks[:8]).update(created_at=now)
+        for i, pk in enumerate(pks[8:], 1):
+            Startup.objects.filter(id=pk).update(created_at=now - timedelta(seconds=i))
+        self.expected = list(Startup.objects.order_by("-created_at", "-id").values_list("id", flat=True))
+        self.client = APIClient()
+        self.client.force_authenticate(investor)
+
+    def get(self, **params):
+        return self.client.get(self.URL, {"page_size": 3, "fields": "id", **params})
+
+    def test_pages_over_tied_rows_have_no_duplicates_or_gaps(self):
+        seen, cursor = [], None
+        while True:
+            data = self.get(**({"cursor": cursor} if cursor else {})).json()
+            seen += [row["id"] for row in data["results"]]
+            cursor = data["next"]
+            if cursor is None:
+                break
+        self.assertEqual(seen, self.expected)
+
+    def test_last_page_has_no_next_cursor(self):
+        data = self.get(page_size=len(self.expected)).json()
+        self.assertEqual(len(data["results"]), len(self.expected))
+        self.assertIsNone(data["next"])
+        # one short of the total still needs a next page
+        self.assertIsNotNone(self.get(page_size=len(self.expected) - 1).json()["next"])
+
+    def test_bad_cursor_is_rejected(self):
+        def raw(payload):
+            return base64.urlsafe_b64encode(payload).decode()
+
+        valid = self.get().json()["next"]
+        bad = [
+            "not a cursor!",
+            valid[:-2],
+            valid[::-1],
+            raw(b"[]"),
+            raw(b"{}"),
+            raw(b"42"),
+            raw(b'["yesterday", 1]'),
+            raw(b'["2025-01-01T00:00:00+00:00", "1"]'),
+            raw(b'[null, 1]'),
+            raw(b'["2025-01-01T00:00:00+00:00", 1, 2]'),
+            raw(b'["2025-01-01T00:00:00+00:00", %d]' % 2**70),
+            raw(b'["9999-12-31T23:59:59-14:00", 1]'),
+            raw(b"\xff\xfe"),
+        ]
+        for token in bad:
+            with self.subTest(cursor=token):
+                self.assertEqual(self.get(cursor=token).status_code, 400)
+
+
+class BrowseFilterTests(TestCase):
+    URL = "/api/investors/browse/"
+
+    def setUp(self):
+        caches["catalogue"].clear()
+        founder = User.objects.create_user("founder", password="pw")
+        investor = User.objects.create_user("investor", password="pw")
+        for industry, stage, location, raised in [
+            ("Fintech", "Seed", "Berlin", 0),
+            ("Fintech", "Series A", "Berlin", 1000),
+            ("Edtech", "Seed", "Paris", 0),
+            ("Edtech", "Seed", "Berlin", 500),
+            ("Healthtech", "Series A", "Paris", 0),
+        ]:
+            Startup.objects.create(
+                founder=founder,
+                name=f"{industry} {stage}",
+                industry=industry,
+                stage=stage,
+                location=location,
+                funding_goal=Decimal("1000"),
+                amount_raised=raised,
+            )
+        self.client = APIClient()
+        self.client.force_authenticate(investor)
+
+    def facets(self, **params):
+        response = self.client.get(self.URL, params)
+        self.assertEqual(response.status_code, 200)
+        return {
+            name: {row["value"]: row["count"] for row in rows} if isinstance(rows, list) else rows
+            for name, rows in response.json()["facets"].items()
+        }
+
+    def test_each_facet_ignores_only_its_own_filter(self):
+        facets = self.facets(industry="Fintech", stage="Seed")
+        # stage=Seed applies, industry=Fintech doesn't
+        self.assertEqual(facets["industry"], {"Edtech": 2, "Fintech": 1})
+        # industry=Fintech applies, stage=Seed doesn't
+        self.assertEqual(facets["stage"], {"Seed": 1, "Series A": 1})
+        self.assertEqual(facets["location"], {"Berlin": 1})
+        self.assertEqual(facets["raising"], 1)
+
+    def test_raising_facet_ignores_the_raising_filter(self):
+        facets = self.facets(raising="true", location="Berlin")
+        self.assertEqual(facets["raising"], 2)
+        self.assertEqual(facets["industry"], {"Edtech": 1, "Fintech": 1})
+        self.assertEqual(facets["location"], {"Berlin": 2, "Paris": 2})
+
+    def test_facets_match_the_filtered_results(self):
+        params = {"industry": "Edtech", "all": "true"}
+        names = [row["name"] for row in self.client.get(self.URL, params).json()]
+        self.assertEqual(sorted(names), ["Edtech Seed", "Edtech Seed"])
+        self.assertEqual(self.facets(industry="Edtech")["industry"]["Edtech"], len(names))
+
+    def test_invalid_values_are_rejected(self):
+        for params in [
+            {"funding_goal_min": "lots"},
+            {"funding_goal_max": "NaN"},
+            {"equity_min": "Infinity"},
+            {"equity_max": "1,5"},
+            {"raising": "maybe"},
+        ]:
+            with self.subTest(**params):
+                response = self.client.get(self.URL, params)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn("error", response.json())
+
+
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        self.founder = User.objects.create_user("founder", password="pw")
+        self.investor = User.objects.create_user("investor", password="pw")
+        self.startup = Startup.objects.create(founder=self.founder, name="Etag", funding_goal=Decimal("1000"))
+        InvestmentRequest.objects.create(investor=self.investor, startup=self.startup, amount=Decimal("10"))
+        SavedStartup.objects.create(investor=self.investor, startup=self.startup)
+        self.endpoints = {
+            "/api/investors/founder/requests/": self.founder,
+            "/api/investors/saved/": self.investor,
+        }
+
+    def get(self, path, **headers):
+        client = APIClient()
+        client.force_authenticate(self.endpoints[path])
+        return client.get(path, headers=headers)
+
+    def etags(self):
+        return {path: self.get(path)["ETag"] for path in self.endpoints}
+
+    def test_matching_etag_gets_a_304_without_queries(self):
+        for path in self.endpoints:
+            with self.subTest(path=path):
+                etag = self.get(path)["ETag"]
+                with self.assertNumQueries(0):
+                    response = self.get(path, if_none_match=etag)
+                self.assertEqual(response.status_code, 304)
+                self.assertEqual(response.content, b"")
+                self.assertEqual(self.get(path, if_none_match='"stale"').status_code, 200)
+
+    def test_etag_changes_after_a_catalogue_write(self):
+        before = self.etags()
+        self.startup.name = "Renamed"
+        self.startup.save()
+        after = self.etags()
+        for path in self.endpoints:
+            with self.subTest(path=path):
+                self.assertNotEqual(before[path], after[path])
+                self.assertEqual(self.get(path, if_none_match=before[path]).status_code, 200)
+
+    def test_etag_changes_after_an_activity_write(self):
+        before = self.etags()
+        other = Startup.objects.create(founder=self.founder, name="Other", funding_goal=Decimal("1000"))
+        middle = self.etags()
+        SavedStartup.objects.create(investor=self.investor, startup=other)
+        after_save = self.etags()
+        InvestmentRequest.objects.create(investor=self.investor, startup=other, amount=Decimal("10"))
+        after_request = self.etags()
+        for path in self.endpoints:
+            with self.subTest(path=path):
+                self.assertEqual(len({before[path], middle[path], after_save[path], after_request[path]}), 4)
+
+    async def test_async_view_answers_a_matching_etag_with_304(self):
+        auth = "Bearer " + await sync_to_async(issue_token)(self.investor)
+        factory = AsyncRequestFactory()
+        response = await async_views.saved_startups(
+            factory.get("/api/investors/saved/", headers={"Authorization": auth})
+        )
+        self.assertEqual(response.status_code, 200)
+        request = factory.get(
+            "/api/investors/saved/", headers={"Authorization": auth, "If-None-Match": response["ETag"]}
+        )
+        self.assertEqual((await async_views.saved_startups(request)).status_code, 304)
+
+    def test_etag_differs_per_user(self):
+        path = "/api/investors/saved/"
+        etag = self.get(path)["ETag"]
+        self.endpoints[path] = self.founder
+        self.assertEqual(self.get(path, if_none_match=etag).status_code, 200)
+
+
+class ProfilingTests(TestCase):
+    def setUp(self):
+        reports = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, reports, ignore_errors=True)
+        settings_override = override_settings(PROFILING_DIR=reports, PROFILING_SAMPLE_RATE=1)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        founder = User.objects.create_user("founder", password="pw")
+        investor = User.objects.create_user("investor", password="pw")
+        startup = Startup.objects.create(founder=founder, name="Profiled", funding_goal=Decimal("1000"))
+        InvestmentRequest.objects.create(investor=investor, startup=startup, amount=Decimal("10"))
+        self.request = AsyncRequestFactory().get(
+            "/api/investors/founder/requests/", headers={"Authorization": "Bearer " + issue_token(founder)}
+        )
+
+    def middleware(self):
+        async def get_response(request):
+            raise AssertionError("process_view only")
+
+        return ProfilingMiddleware(get_response)
+
+    async def test_coroutine_view_is_profiled_through_its_sync_view(self):
+        middleware = self.middleware()
+        view = async_views.founder_investment_requests
+        response = await middleware.aprocess_view(self.request, view, (), {})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.content)[0]["startup"]["name"], "Profiled")
+
+        report = get_store().load(response["X-Profile-Id"])
+        self.assertIs(report["async_view"], True)
+        self.assertEqual(report["trigger"], "sampled")
+        self.assertGreater(report["sql_count"], 0)
+        self.assertIn("views.py", report["stats"])
+
+    async def test_coroutine_view_without_sync_view_is_skipped_and_logged(self):
+        middleware = self.middleware()
+
+        async def view(request):
+            raise AssertionError("not run by the middleware")
+
+        with self.assertLogs("backend.profiling", "WARNING") as logs:
+            self.assertIsNone(await middleware.aprocess_view(self.request, view, (), {}))
+        self.assertIn("/api/investors/founder/requests/", logs.output[0])
+        self.assertEqual(get_store().ids(), [])
+
+
+class FieldsetTests(TestCase):
+    URL = "/api/investors/my-investments/"
+
+    def setUp(self):
+        founder = User.objects.create_user("founder", password="pw")
+        self.investor = User.objects.create_user("investor", password="pw")
+        FounderProfile.objects.create(user=founder, full_name="Founder")
+        InvestorProfile.objects.create(user=self.investor, full_name="Investor")
+        startup = Startup.objects.create(founder=founder, name="Sparse", funding_goal=Decimal("1000"))
+        InvestmentRequest.objects.create(
+            investor=self.investor, startup=startup, amount=Decimal("10"), status="accepted"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.investor)
+
+    def test_fields_trim_top_level_and_nested(self):
+        data = self.client.get(self.URL, {"fields": "id,amount,startup.name"}).json()
+        self.assertEqual(set(data[0]), {"id", "amount", "startup"})
+        self.assertEqual(data[0]["startup"], {"name": "Sparse"})
+
+    def test_expand_collapses_other_relations_to_ids(self):
+        data = self.client.get(self.URL, {"expand": "startup"}).json()
+        self.assertEqual(data[0]["investor"], self.investor.pk)
+        self.assertEqual(data[0]["startup"]["name"], "Sparse")
+
+    def test_unknown_field_is_rejected(self):
+        response = self.client.get(self.URL, {"fields": "id,nope"})
+        self.assertEqual(response.status_code, 400)
+
+
+class ExportTests(TestCase):
+    URL = "/api/investors/my-investments/export/{}/"
+
+    # text a spreadsheet would otherwise evaluate
+    FORMULAS = ["=HYPERLINK(\"http://x\")", "+1+1", "-2+3", "@SUM(A1)"]
+
+    def setUp(self):
+        founder = User.objects.create_user("founder", password="pw")
+        self.investor = User.objects.create_user("investor", password="pw")
+        FounderProfile.objects.create(user=founder, full_name='Comma, "Quote"\nNewline')
+        InvestorProfile.objects.create(user=self.investor, full_name="Investor", location="@SUM(A1)")
+        # more rows than one chunk, so the body comes in several pieces
+        self.n = CHUNK_SIZE + 5
+        startups = Startup.objects.bulk_create(
+            Startup(founder=founder, name=self.FORMULAS[i % 4], funding_goal=Decimal("1000"))
+            for i in range(self.n)
+        )
+        InvestmentRequest.objects.bulk_create(
+            InvestmentRequest(investor=self.investor, startup=s, amount=Decimal("-1.5"), status="accepted")
+            for s in startups
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.investor)
+
+    def get(self, fmt, **extra):
+        response = self.client.get(self.URL.format(fmt), **extra)
+        self.assertEqual(response.status_code, 200)
+        self.assertIsInstance(response, StreamingHttpResponse)
+        self.assertFalse(response.has_header("Content-Length"))
+        return response
+
+    def test_ndjson_streams_one_row_per_line(self):
+        response = self.get("ndjson")
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        chunks = list(response.streaming_content)
+        self.assertGreater(len(chunks), 1)
+        rows = [json.loads(line) for line in b"".join(chunks).splitlines()]
+        self.assertEqual(len(rows), self.n)
+        self.assertEqual({row["startup"]["name"] for row in rows}, set(self.FORMULAS))
+        self.assertEqual(rows[0]["amount"], "-1.50")
+
+    def test_csv_cells_are_escaped(self):
+        response = self.get("csv")
+        self.assertIn('filename="my-investments.csv"', response["Content-Disposition"])
+        body = b"".join(response.streaming_content).decode()
+        rows = list(csv.DictReader(io.StringIO(body)))
+        self.assertEqual(len(rows), self.n)
+        row = rows[0]
+        self.assertEqual(row["startup.founder.full_name"], 'Comma, "Quote"\nNewline')
+        self.assertEqual(row["investor.location"], "'@SUM(A1)")
+        # numbers keep their sign
+        self.assertEqual(row["amount"], "-1.50")
+        self.assertEqual({r["startup.name"] for r in rows}, {"'" + name for name in self.FORMULAS})
+
+    def test_gzip_when_accepted(self):
+        for fmt in ("ndjson", "csv"):
+            with self.subTest(fmt):
+                response = self.get(fmt, HTTP_ACCEPT_ENCODING="gzip")
+                self.assertEqual(response["Content-Encoding"], "gzip")
+                plain = b"".join(self.get(fmt).streaming_content)
+                self.assertEqual(gzip.decompress(b"".join(response.streaming_content)), plain)
+
+    async def test_asgi_requests_stream_asynchronously(self):
+        request = AsyncRequestFactory().get(self.URL.format("ndjson"))
+        response = export_response(
+            request, InvestmentRequest.objects.order_by("pk"),
+            projection(InvestmentRequestSerializer, ("id",), None), "ndjson", "export",
+        )
+        self.assertTrue(response.is_async)
+        body = b"".join([chunk async for chunk in response.streaming_content])
+        self.assertEqual(len(body.splitlines()), self.n)
+
+
+class PortfolioAnalyticsTests(TestCase):
+    def setUp(self):
+        founder = User.objects.create_user("founder", password="pw")
+        self.investor = User.objects.create_user("investor", password="pw")
+        other = User.objects.create_user("other", password="pw")
+        fintech = Startup.objects.create(
+            founder=founder, name="Pay", industry="Fintech", stage="Seed", funding_goal=Decimal("9999999999.99")
+        )
+        health = Startup.objects.create(
+            founder=founder, name="Care", industry="Health", stage="Series A", funding_goal=Decimal("9999999999.99")
+        )
+        january = datetime(2026, 1, 15, tzinfo=dt_timezone.utc)
+        february = datetime(2026, 2, 15, tzinfo=dt_timezone.utc)
+        for investor, startup, amount, status, month in [
+            (self.investor, fintech, "100.10", "accepted", january),
+            (self.investor, fintech, "0.20", "pending", january),
+            (self.investor, fintech, "50", "rejected", february),
+            (self.investor, health, "9999999999.99", "accepted", february),
+            (self.investor, health, "0.05", "pending", february),
+            # someone else's request stays out of the totals
+            (other, fintech, "7", "accepted", january),
+        ]:
+            request = InvestmentRequest.objects.create(
+                investor=investor, startup=startup, amount=Decimal(amount), status=status
+            )
+            InvestmentRequest.objects.filter(pk=request.pk).update(created_at=month)
+
+    def test_four_queries(self):
+        with self.assertNumQueries(4):
+            portfolio_analytics(self.investor)
+
+    def test_totals_by_industry_stage_status_and_month(self):
+        data = portfolio_analytics(self.investor)
+        self.assertEqual(data["totals"], {
+            "requests": 5, "committed": "10000000100.34", "accepted": "10000000100.09", "pending": "0.25",
+            "accepted_count": 2, "pending_count": 2, "rejected_count": 1,
+        })
+        health = {"requests": 2, "committed": "10000000000.04", "accepted": "9999999999.99", "pending": "0.05"}
+        fintech = {"requests": 3, "committed": "100.30", "accepted": "100.10", "pending": "0.20"}
+        # largest commitment first
+        self.assertEqual(data["by_industry"], [{"industry": "Health", **health}, {"industry": "Fintech", **fintech}])
+        self.assertEqual(data["by_stage"], [{"stage": "Series A", **health}, {"stage": "Seed", **fintech}])
+        self.assertEqual(data["monthly"], [
+            {"month": "2026-01", "requests": 2, "committed": "100.30", "accepted": "100.10", "pending": "0.20"},
+            {"month": "2026-02", "requests": 3, "committed": "10000000000.04", "accepted": "9999999999.99",
+             "pending": "0.05"},
+        ])
+
+    def test_endpoint_serves_the_analytics(self):
+        client = APIClient()
+        client.force_authenticate(self.investor)
+        response = client.get("/api/investors/analytics/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), portfolio_analytics(self.investor))
+
+
+class SyntheticDataTests(TestCase):
+    def test_rows_keep_their_generated_timestamps_without_updates(self):
+        generator = Generator(seed=3, prefix="syn")
+        with CaptureQueriesContext(connection) as queries:
+            generator.run(founders=2, investors=3, startups=4, requests=20, saved=6)
+        self.assertFalse([q["sql"] for q in queries if q["sql"].startswith("UPDATE") and "created_at" in q["sql"]])
+
+        window = (generator.now - timedelta(days=730), generator.now)
+        for model in (Startup, InvestmentRequest, SavedStartup):
+            with self.subTest(model.__name__):
+                stamps = list(model.objects.values_list("created_at", flat=True))
+                self.assertTrue(stamps)
+                self.assertTrue(all(window[0] <= stamp <= window[1] for stamp in stamps))
+        for request in InvestmentRequest.objects.select_related("startup"):
+            self.assertGreaterEqual(request.created_at, request.startup.created_at)
+        for summary in StartupFundingSummary.objects.all():
+            latest = InvestmentRequest.objects.filter(startup_id=summary.startup_id).latest("created_at")
+            self.assertEqual(summary.last_activity_at, latest.created_at)
+
+        # ordinary saves are still stamped on insert
+        before = timezone.now()
+        startup = Startup.objects.create(name="Now", funding_goal=Decimal("1"))
+        self.assertGreaterEqual(startup.created_at, before)
+
+
+class TrendingTests(TestCase):
+    def setUp(self):
+        founder = User.objects.create_user("founder", password="pw")
+        self.investors = [User.objects.create_user(f"investor{i}", password="pw") for i in range(3)]
+        self.quiet, self.busy = [
+            Startup.objects.create(founder=founder, name=name, funding_goal=Decimal("1000"))
+            for name in ("Quiet", "Busy")
+        ]
+        self.client = APIClient()
+        self.client.force_authenticate(self.investors[0])
+
+    def names(self):
+        return [row["name"] for row in self.client.get("/api/investors/trending/").json()["results"]]
+
+    def test_feed_ranks_by_weighted_activity(self):
+        SavedStartup.objects.create(investor=self.investors[0], startup=self.quiet)
+        for investor in self.investors[:2]:
+            SavedStartup.objects.create(investor=investor, startup=self.busy)
+        self.assertEqual(self.names(), ["Busy", "Quiet"])
+        # a request outweighs a save
+        InvestmentRequest.objects.create(investor=self.investors[2], startup=self.quiet, amount=Decimal("10"))
+        self.assertEqual(self.names(), ["Quiet", "Busy"])
+
+    def test_compaction_keeps_the_ranking(self):
+        SavedStartup.objects.create(investor=self.investors[0], startup=self.quiet)
+        InvestmentRequest.objects.create(investor=self.investors[1], startup=self.busy, amount=Decimal("10"))
+        before = self.names()
+        compact()
+        self.assertEqual(self.names(), before)
+        rebuild()
+        self.assertEqual(self.names(), before)
+
+    def test_record_reads_the_epoch_in_one_query(self):
+        with CaptureQueriesContext(connection) as ctx:
+            record(self.busy.pk, 1.0)
+        epoch_reads = [q for q in ctx.captured_queries if "trendingepoch" in q["sql"].lower()]
+        self.assertEqual(len(epoch_reads), 1)
+        self.assertTrue(epoch_reads[0]["sql"].lstrip().upper().startswith("SELECT"))
+
+    def test_records_around_a_compaction_match_a_rebuild(self):
+        SavedStartup.objects.create(investor=self.investors[0], startup=self.quiet)
+        compact(timezone.now() + timedelta(seconds=1))
+        InvestmentRequest.objects.create(investor=self.investors[1], startup=self.busy, amount=Decimal("10"))
+        now = timezone.now()
+        compact(now)
+        recorded = dict(StartupTrend.objects.values_list("startup_id", "score"))
+        rebuild(now)
+        rebuilt = dict(StartupTrend.objects.values_list("startup_id", "score"))
+        self.assertEqual(recorded.keys(), rebuilt.keys())
+        for pk, score in rebuilt.items():
+            self.assertAlmostEqual(recorded[pk], score, places=6)
 
-# Create your tests here.
@@ -0,0 +1,117 @@
+"""
+Trending startups: time-decayed save and request counters.
+
+An event of weight w at time t adds w * 2 ** ((t - epoch) / HALF_LIFE) to
+its startup's StartupTrend.score. Every score decays at the same rate, so
+instead of decaying them all as time passes each new event counts for
+more: the stored scores rank the same as the decayed ones, and the feed is
+one ORDER BY score DESC LIMIT over startuptrend_score_idx. A decayed
+score, in events of weight 1 as of `now`, is
+score * 2 ** ((epoch - now) / HALF_LIFE).
+
+Stored scores grow with the time since the epoch. `compact()` (the
+compact_trending command, run daily) moves the epoch up to now, rescales
+every score to match and drops the ones that have decayed to nothing.
+"""
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from startups.models import Startup
+from .models import InvestmentRequest, SavedStartup, StartupTrend, TrendingEpoch
+
+
+HALF_LIFE = timedelta(days=3)
+
+# a request is a stronger signal than a bookmark
+WEIGHTS = {SavedStartup: 1.0, InvestmentRequest: 3.0}
+
+# decayed scores below this are dropped by compaction
+NEGLIGIBLE = 1e-3
+
+# floats overflow past 2 ** 1023; compact well before a write gets there
+MAX_EXPONENT = 512
+
+BATCH = 2000
+
+
+def _exponent(at, epoch):
+    return (at - epoch) / HALF_LIFE
+
+
+def _locked_epoch(default):
+    """
+    The epoch, its row locked until the transaction ends. record(), compact()
+    and rebuild() all read it this way first, so no score is written against
+    an epoch another transaction is moving. (SQLite's IMMEDIATE transactions
+    serialize them anyway; this covers databases with row locks.)
+    """
+    epochs = TrendingEpoch.objects.select_for_update().filter(pk=1)
+    epoch = epochs.values_list("epoch", flat=True).first()
+    if epoch is None:
+        # migration 0005 seeds the row; only a wiped table gets here
+        epoch = epochs.get_or_create(pk=1, defaults={"epoch": default})[0].epoch
+    return epoch
+
+
+def record(startup_id, weight, at=None):
+    """Add an event of `weight` at `at` (default now) to the startup's score."""
+    at = at or timezone.now()
+    with transaction.atomic():
+        exponent = _exponent(at, _locked_epoch(at))
+        if exponent > MAX_EXPONENT:
+            compact(at)
+            exponent = 0.0
+        boost = weight * 2 ** exponent
+        trends = StartupTrend.objects.filter(startup_id=startup_id)
+        if trends.update(score=F("score") + boost):
+            return
+        _, created = StartupTrend.objects.get_or_create(startup_id=startup_id, defaults={"score": boost})
+        if not created:
+            trends.update(score=F("score") + boost)
+
+
+def compact(now=None):
+    """
+    Move the epoch to `now`, rescaling every score to it, and drop the
+    negligible ones. Returns the number of scores kept.
+    """
+    now = now or timezone.now()
+    with transaction.atomic():
+        factor = 2 ** _exponent(_locked_epoch(now), now)
+        StartupTrend.objects.update(score=F("score") * factor)
+        StartupTrend.objects.filter(score__lt=NEGLIGIBLE).delete()
+        TrendingEpoch.objects.filter(pk=1).update(epoch=now)
+        return StartupTrend.objects.count()
+
+
+def rebuild(now=None):
+    """
+    Recompute every score from the full save and request history, with the
+    epoch at `now`. For repairs and bulk loads, which skip `record()`.
+    Returns the number of scores kept.
+    """
+    now = now or timezone.now()
+    with transaction.atomic():
+        _locked_epoch(now)
+        scores = defaultdict(float)
+        for model, weight in WEIGHTS.items():
+            events = model.objects.values_list("startup_id", "created_at").order_by()
+            for startup_id, created_at in events.iterator(chunk_size=BATCH):
+                scores[startup_id] += weight * 2 ** _exponent(created_at, now)
+
+        TrendingEpoch.objects.filter(pk=1).update(epoch=now)
+        StartupTrend.objects.all().delete()
+        StartupTrend.objects.bulk_create(
+            (StartupTrend(startup_id=pk, score=score) for pk, score in scores.items() if score >= NEGLIGIBLE),
+            batch_size=BATCH,
+        )
+        return StartupTrend.objects.count()
+
+
+def trending_startups():
+    """Startups by decayed activity, most active first; slice it for the feed."""
+    return Startup.objects.filter(trend__isnull=False).order_by("-trend__score", "-trend__startup_id")
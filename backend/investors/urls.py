@@ -1,11 +1,32 @@
+from django.conf import settings
 from django.urls import path
-from .views import BrowseStartups, InvestmentRequestListCreate, FounderInvestmentRequests, MyInvestments,SavedStartups
+from .views import BrowseStartups, SearchStartups, RecommendedStartups, InvestmentRequestListCreate, FounderInvestmentRequests, FounderBulkRequestUpdate, MyInvestments,SavedStartups, FounderInvestmentRequestsExport, MyInvestmentsExport, PortfolioAnalytics, FounderFundingSummary, TrendingStartups
+
+if settings.ASYNC_READ_VIEWS:
+    from . import async_views
+    browse_view = async_views.browse_startups
+    founder_requests_view = async_views.founder_investment_requests
+    my_investments_view = async_views.my_investments
+    saved_view = async_views.saved_startups
+else:
+    browse_view = BrowseStartups.as_view()
+    founder_requests_view = FounderInvestmentRequests.as_view()
+    my_investments_view = MyInvestments.as_view()
+    saved_view = SavedStartups.as_view()
 
 urlpatterns = [
-    path("browse/", BrowseStartups.as_view(), name="browse-startups"),
+    path("browse/", browse_view, name="browse-startups"),
+    path("trending/", TrendingStartups.as_view(), name="trending-startups"),
+    path("search/", SearchStartups.as_view(), name="search-startups"),
+    path("recommended/", RecommendedStartups.as_view(), name="recommended-startups"),
     path("requests/", InvestmentRequestListCreate.as_view(), name="investment-request-list-create"),
-    path("founder/requests/", FounderInvestmentRequests.as_view(), name="founder-investment-requests"),
+    path("founder/requests/", founder_requests_view, name="founder-investment-requests"),
+    path("founder/summary/", FounderFundingSummary.as_view(), name="founder-funding-summary"),
+    path("founder/requests/export/<str:fmt>/", FounderInvestmentRequestsExport.as_view(), name="founder-investment-requests-export"),
+    path("founder/requests/bulk/", FounderBulkRequestUpdate.as_view(), name="founder-investment-requests-bulk"),
     path("founder/requests/<int:pk>/", FounderInvestmentRequests.as_view(), name="founder-investment-request-update"),
-    path("my-investments/", MyInvestments.as_view(), name="my-investments"),  
-    path("saved/", SavedStartups.as_view(), name="saved-startups"), 
+    path("my-investments/", my_investments_view, name="my-investments"),  
+    path("my-investments/export/<str:fmt>/", MyInvestmentsExport.as_view(), name="my-investments-export"),
+    path("analytics/", PortfolioAnalytics.as_view(), name="portfolio-analytics"),
+    path("saved/", saved_view, name="saved-startups"), 
 ]
\ No newline at end of file
@@ -1,10 +1,37 @@
+from urllib.parse import urlencode
+
+from django.utils.decorators import method_decorator
+from django.views.decorators.gzip import gzip_page
+
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status, permissions
 from startups.models import Startup
 from startups.serializers import StartupSerializer
+from startups.cache import ACTIVITY, CATALOGUE, cached_json, conditional
+from startups.fieldsets import InvalidFieldset, parse_fieldsets
+from startups.projection import json_response, projection
+from startups.search import search_ids
 from .models import InvestmentRequest, SavedStartup
 from .serializers import InvestmentRequestSerializer, SavedStartupSerializer
+from .analytics import portfolio_analytics
+from .summary import founder_dashboard
+from .trending import trending_startups
+from .funding import FundingCapExceeded, apply_bulk_status, set_request_status
+from .matching import recommend_for
+from .filters import InvalidFilter, apply_filters, facet_counts, parse_filters
+from .exports import FORMATS as EXPORT_FORMATS, export_response
+from .pagination import KEYSET_FIELDS, InvalidCursor, get_page_size, paginate_keyset
+
+
+def startup_rows(rows, ids):
+    """Rows of the `rows` projection for startups `ids`, keyed by id."""
+    queryset = rows.queryset(Startup.objects.filter(id__in=ids), extra=("id",))
+    return {raw["id"]: rows.build(raw) for raw in queryset}
+
+
+def browse_cache_key(params):
+    return "browse:" + urlencode(sorted(params.lists()), doseq=True)
 
 
 # ✅ Browse startups
@@ -12,9 +39,84 @@ class BrowseStartups(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request):
-        startups = Startup.objects.all().order_by("-created_at")
-        serializer = StartupSerializer(startups, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        # the browse payload is the same for every investor
+        return cached_json(browse_cache_key(request.query_params), lambda: self.build(request))
+
+    def build(self, request):
+        try:
+            filters = parse_filters(request.query_params)
+            rows = projection(StartupSerializer, *parse_fieldsets(request.query_params))
+        except (InvalidFilter, InvalidFieldset) as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        startups = apply_filters(Startup.objects.all(), filters)
+
+        # ?all=true keeps the old unpaginated list response
+        if request.query_params.get("all") in ("1", "true"):
+            return json_response(rows.rows(startups.order_by("-created_at", "-id")))
+
+        try:
+            page, next_cursor = paginate_keyset(rows.queryset(startups, extra=KEYSET_FIELDS), request)
+        except InvalidCursor as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        data = {"results": [rows.build(raw) for raw in page], "next": next_cursor}
+
+        # facet counts don't change between pages, so only the first page carries them
+        if not request.query_params.get("cursor"):
+            data["facets"] = facet_counts(Startup.objects.all(), filters)
+        return json_response(data)
+
+
+# Startups by recent saves and requests, decayed over time
+class TrendingStartups(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    @conditional(CATALOGUE, ACTIVITY)
+    def get(self, request):
+        try:
+            rows = projection(StartupSerializer, *parse_fieldsets(request.query_params))
+        except InvalidFieldset as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        # one query: an index scan over the scores that stops at the page size
+        return json_response({"results": rows.rows(trending_startups()[:get_page_size(request)])})
+
+
+# Full-text search over startups, best match first
+class SearchStartups(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        query = request.query_params.get("q", "").strip()
+        if not query:
+            return Response({"error": "q parameter required"}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            rows = projection(StartupSerializer, *parse_fieldsets(request.query_params))
+        except InvalidFieldset as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        ids = search_ids(query, get_page_size(request))
+        by_id = startup_rows(rows, ids)
+        return json_response({"results": [by_id[pk] for pk in ids if pk in by_id]})
+
+
+# "Recommended for you": startups scored against the investor's preferences
+class RecommendedStartups(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        try:
+            rows = projection(StartupSerializer, *parse_fieldsets(request.query_params))
+        except InvalidFieldset as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        ids, scores = recommend_for(request.user, get_page_size(request))
+        by_id = startup_rows(rows, ids)
+        data = []
+        for pk, score in zip(ids, scores):
+            if pk in by_id:
+                data.append({**by_id[pk], "match_score": round(score, 4)})
+        return json_response({"results": data})
 
 
 # Investor's own requests (list + create)
@@ -22,11 +124,12 @@ class InvestmentRequestListCreate(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request):
-        requests = InvestmentRequest.objects.filter(
-            investor=request.user
-        ).order_by("-created_at")
-        serializer = InvestmentRequestSerializer(requests, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        requests = InvestmentRequest.objects.filter(investor=request.user).order_by("-created_at")
+        try:
+            rows = projection(InvestmentRequestSerializer, *parse_fieldsets(request.query_params))
+        except InvalidFieldset as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return json_response(rows.rows(requests))
 
     def post(self, request):
         serializer = InvestmentRequestSerializer(data=request.data)
@@ -40,13 +143,14 @@ class InvestmentRequestListCreate(APIView):
 class FounderInvestmentRequests(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
+    @conditional(CATALOGUE, ACTIVITY)
     def get(self, request):
-        startups = Startup.objects.filter(founder=request.user)
-        requests = InvestmentRequest.objects.filter(
-            startup__in=startups
-        ).order_by("-created_at")
-        serializer = InvestmentRequestSerializer(requests, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        requests = InvestmentRequest.objects.filter(startup__founder=request.user).order_by("-created_at")
+        try:
+            rows = projection(InvestmentRequestSerializer, *parse_fieldsets(request.query_params))
+        except InvalidFieldset as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return json_response(rows.rows(requests))
 
     def patch(self, request, pk):
         try:
@@ -58,48 +162,136 @@ class FounderInvestmentRequests(APIView):
         if status_choice not in ["accepted", "rejected"]:
             return Response({"error": "Invalid status"}, status=status.HTTP_400_BAD_REQUEST)
 
-        if req.status != "accepted" and status_choice == "accepted":
-            startup = req.startup
-            available = startup.funding_goal - startup.amount_raised
-
-            if req.amount > available:
-                return Response(
-                    {"error": f"Cannot accept. Only {available} left to raise."},
-                    status=status.HTTP_400_BAD_REQUEST,
-                )
-
-            # Update raised amount
-            startup.amount_raised += req.amount
-            startup.save()
+        try:
+            set_request_status(req, status_choice)
+        except FundingCapExceeded as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
-        req.status = status_choice
-        req.save()
         return Response(
             {"message": f"Request {status_choice} successfully."},
             status=status.HTTP_200_OK,
         )
 
 
+# Founder: stream incoming requests as NDJSON or CSV
+@method_decorator(gzip_page, name="dispatch")
+class FounderInvestmentRequestsExport(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, fmt):
+        if fmt not in EXPORT_FORMATS:
+            return Response({"error": "Unsupported export format"}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            rows = projection(InvestmentRequestSerializer, *parse_fieldsets(request.query_params))
+        except InvalidFieldset as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        requests = InvestmentRequest.objects.filter(startup__founder=request.user).order_by("-created_at", "-id")
+        return export_response(request, requests, rows, fmt, "investment-requests")
+
+
+# Founder: per-startup request counts and amounts, read from the funding summaries
+class FounderFundingSummary(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    @conditional(CATALOGUE, ACTIVITY)
+    def get(self, request):
+        return json_response(founder_dashboard(request.user))
+
+
+# Founder: accept/reject many requests at once
+class FounderBulkRequestUpdate(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    MAX_ITEMS = 500
+
+    def post(self, request):
+        items = request.data.get("updates")
+        if not isinstance(items, list) or not items:
+            return Response({"error": "updates must be a non-empty list"}, status=status.HTTP_400_BAD_REQUEST)
+        if len(items) > self.MAX_ITEMS:
+            return Response(
+                {"error": f"At most {self.MAX_ITEMS} updates per call"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        updates, seen = [], set()
+        for item in items:
+            if (
+                not isinstance(item, dict)
+                or type(item.get("id")) is not int
+                or item.get("status") not in ["accepted", "rejected"]
+            ):
+                return Response(
+                    {"error": "Each update needs an integer id and a status of accepted or rejected"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            if item["id"] in seen:
+                return Response(
+                    {"error": f"Request {item['id']} listed more than once"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            seen.add(item["id"])
+            updates.append({"id": item["id"], "status": item["status"]})
+
+        results = apply_bulk_status(request.user, updates)
+        return Response({"results": results}, status=status.HTTP_200_OK)
+
+
 # ✅ Investor: see their accepted investments ("My Investments")
 class MyInvestments(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
+    @conditional(CATALOGUE, ACTIVITY)
     def get(self, request):
         accepted = InvestmentRequest.objects.filter(
             investor=request.user, status="accepted"
         ).order_by("-created_at")
-        serializer = InvestmentRequestSerializer(accepted, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        try:
+            rows = projection(InvestmentRequestSerializer, *parse_fieldsets(request.query_params))
+        except InvalidFieldset as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return json_response(rows.rows(accepted))
+
+
+# Investor: stream "My Investments" as NDJSON or CSV
+@method_decorator(gzip_page, name="dispatch")
+class MyInvestmentsExport(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, fmt):
+        if fmt not in EXPORT_FORMATS:
+            return Response({"error": "Unsupported export format"}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            rows = projection(InvestmentRequestSerializer, *parse_fieldsets(request.query_params))
+        except InvalidFieldset as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        accepted = InvestmentRequest.objects.filter(
+            investor=request.user, status="accepted"
+        ).order_by("-created_at", "-id")
+        return export_response(request, accepted, rows, fmt, "my-investments")
+
+
+# Investor: portfolio totals, industry/stage breakdowns and monthly series
+class PortfolioAnalytics(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    @conditional(CATALOGUE, ACTIVITY)
+    def get(self, request):
+        return Response(portfolio_analytics(request.user), status=status.HTTP_200_OK)
 
 
 # ✅ Investor: Save + List saved startups
 class SavedStartups(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
+    @conditional(CATALOGUE, ACTIVITY)
     def get(self, request):
         saved = SavedStartup.objects.filter(investor=request.user).order_by("-created_at")
-        serializer = SavedStartupSerializer(saved, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        try:
+            rows = projection(SavedStartupSerializer, *parse_fieldsets(request.query_params))
+        except InvalidFieldset as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return json_response(rows.rows(saved))
 
     def post(self, request):
         startup_id = request.data.get("startup")
@@ -0,0 +1,22 @@
+from accounts.async_api import async_read_view, json_response
+from startups.cache import ACTIVITY, CATALOGUE, async_conditional
+from .models import FounderProfile, InvestorProfile
+from .serializers import FounderProfileSerializer, InvestorProfileSerializer
+from .views import FounderProfileView, InvestorProfileView
+
+# Async GET handlers for the profile "me" endpoints under ASGI; PUT still
+# goes through the DRF views.
+
+
+@async_read_view(FounderProfileView.as_view())
+@async_conditional(CATALOGUE)
+async def founder_profile(request, user):
+    profile, created = await FounderProfile.objects.aget_or_create(user=user)
+    return json_response(FounderProfileSerializer(profile).data)
+
+
+@async_read_view(InvestorProfileView.as_view())
+@async_conditional(ACTIVITY)
+async def investor_profile(request, user):
+    profile, created = await InvestorProfile.objects.aget_or_create(user=user)
+    return json_response(InvestorProfileSerializer(profile).data)
@@ -0,0 +1,137 @@
+# Generated by Django 5.2.5 on 2026-10-17 21:47
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+# frozen copies of the startups.tags helpers as of this migration
+def canonical(name):
+    return ' '.join(name.split())
+
+
+def tag_key(name):
+    return canonical(name).casefold()
+
+
+def split_tags(value):
+    names, seen = [], set()
+    for name in (value or '').split(','):
+        name = canonical(name)
+        if name and name.casefold() not in seen:
+            seen.add(name.casefold())
+            names.append(name)
+    return names
+
+
+def join_tags(names):
+    return ', '.join(names)
+
+
+# profile, its text field, tag model, through model and its two columns
+TAGGED = [
+    ('FounderProfile', 'skills', ('profiles', 'Skill'), 'FounderSkill', 'founder_id', 'skill_id'),
+    ('InvestorProfile', 'industries_of_interest', ('startups', 'Industry'),
+     'InvestorInterest', 'investor_id', 'industry_id'),
+]
+
+
+def _names(value):
+    # key -> name; a name longer than the tag column is cut down to it
+    names = {}
+    for name in split_tags(value):
+        names.setdefault(tag_key(name[:255]), name[:255])
+    return names
+
+
+def tag_profiles(apps, schema_editor):
+    # parse the comma-separated text into tags and through rows, and rewrite
+    # the text to the tags' names; a new key is named by its earliest spelling
+    for model_name, text, tag_model, through_name, source, target in TAGGED:
+        Profile = apps.get_model('profiles', model_name)
+        Tag = apps.get_model(*tag_model)
+        Through = apps.get_model('profiles', through_name)
+
+        rows = [(pk, value, _names(value)) for pk, value in Profile.objects.order_by('pk').values_list('pk', text)]
+        tags = {tag.key: tag for tag in Tag.objects.all()}
+        missing = {}
+        for _, _, names in rows:
+            for key, name in names.items():
+                if key not in tags:
+                    missing.setdefault(key, name)
+        Tag.objects.bulk_create([Tag(key=key, name=name) for key, name in missing.items()], batch_size=2000)
+        tags = {tag.key: tag for tag in Tag.objects.all()}
+
+        changed, links = [], []
+        for pk, value, names in rows:
+            row_tags = [tags[key] for key in names]
+            canonical_text = join_tags(tag.name for tag in row_tags)
+            if canonical_text != value:
+                changed.append(Profile(pk=pk, **{text: canonical_text}))
+            links.extend(Through(**{source: pk, target: tag.pk}) for tag in row_tags)
+        Profile.objects.bulk_update(changed, [text], batch_size=2000)
+        Through.objects.bulk_create(links, batch_size=2000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profiles', '0002_founderprofile_company_founderprofile_email_and_more'),
+        ('startups', '0018_industry_tags'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Skill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255)),
+                ('key', models.CharField(max_length=255, unique=True)),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='InvestorInterest',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('industry', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='startups.industry')),
+                ('investor', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='profiles.investorprofile')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='investorprofile',
+            name='interest_tags',
+            field=models.ManyToManyField(blank=True, editable=False, related_name='investors', through='profiles.InvestorInterest', to='startups.industry'),
+        ),
+        migrations.CreateModel(
+            name='FounderSkill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('founder', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='profiles.founderprofile')),
+                ('skill', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='profiles.skill')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='founderprofile',
+            name='skill_tags',
+            field=models.ManyToManyField(blank=True, editable=False, related_name='founders', through='profiles.FounderSkill', to='profiles.skill'),
+        ),
+        migrations.AddIndex(
+            model_name='investorinterest',
+            index=models.Index(fields=['industry', 'investor'], name='investorinterest_industry_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='investorinterest',
+            constraint=models.UniqueConstraint(fields=('investor', 'industry'), name='investorinterest_unique'),
+        ),
+        migrations.AddIndex(
+            model_name='founderskill',
+            index=models.Index(fields=['skill', 'founder'], name='founderskill_skill_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='founderskill',
+            constraint=models.UniqueConstraint(fields=('founder', 'skill'), name='founderskill_unique'),
+        ),
+        migrations.RunPython(tag_profiles, migrations.RunPython.noop),
+    ]
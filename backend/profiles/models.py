@@ -1,7 +1,67 @@
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth.models import User
+from startups.models import Industry, Tag
 
-class FounderProfile(models.Model):
+
+class Skill(Tag):
+    pass
+
+
+class TaggedQuerySet(models.QuerySet):
+    def bulk_create(self, objs, *args, **kwargs):
+        # bulk inserts skip save(); tag the new rows here instead
+        objs = list(objs)
+        with transaction.atomic(using=self.db):
+            tags = self.model.tag_all(objs)
+            objs = super().bulk_create(objs, *args, **kwargs)
+            self.model.link_tags(objs, tags)
+        return objs
+
+
+class TaggedProfile(models.Model):
+    """
+    A profile whose comma-separated `tag_text` field is kept in step with
+    its `tag_relation` many-to-many: the text is rewritten to the tags'
+    canonical names on every save and bulk insert.
+    """
+
+    tag_text = None
+    tag_relation = None
+
+    objects = TaggedQuerySet.as_manager()
+
+    class Meta:
+        abstract = True
+
+    @classmethod
+    def tag_all(cls, objs):
+        tag_model = cls._meta.get_field(cls.tag_relation).related_model
+        return tag_model.tag_all(objs, cls.tag_text)
+
+    @classmethod
+    def link_tags(cls, objs, tags):
+        relation = cls._meta.get_field(cls.tag_relation)
+        through = relation.remote_field.through
+        source = through._meta.get_field(relation.m2m_field_name()).attname
+        target = through._meta.get_field(relation.m2m_reverse_field_name()).attname
+        through.objects.bulk_create(
+            through(**{source: obj.pk, target: tag.pk})
+            for obj, row_tags in zip(objs, tags) for tag in row_tags
+        )
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and self.tag_text not in update_fields:
+            return super().save(*args, **kwargs)
+        adding = self._state.adding
+        with transaction.atomic():
+            (tags,) = self.tag_all([self])
+            super().save(*args, **kwargs)
+            if tags or not adding:
+                getattr(self, self.tag_relation).set(tags)
+
+
+class FounderProfile(TaggedProfile):
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name="founder_profile")
 
     # Basic Info
@@ -15,17 +75,22 @@ class FounderProfile(models.Model):
     bio = models.TextField(blank=True)
     experience = models.TextField(blank=True)
     skills = models.TextField(blank=True, help_text="Comma-separated skills")
+    skill_tags = models.ManyToManyField(
+        Skill, through="FounderSkill", related_name="founders", blank=True, editable=False
+    )
 
     # Links
     linkedin = models.URLField(blank=True)
     twitter = models.URLField(blank=True)
     website = models.URLField(blank=True)
 
+    tag_text, tag_relation = "skills", "skill_tags"
+
     def __str__(self):
         return f"FounderProfile: {self.user.username}"
 
 
-class InvestorProfile(models.Model):
+class InvestorProfile(TaggedProfile):
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name="investor_profile")
 
     # Basic Info
@@ -44,6 +109,40 @@ class InvestorProfile(models.Model):
     investment_range_min = models.DecimalField(max_digits=12, decimal_places=2, null=True, blank=True)
     investment_range_max = models.DecimalField(max_digits=12, decimal_places=2, null=True, blank=True)
     industries_of_interest = models.CharField(max_length=255, blank=True)
+    interest_tags = models.ManyToManyField(
+        Industry, through="InvestorInterest", related_name="investors", blank=True, editable=False
+    )
+
+    tag_text, tag_relation = "industries_of_interest", "interest_tags"
 
     def __str__(self):
         return f"InvestorProfile: {self.user.username}"
+
+
+# each key leads one of the two composite indexes, so neither gets its own
+class FounderSkill(models.Model):
+    founder = models.ForeignKey(FounderProfile, on_delete=models.CASCADE, db_index=False)
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, db_index=False)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["founder", "skill"], name="founderskill_unique"),
+        ]
+        indexes = [
+            # founders with a skill, without touching the profile table
+            models.Index(fields=["skill", "founder"], name="founderskill_skill_idx"),
+        ]
+
+
+class InvestorInterest(models.Model):
+    investor = models.ForeignKey(InvestorProfile, on_delete=models.CASCADE, db_index=False)
+    industry = models.ForeignKey(Industry, on_delete=models.CASCADE, db_index=False)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["investor", "industry"], name="investorinterest_unique"),
+        ]
+        indexes = [
+            # investors following an industry, without touching the profile table
+            models.Index(fields=["industry", "investor"], name="investorinterest_industry_idx"),
+        ]
@@ -1,16 +1,23 @@
 from rest_framework import serializers
+from startups.fieldsets import SparseFieldsMixin
+from startups.tags import TagListField
 from .models import FounderProfile, InvestorProfile
 
 
-class FounderProfileSerializer(serializers.ModelSerializer):
+class FounderProfileSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    skills = TagListField(required=False)
+
     class Meta:
         model = FounderProfile
-        fields = "__all__"
+        # skills carries the same names as skill_tags
+        exclude = ["skill_tags"]
         read_only_fields = ["user"]
 
 
-class InvestorProfileSerializer(serializers.ModelSerializer):
+class InvestorProfileSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    industries_of_interest = TagListField(required=False, max_length=255)
+
     class Meta:
         model = InvestorProfile
-        fields = "__all__"
+        exclude = ["interest_tags"]
         read_only_fields = ["user"]
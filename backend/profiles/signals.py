@@ -0,0 +1,23 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from startups.cache import invalidate_activity, invalidate_catalogue
+from .models import FounderProfile, InvestorProfile
+
+
+# founder profiles are nested in every startup payload
+@receiver(post_save, sender=FounderProfile)
+@receiver(post_delete, sender=FounderProfile)
+def founder_profile_changed(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    invalidate_catalogue()
+
+
+# investor profiles are nested in investment request payloads
+@receiver(post_save, sender=InvestorProfile)
+@receiver(post_delete, sender=InvestorProfile)
+def investor_profile_changed(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    invalidate_activity()
@@ -1,8 +1,16 @@
+from django.conf import settings
 from django.urls import path
 from .views import FounderProfileView, InvestorProfileView
 
+if settings.ASYNC_READ_VIEWS:
+    from .async_views import founder_profile as founder_profile_view
+    from .async_views import investor_profile as investor_profile_view
+else:
+    founder_profile_view = FounderProfileView.as_view()
+    investor_profile_view = InvestorProfileView.as_view()
+
 urlpatterns = [
-    path("founder-profiles/me/", FounderProfileView.as_view(), name="founder-profile"),
-    path("investor-profiles/me/", InvestorProfileView.as_view(), name="investor-profile"),
+    path("founder-profiles/me/", founder_profile_view, name="founder-profile"),
+    path("investor-profiles/me/", investor_profile_view, name="investor-profile"),
 ]
 
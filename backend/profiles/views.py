@@ -4,10 +4,12 @@ from rest_framework import status, permissions
 from django.shortcuts import get_object_or_404
 from .models import FounderProfile, InvestorProfile
 from .serializers import FounderProfileSerializer, InvestorProfileSerializer
+from startups.cache import ACTIVITY, CATALOGUE, conditional
 
 class FounderProfileView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
+    @conditional(CATALOGUE)
     def get(self, request):
         profile, created = FounderProfile.objects.get_or_create(user=request.user)
         serializer = FounderProfileSerializer(profile)
@@ -24,6 +26,7 @@ class FounderProfileView(APIView):
 class InvestorProfileView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
+    @conditional(ACTIVITY)
     def get(self, request):
         profile, created = InvestorProfile.objects.get_or_create(user=request.user)
         serializer = InvestorProfileSerializer(profile)
@@ -1,5 +1,6 @@
 from django.contrib import admin
-from .models import Startup
+from .models import DeckJob, Startup
 # Register your models here.
 
-admin.site.register(Startup)
\ No newline at end of file
+admin.site.register(Startup)
+admin.site.register(DeckJob)
\ No newline at end of file
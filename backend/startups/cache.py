@@ -0,0 +1,227 @@
+import hashlib
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.filebased import FileBasedCache
+from django.db import connection, transaction
+from django.http import HttpResponse
+from django.test.utils import override_settings
+from django.views.decorators.http import condition
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+
+CACHE_ALIAS = "catalogue"
+# shared by every worker; payloads may stay process-local, counters can't
+VERSION_CACHE_ALIAS = "versions"
+
+# version counters
+CATALOGUE = "catalogue"
+ACTIVITY = "activity"
+
+
+class LRUFileBasedCache(FileBasedCache):
+    """
+    FileBasedCache that evicts least recently used entries instead of a
+    random sample. Reads bump the file's mtime, culling drops the oldest.
+    """
+
+    def get(self, key, default=None, version=None):
+        value = super().get(key, default, version)
+        if value is not default:
+            try:
+                os.utime(self._key_to_file(key, version))
+            except FileNotFoundError:
+                pass
+        return value
+
+    def _cull(self):
+        filelist = self._list_cache_files()
+        num_entries = len(filelist)
+        if num_entries < self._max_entries:
+            return
+        if self._cull_frequency == 0:
+            return self.clear()
+
+        def mtime(fname):
+            try:
+                return os.path.getmtime(fname)
+            except FileNotFoundError:
+                return 0
+
+        filelist.sort(key=mtime)
+        for fname in filelist[: int(num_entries / self._cull_frequency)]:
+            self._delete(fname)
+
+
+def get_cache():
+    return caches[CACHE_ALIAS]
+
+
+def get_version_cache():
+    return caches[VERSION_CACHE_ALIAS]
+
+
+@contextmanager
+def isolated_version_cache():
+    """
+    Keep the version counters in a throwaway directory for the duration of a
+    test or bench run, so it neither reads nor bumps the dev server's.
+    """
+    with tempfile.TemporaryDirectory(prefix="findfund-versions-") as location:
+        versions = {**settings.CACHES[VERSION_CACHE_ALIAS], "LOCATION": location}
+        with override_settings(CACHES={**settings.CACHES, VERSION_CACHE_ALIAS: versions}):
+            yield
+
+
+def current_version(name):
+    cache = get_version_cache()
+    key = f"{name}:version"
+    version = cache.get(key)
+    if version is None:
+        # seed from the clock so an evicted counter never reuses an old version
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def last_modified(*names):
+    stamps = list(get_version_cache().get_many([f"{n}:modified" for n in names]).values())
+    return datetime.fromtimestamp(max(stamps), tz=timezone.utc) if stamps else None
+
+
+def _bump(name):
+    # incr is get + set on some backends, so two racing bumps may land as
+    # one; either still moves the version past everything cached before it
+    cache = get_version_cache()
+    try:
+        cache.incr(f"{name}:version")
+    except ValueError:
+        cache.set(f"{name}:version", time.time_ns(), timeout=None)
+    cache.set(f"{name}:modified", time.time(), timeout=None)
+
+
+def invalidate(name):
+    """
+    Bump the `name` version so everything cached or validated against it goes
+    stale. Bumped again on commit, so a reader that cached pre-commit rows in
+    between doesn't keep serving them.
+    """
+    _bump(name)
+    if connection.in_atomic_block:
+        transaction.on_commit(lambda: _bump(name))
+
+
+def catalogue_version():
+    return current_version(CATALOGUE)
+
+
+def invalidate_catalogue():
+    """Startups or founder profiles changed."""
+    invalidate(CATALOGUE)
+
+
+def invalidate_activity():
+    """Investment requests, saved startups or investor profiles changed."""
+    invalidate(ACTIVITY)
+
+
+def _etag(names, request):
+    versions = ":".join(str(current_version(n)) for n in names)
+    raw = f"{request.get_full_path()}|{request.user.pk}|{versions}"
+    return hashlib.md5(raw.encode()).hexdigest()
+
+
+def _validators(names, request):
+    return _etag(names, request), last_modified(*names)
+
+
+def _condition(names):
+    def etag_func(request, *args, **kwargs):
+        return _etag(names, request)
+
+    def last_modified_func(request, *args, **kwargs):
+        return last_modified(*names)
+
+    return condition(etag_func=etag_func, last_modified_func=last_modified_func)
+
+
+def conditional(*names):
+    """
+    ETag / Last-Modified for an APIView GET, derived from the named version
+    counters plus the path and user, so a client with current data gets a
+    304 before the view queries or serializes anything.
+    """
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, request, *args, **kwargs):
+            view = _condition(names)(
+                lambda request, *args, **kwargs: method(self, request, *args, **kwargs)
+            )
+            return view(request, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def async_conditional(*names):
+    """
+    `conditional` for async_read_view handlers. The counters are file reads,
+    so both validators are computed in one hop off the event loop.
+    """
+    def decorator(handler):
+        @wraps(handler)
+        async def wrapper(request, *args, **kwargs):
+            etag, modified = await sync_to_async(_validators, thread_sensitive=False)(names, request)
+            view = condition(
+                etag_func=lambda *args, **kwargs: etag,
+                last_modified_func=lambda *args, **kwargs: modified,
+            )(handler)
+            return await view(request, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def cached_json(key, build):
+    """
+    Serve the rendered JSON for `key` at the current catalogue version,
+    calling `build()` for a DRF Response or a rendered HttpResponse on a
+    miss. Only 200s are cached.
+    """
+    cache = get_cache()
+    versioned_key = f"catalogue:{catalogue_version()}:{key}"
+    content = cache.get(versioned_key)
+    if content is None:
+        response = build()
+        if response.status_code != 200:
+            return response
+        content = JSONRenderer().render(response.data) if isinstance(response, Response) else response.content
+        cache.set(versioned_key, content)
+    return HttpResponse(content, content_type="application/json")
+
+
+async def acached_json(key, build):
+    """
+    `cached_json` for async views; `build()` is awaited for an HttpResponse.
+    The version read and the lookup may hit files, so they run off the event loop.
+    """
+    cache = get_cache()
+
+    def lookup():
+        versioned_key = f"catalogue:{catalogue_version()}:{key}"
+        return versioned_key, cache.get(versioned_key)
+
+    versioned_key, content = await sync_to_async(lookup, thread_sensitive=False)()
+    if content is None:
+        response = await build()
+        if response.status_code != 200:
+            return response
+        content = response.content
+        await sync_to_async(cache.set, thread_sensitive=False)(versioned_key, content)
+    return HttpResponse(content, content_type="application/json")
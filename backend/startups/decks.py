@@ -0,0 +1,49 @@
+import shutil
+import subprocess
+import tempfile
+from pathlib import Path
+
+
+# cap on stored text per deck
+MAX_TEXT_CHARS = 200_000
+
+PREVIEW_WIDTH = 480
+
+
+def render_preview(path):
+    """First page as PNG bytes via poppler's pdftoppm, or None if unavailable."""
+    pdftoppm = shutil.which("pdftoppm")
+    if not pdftoppm:
+        return None
+    with tempfile.TemporaryDirectory() as tmp:
+        out = Path(tmp) / "preview"
+        subprocess.run(
+            [pdftoppm, "-png", "-f", "1", "-l", "1", "-scale-to", str(PREVIEW_WIDTH),
+             "-singlefile", str(path), str(out)],
+            check=True,
+            capture_output=True,
+            timeout=60,
+        )
+        return out.with_suffix(".png").read_bytes()
+
+
+def extract_deck(path):
+    """
+    Page count, text and first-page preview for the PDF at `path`. Runs in a
+    worker process, so it only touches the file system, never the database.
+    """
+    from pypdf import PdfReader
+
+    reader = PdfReader(path)
+    parts, length = [], 0
+    for page in reader.pages:
+        text = page.extract_text() or ""
+        parts.append(text)
+        length += len(text)
+        if length >= MAX_TEXT_CHARS:
+            break
+    return {
+        "pages": len(reader.pages),
+        "text": "\n".join(parts)[:MAX_TEXT_CHARS],
+        "preview": render_preview(path),
+    }
@@ -0,0 +1,163 @@
+import mimetypes
+import os
+import re
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import content_disposition_header, http_date, parse_http_date_safe, quote_etag
+from rest_framework.exceptions import NotAcceptable
+from rest_framework.negotiation import DefaultContentNegotiation
+
+
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+# ContentAddressedStorage names: <dir>/<h[:2]>/<sha256><ext>
+_DIGEST_RE = re.compile(r"(?:^|/)([0-9a-f]{2})/(\1[0-9a-f]{62})(?:\.[^./]*)?$")
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+class FileContentNegotiation(DefaultContentNegotiation):
+    """
+    For views that answer with a file rather than a rendered body: an Accept
+    header naming the file's type (application/pdf, say) must not be a 406.
+    Errors still render with the view's renderers, as JSON when nothing the
+    client accepts matches.
+    """
+
+    def select_renderer(self, request, renderers, format_suffix=None):
+        try:
+            return super().select_renderer(request, renderers, format_suffix)
+        except NotAcceptable:
+            return renderers[0], renderers[0].media_type
+
+
+def parse_range(header, size):
+    """
+    Parse a single-range `Range` header into an inclusive (start, end).
+    Returns None to serve the whole file (no header, multiple ranges or a
+    malformed one) and raises RangeNotSatisfiable past the end of the file.
+    """
+    match = _RANGE_RE.match((header or "").strip())
+    if not match:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # suffix range: the last N bytes
+        length = int(last)
+        if length == 0:
+            raise RangeNotSatisfiable
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or end < start:
+        raise RangeNotSatisfiable
+    return start, end
+
+
+class RangeFile:
+    """
+    Read-only view of bytes [start, end] of an open file. Exposes fileno()
+    so servers with a sendfile-capable wsgi.file_wrapper can still use it,
+    bounded by Content-Length.
+    """
+
+    def __init__(self, file, start, end):
+        self.file = file
+        self.remaining = end - start + 1
+        self.name = file.name
+        file.seek(start)
+
+    def read(self, size=-1):
+        if self.remaining <= 0:
+            return b""
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def fileno(self):
+        return self.file.fileno()
+
+    def close(self):
+        self.file.close()
+
+
+def _if_range_matches(request, etag, mtime):
+    value = request.META.get("HTTP_IF_RANGE")
+    if not value:
+        return True
+    if value.startswith('"') or value.startswith("W/"):
+        # If-Range takes the strong comparison only
+        return not etag.startswith("W/") and value == etag
+    date = parse_http_date_safe(value)
+    return date is not None and int(mtime) <= date
+
+
+def file_etag(name, stat):
+    """
+    A strong ETag when `name` is a content-addressed digest, so the name
+    alone pins the bytes; otherwise a weak one from mtime and size.
+    """
+    match = _DIGEST_RE.search(name)
+    if match:
+        return quote_etag(match.group(2))
+    return f'W/"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+
+
+def serve_file(request, storage, name, filename=None):
+    """
+    Serve `name` from `storage` honouring conditional and Range headers.
+    With PITCH_DECK_SENDFILE set the body is left to the front-end server
+    via X-Sendfile or X-Accel-Redirect.
+    """
+    path = storage.path(name)
+    stat = os.stat(path)
+    etag = file_etag(name, stat)
+    content_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+    filename = filename or os.path.basename(name)
+
+    not_modified = get_conditional_response(
+        request, etag=etag, last_modified=int(stat.st_mtime)
+    )
+    if not_modified is not None:
+        return not_modified
+
+    mode = getattr(settings, "PITCH_DECK_SENDFILE", None)
+    if mode:
+        response = HttpResponse(content_type=content_type)
+        if mode == "x-accel-redirect":
+            response["X-Accel-Redirect"] = settings.PITCH_DECK_ACCEL_PREFIX + name
+        else:
+            response["X-Sendfile"] = path
+    else:
+        byte_range = None
+        if _if_range_matches(request, etag, stat.st_mtime):
+            try:
+                byte_range = parse_range(request.META.get("HTTP_RANGE"), stat.st_size)
+            except RangeNotSatisfiable:
+                response = HttpResponse(status=416)
+                response["Content-Range"] = f"bytes */{stat.st_size}"
+                return response
+
+        file = open(path, "rb")
+        if byte_range:
+            start, end = byte_range
+            response = FileResponse(RangeFile(file, start, end), content_type=content_type, status=206)
+            response["Content-Range"] = f"bytes {start}-{end}/{stat.st_size}"
+            response["Content-Length"] = str(end - start + 1)
+        else:
+            response = FileResponse(file, content_type=content_type)
+            response["Content-Length"] = str(stat.st_size)
+
+    response["Accept-Ranges"] = "bytes"
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(stat.st_mtime)
+    response["Content-Disposition"] = content_disposition_header(False, filename)
+    response["Cache-Control"] = "private, max-age=0, must-revalidate"
+    return response
@@ -0,0 +1,149 @@
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from datetime import timedelta
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .cache import invalidate_catalogue
+from .decks import extract_deck
+from .models import DeckJob, Startup
+from .storage import release_deck_preview
+
+
+logger = logging.getLogger(__name__)
+
+# seconds before retry n is 2**n times this
+RETRY_BACKOFF = 30
+
+
+def claim_jobs(limit):
+    """Atomically move up to `limit` due jobs from pending to running."""
+    now = timezone.now()
+    with transaction.atomic():
+        jobs = list(
+            DeckJob.objects.select_for_update(skip_locked=True)
+            .filter(status="pending", run_after__lte=now)
+            .order_by("run_after", "id")[:limit]
+        )
+        DeckJob.objects.filter(pk__in=[j.pk for j in jobs]).update(
+            status="running", attempts=F("attempts") + 1, updated_at=now
+        )
+    for job in jobs:
+        job.status = "running"
+        job.attempts += 1
+    return jobs
+
+
+def requeue_stale(older_than):
+    """
+    Return jobs stuck in running (e.g. a killed worker) to the queue, or fail
+    the ones that have used up their attempts. Returns the number requeued.
+    """
+    now = timezone.now()
+    stale = DeckJob.objects.filter(status="running", updated_at__lt=now - older_than)
+    for job in stale.filter(attempts__gte=F("max_attempts")):
+        fail_job(job, "Worker stopped before finishing the job")
+    return stale.update(status="pending", updated_at=now)
+
+
+def complete_job(job, result):
+    preview_name = None
+    if result["preview"]:
+        stem = os.path.splitext(os.path.basename(job.deck_name))[0]
+        preview_name = f"pitch_deck_previews/{stem}.png"
+        if not default_storage.exists(preview_name):
+            preview_name = default_storage.save(preview_name, ContentFile(result["preview"]))
+
+    with transaction.atomic():
+        # the founder may have replaced the deck since this job was queued
+        updated = Startup.objects.filter(pk=job.startup_id, pitch_deck=job.deck_name).update(
+            deck_status="ready",
+            deck_pages=result["pages"],
+            deck_text=result["text"],
+            deck_preview=preview_name,
+        )
+        DeckJob.objects.filter(pk=job.pk).update(status="done", last_error="", updated_at=timezone.now())
+        invalidate_catalogue()
+        if not updated:
+            transaction.on_commit(lambda: release_deck_preview(preview_name))
+
+
+def fail_job(job, error):
+    now = timezone.now()
+    with transaction.atomic():
+        if job.attempts < job.max_attempts:
+            DeckJob.objects.filter(pk=job.pk).update(
+                status="pending",
+                run_after=now + timedelta(seconds=RETRY_BACKOFF * 2 ** job.attempts),
+                last_error=error,
+                updated_at=now,
+            )
+            return
+        DeckJob.objects.filter(pk=job.pk).update(status="failed", last_error=error, updated_at=now)
+        Startup.objects.filter(pk=job.startup_id, pitch_deck=job.deck_name).update(deck_status="failed")
+        invalidate_catalogue()
+
+
+def run_batch(executor, batch_size):
+    """
+    Claim one batch, process it on the pool and record the outcomes. If a
+    pool process died, every job it took down is failed (and so retried
+    later) before BrokenProcessPool is re-raised for the caller to replace
+    the pool.
+    """
+    jobs = claim_jobs(batch_size)
+    if not jobs:
+        return 0
+
+    storage = Startup._meta.get_field("pitch_deck").storage
+    futures = {}
+    broken = None
+    for job in jobs:
+        if not storage.exists(job.deck_name):
+            fail_job(job, f"{job.deck_name} is missing from storage")
+            continue
+        try:
+            futures[executor.submit(extract_deck, storage.path(job.deck_name))] = job
+        except BrokenProcessPool as e:
+            broken = e
+            fail_job(job, f"{type(e).__name__}: {e}")
+
+    for future in as_completed(futures):
+        job = futures[future]
+        try:
+            complete_job(job, future.result())
+        except Exception as e:
+            if isinstance(e, BrokenProcessPool):
+                broken = e
+            logger.warning("Deck job %s failed: %s", job.pk, e)
+            fail_job(job, f"{type(e).__name__}: {e}")
+    if broken is not None:
+        raise broken
+    return len(jobs)
+
+
+def run_worker(workers, once=False, poll_interval=2.0, stale_after=600):
+    executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        while True:
+            requeue_stale(timedelta(seconds=stale_after))
+            try:
+                processed = run_batch(executor, workers * 2)
+            except BrokenProcessPool:
+                logger.warning("Deck worker pool broke; starting a new one")
+                executor.shutdown(wait=False, cancel_futures=True)
+                executor = ProcessPoolExecutor(max_workers=workers)
+                continue
+            if once and not processed:
+                return
+            if not processed:
+                time.sleep(poll_interval)
+    finally:
+        executor.shutdown()
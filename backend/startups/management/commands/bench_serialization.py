@@ -0,0 +1,88 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test.utils import (
+    setup_databases, setup_test_environment, teardown_databases, teardown_test_environment,
+)
+from rest_framework.renderers import JSONRenderer
+
+from investors.models import InvestmentRequest
+from investors.serializers import InvestmentRequestSerializer
+from investors.synthetic import Generator
+from startups.cache import isolated_version_cache
+from startups.models import Startup
+from startups.projection import projection, render
+from startups.serializers import StartupSerializer
+
+
+CASES = [
+    # name, serializer, queryset the DRF path would use
+    ("startups", StartupSerializer,
+     lambda: Startup.objects.select_related("founder__founder_profile").order_by("-created_at", "-id")),
+    ("investment requests", InvestmentRequestSerializer,
+     lambda: InvestmentRequest.objects.select_related(
+         "startup__founder__founder_profile", "investor__investor_profile",
+     ).order_by("-created_at", "-id")),
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare DRF serializers + JSONRenderer with the projection read path "
+        "(.values() rows + orjson) on synthetic data in a throwaway database. "
+        "Fails if the two bodies differ by a single byte."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=10_000)
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        rows = options["rows"]
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            with isolated_version_cache():
+                Generator(seed=options["seed"], prefix="benchser").run(
+                    founders=max(1, rows // 10), investors=max(1, rows // 10),
+                    startups=rows, requests=rows, saved=0,
+                )
+                for name, serializer_class, queryset in CASES:
+                    self.bench(name, serializer_class, queryset, rows, options["repeat"])
+        finally:
+            connections.close_all()
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+
+    def bench(self, name, serializer_class, queryset, rows, repeat):
+        def drf():
+            return JSONRenderer().render(serializer_class(queryset()[:rows], many=True).data)
+
+        def fast():
+            return render(projection(serializer_class).rows(queryset()[:rows]))
+
+        expected, actual = drf(), fast()
+        if expected != actual:
+            at = next(i for i, (a, b) in enumerate(zip(expected, actual)) if a != b) if len(expected) == len(actual) \
+                else min(len(expected), len(actual))
+            raise CommandError(
+                f"{name}: projection output differs from DRF at byte {at}:\n"
+                f"  drf:  {expected[max(0, at - 80):at + 80]!r}\n"
+                f"  fast: {actual[max(0, at - 80):at + 80]!r}"
+            )
+
+        drf_ms, fast_ms = self.time(drf, repeat), self.time(fast, repeat)
+        self.stdout.write(
+            f"{name + ':':<21} {rows} rows, {len(expected):,} bytes | "
+            f"drf {drf_ms:.1f} ms | projection {fast_ms:.1f} ms | {drf_ms / fast_ms:.1f}x"
+        )
+
+    def time(self, func, repeat):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            timings.append((time.perf_counter() - start) * 1000)
+        return sorted(timings)[len(timings) // 2]
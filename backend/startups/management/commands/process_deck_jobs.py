@@ -0,0 +1,26 @@
+import os
+
+from django.core.management.base import BaseCommand
+
+from startups.jobs import run_worker
+
+
+class Command(BaseCommand):
+    help = "Process queued pitch decks (page count, text, preview) on a process pool."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+        parser.add_argument("--once", action="store_true", help="Exit once the queue is empty.")
+        parser.add_argument("--poll-interval", type=float, default=2.0)
+        parser.add_argument(
+            "--stale-after", type=int, default=600,
+            help="Requeue jobs left running longer than this many seconds.",
+        )
+
+    def handle(self, *args, **options):
+        run_worker(
+            workers=options["workers"],
+            once=options["once"],
+            poll_interval=options["poll_interval"],
+            stale_after=options["stale_after"],
+        )
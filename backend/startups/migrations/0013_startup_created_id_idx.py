@@ -0,0 +1,19 @@
+# Generated by Django 5.2.5 on 2026-10-17 20:56
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('startups', '0012_remove_startup_raised_amount_startup_amount_raised'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='startup',
+            index=models.Index(fields=['-created_at', '-id'], name='startup_created_id_idx'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+from django.db import migrations
+
+
+def create_fts_table(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    schema_editor.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS startups_startup_fts "
+        "USING fts5(name, industry, description, location, tokenize='unicode61')"
+    )
+    schema_editor.execute(
+        "INSERT INTO startups_startup_fts (rowid, name, industry, description, location) "
+        "SELECT id, name, industry, description, location FROM startups_startup"
+    )
+
+
+def drop_fts_table(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    schema_editor.execute("DROP TABLE IF EXISTS startups_startup_fts")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('startups', '0013_startup_created_id_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fts_table, drop_fts_table),
+    ]
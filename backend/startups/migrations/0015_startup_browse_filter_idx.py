@@ -0,0 +1,31 @@
+# Generated by Django 5.2.5 on 2026-10-17 20:58
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('startups', '0014_startup_fts'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='startup',
+            index=models.Index(fields=['industry'], name='startup_industry_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='startup',
+            index=models.Index(fields=['stage'], name='startup_stage_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='startup',
+            index=models.Index(fields=['location'], name='startup_location_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='startup',
+            index=models.Index(fields=['funding_goal'], name='startup_funding_goal_idx'),
+        ),
+    ]
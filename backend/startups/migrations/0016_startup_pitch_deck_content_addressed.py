@@ -0,0 +1,19 @@
+# Generated by Django 5.2.5 on 2026-10-17 21:05
+
+import startups.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('startups', '0015_startup_browse_filter_idx'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='startup',
+            name='pitch_deck',
+            field=models.FileField(blank=True, db_index=True, null=True, storage=startups.storage.pitch_deck_storage, upload_to='pitch_decks/'),
+        ),
+    ]
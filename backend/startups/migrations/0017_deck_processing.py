@@ -0,0 +1,65 @@
+# Generated by Django 5.2.5 on 2026-10-17 21:07
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def queue_existing_decks(apps, schema_editor):
+    Startup = apps.get_model("startups", "Startup")
+    DeckJob = apps.get_model("startups", "DeckJob")
+    with_deck = Startup.objects.exclude(pitch_deck="").exclude(pitch_deck__isnull=True)
+    DeckJob.objects.bulk_create(
+        DeckJob(startup_id=pk, deck_name=name)
+        for pk, name in with_deck.values_list("id", "pitch_deck").iterator()
+    )
+    with_deck.update(deck_status="pending")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('startups', '0016_startup_pitch_deck_content_addressed'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='startup',
+            name='deck_pages',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='startup',
+            name='deck_preview',
+            field=models.FileField(blank=True, null=True, upload_to='pitch_deck_previews/'),
+        ),
+        migrations.AddField(
+            model_name='startup',
+            name='deck_status',
+            field=models.CharField(blank=True, choices=[('', 'No deck'), ('pending', 'Pending'), ('ready', 'Ready'), ('failed', 'Failed')], default='', max_length=10),
+        ),
+        migrations.AddField(
+            model_name='startup',
+            name='deck_text',
+            field=models.TextField(blank=True),
+        ),
+        migrations.CreateModel(
+            name='DeckJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('deck_name', models.CharField(max_length=255)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], default='pending', max_length=10)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('max_attempts', models.PositiveIntegerField(default=3)),
+                ('run_after', models.DateTimeField(default=django.utils.timezone.now)),
+                ('last_error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('startup', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='deck_jobs', to='startups.startup')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['status', 'run_after'], name='deckjob_status_run_after_idx')],
+            },
+        ),
+        migrations.RunPython(queue_existing_decks, migrations.RunPython.noop),
+    ]
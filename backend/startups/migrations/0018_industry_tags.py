@@ -0,0 +1,69 @@
+# Generated by Django 5.2.5 on 2026-10-17 21:47
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Min
+
+
+# frozen copies of startups.tags.canonical / tag_key as of this migration
+def canonical(name):
+    return ' '.join(name.split())
+
+
+def tag_key(name):
+    return canonical(name).casefold()
+
+
+def tag_industries(apps, schema_editor):
+    # one tag per distinct industry key, named by its earliest spelling;
+    # then one UPDATE per distinct spelling points the startups at it
+    Startup = apps.get_model('startups', 'Startup')
+    Industry = apps.get_model('startups', 'Industry')
+    spellings = [
+        raw for raw, _ in Startup.objects.values_list('industry').annotate(first=Min('pk')).order_by('first')
+    ]
+    wanted = {}
+    for raw in spellings:
+        name = canonical(raw)[:255]
+        if name:
+            wanted.setdefault(tag_key(name), name)
+    Industry.objects.bulk_create([Industry(key=key, name=name) for key, name in wanted.items()])
+    tags = {tag.key: tag for tag in Industry.objects.all()}
+    for raw in spellings:
+        tag = tags.get(tag_key(canonical(raw)[:255]))
+        Startup.objects.filter(industry=raw).update(industry=tag.name if tag else '', industry_tag=tag)
+
+    # the search index (0014) keeps its own copy of industry; no signals
+    # ran above, so bring the rows whose spelling changed up to date
+    if schema_editor.connection.vendor == 'sqlite':
+        current = "(SELECT COALESCE(industry, '') FROM startups_startup WHERE id = startups_startup_fts.rowid)"
+        schema_editor.execute(
+            f"UPDATE startups_startup_fts SET industry = {current} WHERE industry IS NOT {current}"
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('startups', '0017_deck_processing'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Industry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255)),
+                ('key', models.CharField(max_length=255, unique=True)),
+            ],
+            options={
+                'verbose_name_plural': 'industries',
+            },
+        ),
+        migrations.AddField(
+            model_name='startup',
+            name='industry_tag',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='startups', to='startups.industry'),
+        ),
+        migrations.RunPython(tag_industries, migrations.RunPython.noop),
+    ]
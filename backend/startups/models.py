@@ -1,12 +1,80 @@
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth.models import User
+from django.utils import timezone
+from .storage import pitch_deck_storage
+from .tags import TAG_MAX_LENGTH, canonical, join_tags, split_tags, tag_key
+
+
+class Tag(models.Model):
+    """A canonical name; spellings that share a `key` are the same tag."""
+
+    name = models.CharField(max_length=TAG_MAX_LENGTH)
+    key = models.CharField(max_length=TAG_MAX_LENGTH, unique=True)
+
+    class Meta:
+        abstract = True
+
+    def __str__(self):
+        return self.name
+
+    @classmethod
+    def resolve(cls, names):
+        """{key: tag} for `names`, creating the tags that don't exist yet."""
+        wanted = {}
+        for name in names:
+            name = canonical(name)
+            if name:
+                wanted.setdefault(tag_key(name), name)
+        if not wanted:
+            return {}
+        tags = {tag.key: tag for tag in cls.objects.filter(key__in=wanted)}
+        missing = [cls(key=key, name=name) for key, name in wanted.items() if key not in tags]
+        if missing:
+            # another writer may add the same key first; keep whichever won
+            cls.objects.bulk_create(missing, ignore_conflicts=True)
+            tags = {tag.key: tag for tag in cls.objects.filter(key__in=wanted)}
+        return tags
+
+    @classmethod
+    def tag_all(cls, objs, field, many=True):
+        """
+        The tags of `field` on each of `objs`, rewriting the field to their
+        canonical names: comma-separated when `many`, else a single name.
+        """
+        names = [split_tags(getattr(obj, field) if many else [getattr(obj, field)]) for obj in objs]
+        tags = cls.resolve(name for row in names for name in row)
+        result = []
+        for obj, row in zip(objs, names):
+            row_tags = [tags[tag_key(name)] for name in row]
+            setattr(obj, field, join_tags(tag.name for tag in row_tags))
+            result.append(row_tags)
+        return result
+
+
+class Industry(Tag):
+    class Meta:
+        verbose_name_plural = "industries"
+
+
+class StartupQuerySet(models.QuerySet):
+    def bulk_create(self, objs, *args, **kwargs):
+        # bulk inserts skip save(); tag their industries here instead
+        objs = list(objs)
+        with transaction.atomic(using=self.db):
+            Startup.tag_industries(objs)
+            return super().bulk_create(objs, *args, **kwargs)
+
 
 class Startup(models.Model):
     founder = models.ForeignKey(
         User, on_delete=models.CASCADE, related_name="startups", null=True, blank=True
     )
     name = models.CharField(max_length=255)
+    # canonical name of industry_tag, which filters and matching join on
     industry = models.CharField(max_length=255, blank=True)
+    industry_tag = models.ForeignKey(
+        Industry, on_delete=models.PROTECT, related_name="startups", null=True, blank=True, editable=False
+    )
     stage = models.CharField(max_length=50, blank=True)
     funding_goal = models.DecimalField(max_digits=12, decimal_places=2)
     equity = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True)
@@ -16,17 +84,85 @@ class Startup(models.Model):
     website = models.URLField(blank=True)
     team_size = models.PositiveIntegerField(null=True, blank=True)
     location = models.CharField(max_length=255, blank=True)
-    pitch_deck = models.FileField(upload_to="pitch_decks/", blank=True, null=True)
+    pitch_deck = models.FileField(
+        upload_to="pitch_decks/", storage=pitch_deck_storage, blank=True, null=True, db_index=True
+    )
     created_at = models.DateTimeField(auto_now_add=True)
 
     amount_raised = models.DecimalField(max_digits=12, decimal_places=2, default=0)
 
+    # derived from the pitch deck by the process_deck_jobs worker
+    DECK_STATUS_CHOICES = [
+        ("", "No deck"),
+        ("pending", "Pending"),
+        ("ready", "Ready"),
+        ("failed", "Failed"),
+    ]
+    deck_status = models.CharField(max_length=10, choices=DECK_STATUS_CHOICES, blank=True, default="")
+    deck_pages = models.PositiveIntegerField(null=True, blank=True)
+    deck_text = models.TextField(blank=True)
+    deck_preview = models.FileField(upload_to="pitch_deck_previews/", blank=True, null=True)
+
+    objects = StartupQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # keyset pagination for investors/browse
+            models.Index(fields=["-created_at", "-id"], name="startup_created_id_idx"),
+            # browse filters / facet counts
+            models.Index(fields=["industry"], name="startup_industry_idx"),
+            models.Index(fields=["stage"], name="startup_stage_idx"),
+            models.Index(fields=["location"], name="startup_location_idx"),
+            models.Index(fields=["funding_goal"], name="startup_funding_goal_idx"),
+        ]
+
     def save(self, *args, **kwargs):
         if self.funding_goal and self.equity and self.equity > 0:
             self.valuation = (self.funding_goal / (self.equity / 100))
         else:
             self.valuation = None
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None:
+            Startup.tag_industries([self])
+        elif "industry" in update_fields:
+            Startup.tag_industries([self])
+            kwargs["update_fields"] = {*update_fields, "industry_tag"}
         super().save(*args, **kwargs)
 
+    @staticmethod
+    def tag_industries(startups):
+        """Point each startup at the tag of its industry, canonicalizing the name."""
+        for startup, tags in zip(startups, Industry.tag_all(startups, "industry", many=False)):
+            startup.industry_tag = tags[0] if tags else None
+
+    def __str__(self):
+        return self.name
+
+
+class DeckJob(models.Model):
+    """A queued pitch deck processing run, claimed by process_deck_jobs."""
+
+    STATUS_CHOICES = [
+        ("pending", "Pending"),
+        ("running", "Running"),
+        ("done", "Done"),
+        ("failed", "Failed"),
+    ]
+    startup = models.ForeignKey(Startup, on_delete=models.CASCADE, related_name="deck_jobs")
+    # the deck this job was queued for; skipped if the startup has moved on
+    deck_name = models.CharField(max_length=255)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="pending")
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=3)
+    run_after = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "run_after"], name="deckjob_status_run_after_idx"),
+        ]
+
     def __str__(self):
-        return self.name
\ No newline at end of file
+        return f"DeckJob {self.pk} for {self.startup_id} ({self.status})"
@@ -0,0 +1,177 @@
+"""
+Fast read path for list endpoints.
+
+`projection(SerializerClass)` compiles a read-only ModelSerializer
+(including nested serializers) into one `.values()` query plus a flat
+row builder, skipping model instances and DRF's per-field machinery.
+`render()` encodes with orjson. Rows and bytes match what the serializer
+and DRF's JSONRenderer produce for the same queryset.
+"""
+import decimal
+from functools import lru_cache
+
+import orjson
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils import timezone
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
+
+from .tags import TagListField, split_tags
+
+
+class UnsupportedField(TypeError):
+    pass
+
+
+# DRF fields whose representation is the database value as is
+RAW_FIELDS = (
+    serializers.CharField,        # also Email/URL/Slug/Regex
+    serializers.IntegerField,
+    serializers.BooleanField,
+    serializers.ChoiceField,
+    serializers.PrimaryKeyRelatedField,
+)
+
+
+def _decimal(field):
+    coerce_to_string = getattr(field, "coerce_to_string", api_settings.COERCE_DECIMAL_TO_STRING)
+    if not coerce_to_string or field.localize or field.normalize_output or field.decimal_places is None:
+        return field.to_representation
+    # the same quantize as DecimalField.quantize, set up once
+    exponent = decimal.Decimal(".1") ** field.decimal_places
+    context = decimal.getcontext().copy()
+    if field.max_digits is not None:
+        context.prec = field.max_digits
+    rounding = field.rounding
+
+    def convert(value):
+        return f"{value.quantize(exponent, rounding=rounding, context=context):f}"
+    return convert
+
+
+def _datetime(field):
+    output_format = getattr(field, "format", api_settings.DATETIME_FORMAT)
+    if not settings.USE_TZ or hasattr(field, "timezone") or str(output_format).lower() != ISO_8601:
+        return field.to_representation
+
+    def convert(value):
+        # DRF: to the current timezone, ISO 8601, "Z" for UTC
+        text = value.astimezone(timezone.get_current_timezone()).isoformat()
+        if text.endswith("+00:00"):
+            text = text[:-6] + "Z"
+        return text
+    return convert
+
+
+def _file(field, model_field):
+    storage = model_field.storage
+
+    def convert(value):
+        # no request in the serializer context, so URLs stay relative
+        return storage.url(value) if value else None
+    return convert
+
+
+def _converter(field, model, name):
+    if isinstance(field, serializers.DecimalField):
+        return _decimal(field)
+    if isinstance(field, serializers.DateTimeField):
+        return _datetime(field)
+    if isinstance(field, serializers.FileField):
+        return _file(field, model._meta.get_field(name))
+    if isinstance(field, TagListField):
+        return split_tags
+    if isinstance(field, RAW_FIELDS):
+        return None
+    raise UnsupportedField(f"{type(field).__name__} {name!r} has no fast path")
+
+
+class Projection:
+    """Values paths and row builder compiled from a serializer class."""
+
+    def __init__(self, serializer_class, fields=None, expand=None):
+        self.paths = []
+        # dotted output keys of the leaf values, e.g. "startup.founder.full_name"
+        self.columns = []
+        kwargs = {}
+        if fields is not None or expand is not None:
+            kwargs = {"fields": fields, "expand": expand}
+        self._build = self._compile(serializer_class(**kwargs), "", "")
+
+    def _compile(self, serializer, prefix, column_prefix):
+        model = serializer.Meta.model
+        steps = []
+        for key, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            path = prefix + field.source.replace(".", "__")
+            # DRF leaves the key out when a forward hop of a dotted source is
+            # None (e.g. a startup without a founder), unless it allows null
+            hops = field.source.split(".")[:-1]
+            guard = None
+            if hops and not field.allow_null:
+                guard = prefix + "__".join(hops)
+                self.paths.append(guard)
+            if isinstance(field, serializers.BaseSerializer):
+                if getattr(field, "many", False):
+                    raise UnsupportedField(f"{key!r}: nested lists have no fast path")
+                # a missing related row reads as NULL in every column, pk included
+                pk_path = f"{path}__{field.Meta.model._meta.pk.name}"
+                self.paths.append(pk_path)
+                build = self._compile(field, path + "__", f"{column_prefix}{key}.")
+                steps.append((key, pk_path, build, True, guard))
+                continue
+            self.paths.append(path)
+            self.columns.append(column_prefix + key)
+            steps.append((key, path, _converter(field, model, field.source), False, guard))
+
+        def build(raw):
+            row = {}
+            for key, path, convert, nested, guard in steps:
+                if guard is not None and raw[guard] is None:
+                    continue
+                if nested:
+                    row[key] = None if raw[path] is None else convert(raw)
+                    continue
+                value = raw[path]
+                row[key] = value if value is None or convert is None else convert(value)
+            return row
+        return build
+
+    def build(self, raw):
+        """The serializer's representation of one .values() row."""
+        return self._build(raw)
+
+    def queryset(self, queryset, extra=()):
+        """`queryset` as .values() rows; `extra` adds columns the caller reads itself."""
+        return queryset.values(*dict.fromkeys([*self.paths, *extra]))
+
+    def rows(self, queryset):
+        return [self.build(raw) for raw in self.queryset(queryset)]
+
+    async def arows(self, queryset):
+        return [self.build(raw) async for raw in self.queryset(queryset)]
+
+
+# bounded: ?fields= / ?expand= combinations come from clients
+@lru_cache(maxsize=512)
+def projection(serializer_class, fields=None, expand=None):
+    """
+    Cached Projection of `serializer_class`, trimmed by sparse fieldset
+    tuples from `startups.fieldsets.parse_fieldsets`. Raises InvalidFieldset.
+    """
+    return Projection(serializer_class, fields, expand)
+
+
+def render(data):
+    """orjson bytes matching DRF's compact, unicode JSONRenderer output."""
+    content = orjson.dumps(data)
+    # DRF escapes the two line terminators that are valid JSON but not JavaScript
+    if b"\xe2\x80" in content:
+        content = content.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+    return content
+
+
+def json_response(data, status=200):
+    return HttpResponse(render(data), content_type="application/json", status=status)
@@ -0,0 +1,92 @@
+import re
+
+from django.db import connection
+from django.db.models import Q
+
+from .models import Startup
+
+
+FTS_TABLE = "startups_startup_fts"
+FTS_COLUMNS = ("name", "industry", "description", "location")
+
+# bm25 column weights, same order as FTS_COLUMNS
+FTS_WEIGHTS = (10.0, 5.0, 1.0, 2.0)
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def fts_enabled():
+    return connection.vendor == "sqlite"
+
+
+def build_match_query(text):
+    # quote every term so user input can't inject FTS5 syntax; prefix-match each
+    tokens = _TOKEN_RE.findall(text or "")
+    return " ".join(f'"{t}"*' for t in tokens)
+
+
+def index_startup(startup):
+    if not fts_enabled():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [startup.pk])
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE} (rowid, {', '.join(FTS_COLUMNS)}) "
+            f"VALUES (%s, %s, %s, %s, %s)",
+            [startup.pk] + [getattr(startup, c) or "" for c in FTS_COLUMNS],
+        )
+
+
+def unindex_startup(pk):
+    if not fts_enabled():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [pk])
+
+
+def rebuild_index():
+    """Repopulate the whole index from the startup table in one statement."""
+    if not fts_enabled():
+        return 0
+    cols = ", ".join(FTS_COLUMNS)
+    values = ", ".join(f"COALESCE({c}, '')" for c in FTS_COLUMNS)
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE}")
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE} (rowid, {cols}) "
+            f"SELECT id, {values} FROM {Startup._meta.db_table}"
+        )
+        cursor.execute(f"SELECT count(*) FROM {FTS_TABLE}")
+        return cursor.fetchone()[0]
+
+
+def search_ids(text, limit):
+    """Return startup ids matching `text`, best match first."""
+    match = build_match_query(text)
+    if not match:
+        return []
+
+    if not fts_enabled():
+        # no FTS5 outside SQLite: plain substring match, newest first
+        q = Q()
+        for token in _TOKEN_RE.findall(text):
+            q &= (
+                Q(name__icontains=token)
+                | Q(industry__icontains=token)
+                | Q(description__icontains=token)
+                | Q(location__icontains=token)
+            )
+        return list(
+            Startup.objects.filter(q)
+            .order_by("-created_at", "-id")
+            .values_list("id", flat=True)[:limit]
+        )
+
+    weights = ", ".join(str(w) for w in FTS_WEIGHTS)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s "
+            f"ORDER BY bm25({FTS_TABLE}, {weights}) LIMIT %s",
+            [match, limit],
+        )
+        return [row[0] for row in cursor.fetchall()]
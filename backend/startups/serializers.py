@@ -1,11 +1,24 @@
+from django.conf import settings
 from rest_framework import serializers
+from .fieldsets import SparseFieldsMixin
 from .models import Startup
 from profiles.serializers import FounderProfileSerializer
 
-class StartupSerializer(serializers.ModelSerializer):
+class StartupSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     founder = FounderProfileSerializer(source="founder.founder_profile", read_only=True)
 
     class Meta:
         model = Startup
-        fields = "__all__"
-        read_only_fields = ["founder", "valuation", "created_at", "raised_amount"]
\ No newline at end of file
+        # deck_text can be long; the payload carries page count and preview instead.
+        # industry is the name of industry_tag, which the model keeps in step
+        exclude = ["deck_text", "industry_tag"]
+        read_only_fields = [
+            "founder", "valuation", "created_at", "raised_amount",
+            "deck_status", "deck_pages", "deck_preview",
+        ]
+
+    def validate_pitch_deck(self, value):
+        if value and value.size > settings.PITCH_DECK_MAX_SIZE:
+            limit_mb = settings.PITCH_DECK_MAX_SIZE / (1024 * 1024)
+            raise serializers.ValidationError(f"File exceeds the {limit_mb:g} MB limit.")
+        return value
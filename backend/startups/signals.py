@@ -0,0 +1,63 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .models import DeckJob, Startup
+from .cache import invalidate_catalogue
+from .storage import release_deck_preview, release_pitch_deck
+from . import search
+
+
+@receiver(pre_save, sender=Startup)
+def remember_pitch_deck(sender, instance, raw=False, **kwargs):
+    instance._previous_pitch_deck = instance._previous_deck_preview = None
+    instance._deck_uploaded = False
+    if raw:
+        return
+
+    # a fresh upload hasn't been written to storage yet
+    if instance.pitch_deck and not instance.pitch_deck._committed:
+        instance._deck_uploaded = True
+        instance.deck_status = "pending"
+    elif not instance.pitch_deck:
+        instance.deck_status = ""
+    if instance._deck_uploaded or not instance.pitch_deck:
+        # whatever was extracted from the old deck no longer applies
+        instance.deck_pages = None
+        instance.deck_text = ""
+        instance.deck_preview = None
+
+    if instance.pk is None:
+        return
+    instance._previous_pitch_deck, instance._previous_deck_preview = (
+        Startup.objects.filter(pk=instance.pk).values_list("pitch_deck", "deck_preview").first()
+        or (None, None)
+    )
+
+
+@receiver(post_save, sender=Startup)
+def startup_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    previous = getattr(instance, "_previous_pitch_deck", None)
+    if previous and previous != instance.pitch_deck.name:
+        transaction.on_commit(lambda: release_pitch_deck(previous))
+    previous_preview = getattr(instance, "_previous_deck_preview", None)
+    if previous_preview and previous_preview != instance.deck_preview.name:
+        transaction.on_commit(lambda: release_deck_preview(previous_preview))
+    if getattr(instance, "_deck_uploaded", False):
+        DeckJob.objects.create(startup=instance, deck_name=instance.pitch_deck.name)
+    search.index_startup(instance)
+    invalidate_catalogue()
+
+
+@receiver(post_delete, sender=Startup)
+def startup_deleted(sender, instance, **kwargs):
+    if instance.pitch_deck:
+        name = instance.pitch_deck.name
+        transaction.on_commit(lambda: release_pitch_deck(name))
+    if instance.deck_preview:
+        preview = instance.deck_preview.name
+        transaction.on_commit(lambda: release_deck_preview(preview))
+    search.unindex_startup(instance.pk)
+    invalidate_catalogue()
@@ -0,0 +1,106 @@
+import hashlib
+import os
+import posixpath
+import tempfile
+
+from django.conf import settings
+from django.core.files.move import file_move_safe
+from django.core.files.storage import FileSystemStorage, default_storage
+from django.db import transaction
+
+
+class FileTooLarge(ValueError):
+    pass
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    Stores each file as <upload_to>/<h[:2]>/<sha256><extension>, so identical
+    uploads share one blob. Files are never overwritten or renamed; callers
+    delete a blob only once nothing references it (see release_pitch_deck).
+    """
+
+    CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, *args, max_size=None, extension="", **kwargs):
+        super().__init__(*args, **kwargs)
+        self.max_size = max_size
+        # fixed rather than the client's, which is neither trusted nor bounded
+        self.extension = extension
+
+    def get_available_name(self, name, max_length=None):
+        # the final name comes from the content hash in _save
+        return name
+
+    def _stream_to_temp(self, content, directory):
+        hasher = hashlib.sha256()
+        size = 0
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".upload")
+        try:
+            with os.fdopen(fd, "wb") as out:
+                for chunk in content.chunks(self.CHUNK_SIZE):
+                    if isinstance(chunk, str):
+                        chunk = chunk.encode()
+                    size += len(chunk)
+                    if self.max_size is not None and size > self.max_size:
+                        raise FileTooLarge(f"File exceeds {self.max_size} bytes.")
+                    hasher.update(chunk)
+                    out.write(chunk)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+        return tmp_path, hasher.hexdigest()
+
+    def _save(self, name, content):
+        directory = posixpath.dirname(name)
+        os.makedirs(self.path(directory or "."), exist_ok=True)
+
+        # HashingUploadHandler already hashed the upload on its way in
+        digest = getattr(content, "sha256", None)
+        if digest and hasattr(content, "temporary_file_path"):
+            source, tmp_path = content.temporary_file_path(), None
+        else:
+            tmp_path, digest = self._stream_to_temp(content, self.path(directory or "."))
+            source = tmp_path
+
+        name = posixpath.join(directory, digest[:2], digest + self.extension)
+        full_path = self.path(name)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+
+        if os.path.exists(full_path):
+            # same content already stored: share the blob
+            if tmp_path:
+                os.remove(tmp_path)
+        else:
+            file_move_safe(source, full_path, allow_overwrite=True)
+            if self.file_permissions_mode is not None:
+                os.chmod(full_path, self.file_permissions_mode)
+        return name
+
+
+def pitch_deck_storage():
+    return ContentAddressedStorage(max_size=settings.PITCH_DECK_MAX_SIZE, extension=".pdf")
+
+
+def _release(field, storage, name):
+    from .models import Startup
+
+    if not name:
+        return
+    # check and delete inside one write transaction (IMMEDIATE on SQLite,
+    # so it holds the write lock): an upload of the same content, which
+    # saves inside its own (see StartupListCreate), either commits its
+    # reference first or finds the blob gone and writes it again
+    with transaction.atomic():
+        if not Startup.objects.filter(**{field: name}).exists():
+            storage.delete(name)
+
+
+def release_pitch_deck(name):
+    """Delete the blob `name` once no startup references it any more."""
+    _release("pitch_deck", pitch_deck_storage(), name)
+
+
+def release_deck_preview(name):
+    """Delete the deck preview `name` once no startup references it any more."""
+    _release("deck_preview", default_storage, name)
@@ -0,0 +1,82 @@
+"""
+Canonical tag names shared by industries and skills.
+
+A tag's key is its name with whitespace collapsed and case folded, so
+"FinTech ", "fintech" and "Fintech" are one tag; the first spelling of a
+key names it. Comma-separated text columns (skills, industries of
+interest) keep a copy of their tags' names, which is what the read path
+serves; the tag tables are what matching and filtering join on.
+"""
+from django.utils.datastructures import MultiValueDict
+from rest_framework import serializers
+
+
+TAG_MAX_LENGTH = 255
+
+
+def canonical(name):
+    return " ".join(name.split())
+
+
+def tag_key(name):
+    return canonical(name).casefold()
+
+
+def split_tags(value):
+    """
+    Canonical names from a comma-separated string or a list of names, in
+    order, keeping the first spelling of each key.
+    """
+    if isinstance(value, str):
+        value = value.split(",")
+    names, seen = [], set()
+    for name in value:
+        name = canonical(name)
+        key = name.casefold()
+        if name and key not in seen:
+            seen.add(key)
+            names.append(name)
+    return names
+
+
+def join_tags(names):
+    return ", ".join(names)
+
+
+class TagListField(serializers.Field):
+    """
+    A comma-separated tag column as a list of names. Writes take a list or,
+    as before, a comma-separated string; the model swaps in the tags'
+    canonical names on save.
+    """
+
+    default_error_messages = {
+        "invalid": "Expected a list of names or a comma-separated string.",
+        "max_length": "Ensure the names total no more than {max_length} characters.",
+        "max_tag_length": "Ensure each name has no more than {max_length} characters.",
+    }
+
+    def __init__(self, max_length=None, **kwargs):
+        self.max_length = max_length
+        super().__init__(**kwargs)
+
+    def get_value(self, dictionary):
+        # form posts repeat the key: skills=Sales&skills=Design
+        if isinstance(dictionary, MultiValueDict) and len(dictionary.getlist(self.field_name)) > 1:
+            return dictionary.getlist(self.field_name)
+        return super().get_value(dictionary)
+
+    def to_internal_value(self, data):
+        if not isinstance(data, (str, list, tuple)) or not all(isinstance(n, str) for n in data):
+            self.fail("invalid")
+        # a comma inside a list item would split on the next read anyway
+        names = split_tags(data if isinstance(data, str) else ",".join(data))
+        if any(len(name) > TAG_MAX_LENGTH for name in names):
+            self.fail("max_tag_length", max_length=TAG_MAX_LENGTH)
+        text = join_tags(names)
+        if self.max_length is not None and len(text) > self.max_length:
+            self.fail("max_length", max_length=self.max_length)
+        return text
+
+    def to_representation(self, value):
+        return split_tags(value)
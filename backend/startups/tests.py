@@ -1,3 +1,251 @@
-from django.test import TestCase
+import os
+import shutil
+import tempfile
+from concurrent.futures.process import BrokenProcessPool
+from datetime import timedelta
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.files.storage import default_storage
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from profiles.models import InvestorProfile
+
+from .cache import get_cache
+from .jobs import complete_job, requeue_stale, run_batch
+from .models import DeckJob, Startup
+from .search import search_ids
+
+
+class TempMediaMixin:
+    def setUp(self):
+        media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=media)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+
+class PitchDeckDownloadTests(TempMediaMixin, TestCase):
+    DECK = b"%PDF-1.4 " + bytes(range(256)) * 4
+
+    def setUp(self):
+        super().setUp()
+        self.founder = User.objects.create_user("founder", password="pw")
+        self.startup = Startup.objects.create(founder=self.founder, name="Deck Co", funding_goal=1000)
+        self.startup.pitch_deck.save("deck.pdf", ContentFile(self.DECK))
+        self.client = APIClient()
+        self.client.force_authenticate(self.founder)
+        self.url = f"/api/startups/{self.startup.pk}/pitch-deck/"
+
+    def test_pdf_accept_header_is_served(self):
+        response = self.client.get(self.url, HTTP_ACCEPT="application/pdf")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b"".join(response.streaming_content), self.DECK)
+
+    def test_range_with_pdf_accept_header(self):
+        response = self.client.get(self.url, HTTP_ACCEPT="application/pdf", HTTP_RANGE="bytes=10-19")
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(b"".join(response.streaming_content), self.DECK[10:20])
+        self.assertEqual(response["Content-Range"], f"bytes 10-19/{len(self.DECK)}")
+
+    def test_errors_still_render_as_json(self):
+        self.startup.pitch_deck.delete()
+        response = self.client.get(self.url, HTTP_ACCEPT="application/pdf")
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response["Content-Type"], "application/json")
+
+    def test_only_the_founder_and_investors_can_download(self):
+        other = User.objects.create_user("other", password="pw")
+        self.client.force_authenticate(other)
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+
+        investor = User.objects.create_user("investor", password="pw")
+        InvestorProfile.objects.create(user=investor, full_name="Investor")
+        self.client.force_authenticate(investor)
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+
+    def test_content_addressed_name_is_a_strong_etag(self):
+        digest = os.path.splitext(os.path.basename(self.startup.pitch_deck.name))[0]
+        response = self.client.get(self.url, HTTP_RANGE="bytes=0-9", HTTP_IF_RANGE=f'"{digest}"')
+        self.assertEqual(response["ETag"], f'"{digest}"')
+        self.assertEqual(response.status_code, 206)
+
+    def test_other_names_get_a_weak_etag(self):
+        deck = self.startup.pitch_deck
+        legacy = "pitch_decks/legacy.pdf"
+        with open(deck.storage.path(legacy), "wb") as f:
+            f.write(self.DECK)
+        Startup.objects.filter(pk=self.startup.pk).update(pitch_deck=legacy)
+
+        response = self.client.get(self.url)
+        etag = response["ETag"]
+        self.assertTrue(etag.startswith("W/"), etag)
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        # a weak validator never satisfies If-Range: the whole file comes back
+        response = self.client.get(self.url, HTTP_RANGE="bytes=0-9", HTTP_IF_RANGE=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b"".join(response.streaming_content), self.DECK)
+
+
+class PitchDeckUploadTests(TempMediaMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.founder = User.objects.create_user("founder", password="pw")
+        self.client = APIClient()
+        self.client.force_authenticate(self.founder)
+
+    def upload(self, filename):
+        deck = SimpleUploadedFile(filename, b"%PDF-1.4 same deck", content_type="application/pdf")
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                "/api/startups/", {"name": "Deck Co", "funding_goal": "1000", "pitch_deck": deck}
+            )
+        self.assertEqual(response.status_code, 201, response.content)
+        return Startup.objects.get(pk=response.json()["id"])
+
+    def test_stored_name_has_a_fixed_extension(self):
+        startup = self.upload("deck." + "x" * 40)
+        self.assertTrue(startup.pitch_deck.name.endswith(".pdf"))
+        self.assertLessEqual(len(startup.pitch_deck.name), 100)
+
+    def test_shared_blob_outlives_one_of_its_startups(self):
+        first, second = self.upload("a.pdf"), self.upload("b.PDF")
+        self.assertEqual(first.pitch_deck.name, second.pitch_deck.name)
+        with self.captureOnCommitCallbacks(execute=True):
+            first.delete()
+        self.assertTrue(second.pitch_deck.storage.exists(second.pitch_deck.name))
+        with self.captureOnCommitCallbacks(execute=True):
+            second.delete()
+        self.assertFalse(second.pitch_deck.storage.exists(second.pitch_deck.name))
+
+
+class BrokenExecutor:
+    def submit(self, *args):
+        raise BrokenProcessPool("A process in the process pool was terminated abruptly")
+
+
+class DeckJobTests(TempMediaMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        founder = User.objects.create_user("founder", password="pw")
+        self.startup = Startup.objects.create(
+            founder=founder, name="Deck Co", funding_goal=1000,
+            pitch_deck=ContentFile(b"%PDF-1.4 deck", name="deck.pdf"),
+        )
+        self.job = DeckJob.objects.get(startup=self.startup)
+
+    def test_stale_jobs_fail_once_out_of_attempts(self):
+        long_ago = timezone.now() - timedelta(hours=1)
+        DeckJob.objects.filter(pk=self.job.pk).update(status="running", attempts=3, updated_at=long_ago)
+        self.assertEqual(requeue_stale(timedelta(minutes=10)), 0)
+        self.job.refresh_from_db()
+        self.startup.refresh_from_db()
+        self.assertEqual(self.job.status, "failed")
+        self.assertEqual(self.startup.deck_status, "failed")
+
+        DeckJob.objects.filter(pk=self.job.pk).update(status="running", attempts=1, updated_at=long_ago)
+        self.assertEqual(requeue_stale(timedelta(minutes=10)), 1)
+
+    def test_broken_pool_fails_the_batch_and_is_raised(self):
+        with self.assertRaises(BrokenProcessPool):
+            run_batch(BrokenExecutor(), 10)
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.status, "pending")
+        self.assertEqual(self.job.attempts, 1)
+        self.assertIn("BrokenProcessPool", self.job.last_error)
+
+    def test_removing_the_deck_clears_its_results_and_preview(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            complete_job(self.job, {"pages": 4, "text": "hello", "preview": b"\x89PNG"})
+        self.startup.refresh_from_db()
+        preview = self.startup.deck_preview.name
+        self.assertTrue(default_storage.exists(preview))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.startup.pitch_deck = None
+            self.startup.save()
+        self.startup.refresh_from_db()
+        self.assertIsNone(self.startup.deck_pages)
+        self.assertFalse(self.startup.deck_preview)
+        self.assertFalse(default_storage.exists(preview))
+
+
+class SearchTests(TestCase):
+    def setUp(self):
+        self.founder = User.objects.create_user("founder", password="pw")
+        self.client = APIClient()
+        self.client.force_authenticate(self.founder)
+
+    def create(self, name, **fields):
+        return Startup.objects.create(founder=self.founder, name=name, funding_goal=1000, **fields)
+
+    def test_saving_indexes_and_deleting_unindexes(self):
+        startup = self.create("Heliostat")
+        self.assertEqual(search_ids("helio", 10), [startup.pk])
+
+        startup.name = "Windmill"
+        startup.save()
+        self.assertEqual(search_ids("helio", 10), [])
+        self.assertEqual(search_ids("windmill", 10), [startup.pk])
+
+        startup.delete()
+        self.assertEqual(search_ids("windmill", 10), [])
+
+    def test_results_are_in_rank_order(self):
+        in_description = self.create("Gridline", description="Solar panel leasing")
+        in_name = self.create("Solar Roofs")
+        in_location = self.create("Northwind", location="Solar City")
+        self.create("Unrelated")
+        self.assertEqual(search_ids("solar", 10), [in_name.pk, in_location.pk, in_description.pk])
+        self.assertEqual(search_ids("solar", 2), [in_name.pk, in_location.pk])
+
+        data = self.client.get("/api/investors/search/", {"q": "solar", "fields": "id"}).json()
+        self.assertEqual([row["id"] for row in data["results"]], [in_name.pk, in_location.pk, in_description.pk])
+
+    def test_fts_syntax_in_the_query_is_treated_as_text(self):
+        startup = self.create("Near Field Labs")
+        for q in ['"', '"near', "near*", "*", "NEAR(near field)", "near AND OR NOT", "-field", "^near", "near:", "(", '""']:
+            with self.subTest(q=q):
+                response = self.client.get("/api/investors/search/", {"q": q, "fields": "id"})
+                self.assertEqual(response.status_code, 200)
+        data = self.client.get("/api/investors/search/", {"q": 'NEAR("near" field*)', "fields": "id"}).json()
+        self.assertEqual([row["id"] for row in data["results"]], [startup.pk])
+
+
+class CatalogueCacheTests(TestCase):
+    def setUp(self):
+        get_cache().clear()
+        self.founder = User.objects.create_user("founder", password="pw")
+        self.startup = Startup.objects.create(founder=self.founder, name="Before", funding_goal=1000)
+        self.client = APIClient()
+        self.client.force_authenticate(self.founder)
+        self.detail = f"/api/startups/{self.startup.pk}/"
+        self.browse = "/api/investors/browse/"
+
+    def names(self):
+        return self.client.get(self.browse).json()["results"][0]["name"], self.client.get(self.detail).json()["name"]
+
+    def test_payloads_are_served_from_the_cache(self):
+        self.names()
+        with self.assertNumQueries(0):
+            self.assertEqual(self.names(), ("Before", "Before"))
+
+    def test_write_invalidates_browse_and_detail(self):
+        self.assertEqual(self.names(), ("Before", "Before"))
+        response = self.client.put(self.detail, {"name": "After"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.names(), ("After", "After"))
+
+        self.startup.delete()
+        self.assertEqual(self.client.get(self.browse).json()["results"], [])
+        self.assertEqual(self.client.get(self.detail).status_code, 404)
+
+    def test_counters_live_outside_the_shared_directory(self):
+        location = caches["versions"]._dir
+        self.assertNotEqual(os.path.abspath(location), os.path.abspath(settings.VERSION_CACHE_DIR))
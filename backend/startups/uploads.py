@@ -0,0 +1,54 @@
+import hashlib
+
+from django.conf import settings
+from django.core.files.uploadhandler import SkipFile, TemporaryFileUploadHandler
+
+
+class HashingUploadHandler(TemporaryFileUploadHandler):
+    """
+    Streams uploads to a temporary file while hashing them, so storage can
+    file them under their SHA-256 without reading them again. Files over
+    PITCH_DECK_MAX_SIZE are dropped as soon as the limit is crossed and
+    listed in `request.oversized_uploads`.
+    """
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.hasher = hashlib.sha256()
+        self.received = 0
+
+    def receive_data_chunk(self, raw_data, start):
+        self.received += len(raw_data)
+        if self.received > settings.PITCH_DECK_MAX_SIZE:
+            if not hasattr(self.request, "oversized_uploads"):
+                self.request.oversized_uploads = []
+            self.request.oversized_uploads.append(self.field_name)
+            raise SkipFile()
+        self.hasher.update(raw_data)
+        return super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size):
+        file = super().file_complete(file_size)
+        file.sha256 = self.hasher.hexdigest()
+        return file
+
+
+class HashedUploadsMixin:
+    """
+    Parses this view's uploads with HashingUploadHandler, in place of the
+    project-wide FILE_UPLOAD_HANDLERS. Its views stay csrf_exempt (as DRF's
+    are), so nothing reads the body before the handlers are swapped.
+    """
+
+    def initialize_request(self, request, *args, **kwargs):
+        request.upload_handlers = [HashingUploadHandler(request)]
+        return super().initialize_request(request, *args, **kwargs)
+
+
+def oversized_error(request):
+    """Error payload for uploads dropped by HashingUploadHandler, or None."""
+    fields = getattr(request, "oversized_uploads", None)
+    if not fields:
+        return None
+    limit_mb = settings.PITCH_DECK_MAX_SIZE / (1024 * 1024)
+    return {field: [f"File exceeds the {limit_mb:g} MB limit."] for field in fields}
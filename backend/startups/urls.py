@@ -1,7 +1,8 @@
 from django.urls import path
-from .views import StartupListCreate,StartupDetail
+from .views import StartupListCreate,StartupDetail,PitchDeckDownload
 
 urlpatterns = [
     path("", StartupListCreate.as_view(), name="startup-list-create"),
     path("<int:pk>/", StartupDetail.as_view(), name="startup-detail"),
+    path("<int:pk>/pitch-deck/", PitchDeckDownload.as_view(), name="startup-pitch-deck"),
 ]
@@ -1,51 +1,105 @@
+import os
+
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status, permissions
 from .models import Startup
 from .serializers import StartupSerializer
+from .cache import CATALOGUE, cached_json, conditional
+from .fieldsets import InvalidFieldset, fieldsets_key, parse_fieldsets
+from .projection import json_response, projection
+from .downloads import FileContentNegotiation, serve_file
+from .uploads import HashedUploadsMixin, oversized_error
+from django.db import transaction
+from django.http import Http404
 from django.shortcuts import get_object_or_404
+from django.utils.text import slugify
 from rest_framework.parsers import MultiPartParser, FormParser
 
 
-class StartupListCreate(APIView):
+class StartupListCreate(HashedUploadsMixin, APIView):
     permission_classes = [permissions.IsAuthenticated]
     parser_classes = [MultiPartParser, FormParser]  # <- add this
 
-
+    @conditional(CATALOGUE)
     def get(self, request):
+        try:
+            rows = projection(StartupSerializer, *parse_fieldsets(request.query_params))
+        except InvalidFieldset as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
         startups = Startup.objects.filter(founder=request.user)
-        serializer = StartupSerializer(startups, many=True)
-        return Response(serializer.data)
+        return json_response(rows.rows(startups))
 
     def post(self, request):
         serializer = StartupSerializer(data=request.data)
+        if oversized_error(request):
+            return Response(oversized_error(request), status=status.HTTP_400_BAD_REQUEST)
         if serializer.is_valid():
-            serializer.save(founder=request.user)
+            # a shared deck blob is reused and referenced under one write
+            # lock, so release_pitch_deck can't delete it in between
+            with transaction.atomic():
+                serializer.save(founder=request.user)
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class StartupDetail(APIView):
+class StartupDetail(HashedUploadsMixin, APIView):
     permission_classes = [permissions.IsAuthenticated]
     parser_classes = [MultiPartParser, FormParser]  # <- add this
 
     def get_object(self, pk, user):
-        return get_object_or_404(Startup, pk=pk, founder=user)
+        return get_object_or_404(
+            Startup.objects.select_related("founder__founder_profile"), pk=pk, founder=user
+        )
 
+    @conditional(CATALOGUE)
     def get(self, request, pk):
-        startup = self.get_object(pk, request.user)
-        serializer = StartupSerializer(startup)
-        return Response(serializer.data)
+        try:
+            fieldsets = parse_fieldsets(request.query_params)
+            rows = projection(StartupSerializer, *fieldsets)
+        except InvalidFieldset as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return cached_json(
+            f"startup:{pk}:{request.user.pk}:{fieldsets_key(*fieldsets)}",
+            lambda: json_response(self.get_row(rows, pk, request.user)),
+        )
+
+    def get_row(self, rows, pk, user):
+        found = rows.rows(Startup.objects.filter(pk=pk, founder=user))
+        if not found:
+            raise Http404("No Startup matches the given query.")
+        return found[0]
 
     def put(self, request, pk):
         startup = self.get_object(pk, request.user)
         serializer = StartupSerializer(startup, data=request.data, partial=True)
+        if oversized_error(request):
+            return Response(oversized_error(request), status=status.HTTP_400_BAD_REQUEST)
         if serializer.is_valid():
-            serializer.save(founder=request.user)
+            with transaction.atomic():
+                serializer.save(founder=request.user)
             return Response(serializer.data)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
     def delete(self, request, pk):
         startup = self.get_object(pk, request.user)
         startup.delete()
-        return Response(status=status.HTTP_204_NO_CONTENT)
\ No newline at end of file
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+# Pitch deck download for the founder and investors, with Range / conditional support
+class PitchDeckDownload(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+    content_negotiation_class = FileContentNegotiation
+
+    def get(self, request, pk):
+        startups = Startup.objects.only("id", "name", "pitch_deck")
+        if not hasattr(request.user, "investor_profile"):
+            # investors browse every deck; founders only their own
+            startups = startups.filter(founder=request.user)
+        startup = get_object_or_404(startups, pk=pk)
+        deck = startup.pitch_deck
+        if not deck or not deck.storage.exists(deck.name):
+            raise Http404("No pitch deck uploaded.")
+        ext = os.path.splitext(deck.name)[1]
+        return serve_file(request, deck.storage, deck.name, f"{slugify(startup.name) or 'pitch-deck'}{ext}")
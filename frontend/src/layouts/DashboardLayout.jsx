@@ -1,6 +1,7 @@
 import { useEffect, useState } from "react";
 import { useNavigate } from "react-router-dom";
 import Sidebar from "../components/Sidebar";
+import api from "../utils/api";
 
 export default function DashboardLayout({ children }) {
     const [user, setUser] = useState(null);
@@ -20,7 +21,12 @@ export default function DashboardLayout({ children }) {
         }
     }, [navigate]);
 
-    function handleLogout() {
+    async function handleLogout() {
+        try {
+            await api.post("signout/"); // revokes the bearer token
+        } catch (err) {
+            console.error("Signout failed", err);
+        }
         localStorage.clear();
         navigate("/signin");
     }
@@ -41,6 +41,7 @@ export default function Signin() {
                 localStorage.setItem("isAuthenticated", "true");
                 localStorage.setItem("username", res.data.username);
                 localStorage.setItem("role", res.data.role);
+                if (res.data.token) localStorage.setItem("token", res.data.token);
 
                 if (res.data.role === "Founder") {
                     navigate("/dashboard/founder");
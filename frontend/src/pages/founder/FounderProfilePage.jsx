@@ -1,5 +1,6 @@
 import React, { useEffect, useState, useRef } from "react";
 import api from "../../utils/api";
+import { tagText } from "../../utils/tags";
 import { Card, CardContent } from "../../components/ui/Card";
 import Button from "../../components/ui/Button";
 import DashboardLayout from "../../layouts/DashboardLayout";
@@ -272,7 +273,7 @@ export default function FounderProfilePage() {
                                         <label className="text-xs text-gray-300 mb-2 block">Key skills (comma separated)</label>
                                         <input
                                             name="skills"
-                                            value={profile.skills || ""}
+                                            value={tagText(profile.skills)}
                                             onChange={handleChange}
                                             placeholder="Marketing, Growth..."
                                             className="w-full p-3 rounded-xl bg-[#0F1724] text-white border border-white/6"
@@ -363,7 +364,7 @@ export default function FounderProfilePage() {
 
                                         <div>
                                             <div className="text-xs text-gray-400">Skills</div>
-                                            <div className="text-base text-white mt-1">{profile.skills || "Not provided"}</div>
+                                            <div className="text-base text-white mt-1">{tagText(profile.skills) || "Not provided"}</div>
                                         </div>
                                     </div>
                                 </div>
@@ -1,6 +1,7 @@
 import { useEffect, useState, useRef } from "react";
 import DashboardLayout from "../../layouts/DashboardLayout";
 import api from "../../utils/api";
+import { tagText } from "../../utils/tags";
 import Button from "../../components/ui/Button";
 import {
     Globe,
@@ -21,6 +22,8 @@ import { motion, AnimatePresence } from "framer-motion";
 export default function BrowseStartups() {
     const [startups, setStartups] = useState([]);
     const [loading, setLoading] = useState(false);
+    const [nextCursor, setNextCursor] = useState(null);
+    const [loadingMore, setLoadingMore] = useState(false);
     const [pendingRequests, setPendingRequests] = useState({}); // id -> 'sending' | true
     const [savedSet, setSavedSet] = useState(new Set()); // set of startup ids saved by current user
     const [amountInputs, setAmountInputs] = useState({});
@@ -68,16 +71,18 @@ export default function BrowseStartups() {
     // -----------------------
     // Data fetching
     // -----------------------
-    const fetchStartups = async () => {
-        setLoading(true);
+    const fetchStartups = async (cursor = null) => {
+        cursor ? setLoadingMore(true) : setLoading(true);
         try {
-            const res = await api.get("investors/browse/");
-            setStartups(Array.isArray(res.data) ? res.data : []);
+            const res = await api.get("investors/browse/", { params: cursor ? { cursor } : {} });
+            const page = Array.isArray(res.data) ? res.data : res.data?.results ?? [];
+            setStartups((prev) => (cursor ? [...prev, ...page] : page));
+            setNextCursor(res.data?.next ?? null);
         } catch (err) {
             console.error("Failed to fetch startups", err);
             addToast("error", "Load failed", "Could not load startups (see console)");
         } finally {
-            setLoading(false);
+            cursor ? setLoadingMore(false) : setLoading(false);
         }
     };
 
@@ -447,6 +452,14 @@ export default function BrowseStartups() {
                     </div>
                 )}
 
+                {!loading && nextCursor && (
+                    <div className="flex justify-center mt-6">
+                        <Button onClick={() => fetchStartups(nextCursor)} disabled={loadingMore} variant="secondary">
+                            {loadingMore ? "Loading…" : "Load more"}
+                        </Button>
+                    </div>
+                )}
+
                 {/* founder modal */}
                 <AnimatePresence>
                     {selectedFounder && (
@@ -475,7 +488,7 @@ export default function BrowseStartups() {
                                     {selectedFounder.full_name && <div><strong>Name:</strong> {selectedFounder.full_name}</div>}
                                     {selectedFounder.email && <div><strong>Email:</strong> {selectedFounder.email}</div>}
                                     {selectedFounder.bio && <div><strong>Bio:</strong> {selectedFounder.bio}</div>}
-                                    {selectedFounder.skills && <div><strong>Skills:</strong> {selectedFounder.skills}</div>}
+                                    {tagText(selectedFounder.skills) && <div><strong>Skills:</strong> {tagText(selectedFounder.skills)}</div>}
                                     {selectedFounder.linkedin && (
                                         <div>
                                             <strong>LinkedIn:</strong>{" "}
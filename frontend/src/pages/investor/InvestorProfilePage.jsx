@@ -1,5 +1,6 @@
 import { useEffect, useState, useRef } from "react";
 import api from "../../utils/api";
+import { tagText } from "../../utils/tags";
 import { Card, CardContent } from "../../components/ui/Card";
 import Button from "../../components/ui/Button";
 import DashboardLayout from "../../layouts/DashboardLayout";
@@ -251,7 +252,7 @@ export default function InvestorProfilePage() {
                                     </label>
                                     <input
                                         name="industries_of_interest"
-                                        value={profile.industries_of_interest || ""}
+                                        value={tagText(profile.industries_of_interest)}
                                         onChange={handleChange}
                                         className="w-full p-3 rounded-lg bg-[#0F1724] text-white border border-white/6 placeholder:text-gray-400"
                                         placeholder="SaaS, Fintech, Health..."
@@ -340,7 +341,7 @@ export default function InvestorProfilePage() {
                                         </div>
                                         <div>
                                             <div className="text-xs text-gray-400">Industries of interest</div>
-                                            <div className="text-base text-white">{profile.industries_of_interest || "Not provided"}</div>
+                                            <div className="text-base text-white">{tagText(profile.industries_of_interest) || "Not provided"}</div>
                                         </div>
                                     </div>
                                 </div>
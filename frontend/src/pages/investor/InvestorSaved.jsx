@@ -1,6 +1,7 @@
 import { useState, useEffect, useRef } from "react";
 import DashboardLayout from "../../layouts/DashboardLayout";
 import api from "../../utils/api";
+import { tagText } from "../../utils/tags";
 import Button from "../../components/ui/Button";
 import {
     Globe,
@@ -388,7 +389,7 @@ export default function InvestorSaved() {
                                 {selectedFounder.full_name && <p><strong>Name:</strong> {selectedFounder.full_name}</p>}
                                 {selectedFounder.email && <p><strong>Email:</strong> {selectedFounder.email}</p>}
                                 {selectedFounder.bio && <p><strong>Bio:</strong> {selectedFounder.bio}</p>}
-                                {selectedFounder.skills && <p><strong>Skills:</strong> {selectedFounder.skills}</p>}
+                                {tagText(selectedFounder.skills) && <p><strong>Skills:</strong> {tagText(selectedFounder.skills)}</p>}
                                 {selectedFounder.linkedin && (
                                     <p>
                                         <strong>LinkedIn:</strong>{" "}
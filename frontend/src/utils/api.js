@@ -11,6 +11,11 @@ api.interceptors.request.use((config) => {
     if (csrfToken) {
         config.headers["X-CSRFToken"] = csrfToken;
     }
+    // signed bearer token from signin (verified without a DB hit)
+    const token = localStorage.getItem("token");
+    if (token) {
+        config.headers["Authorization"] = `Bearer ${token}`;
+    }
     return config;
 });
 
@@ -0,0 +1,3 @@
+// skills / industries_of_interest come back as lists of names; inputs and
+// labels show them comma-separated, which the API also accepts back
+export const tagText = (value) => (Array.isArray(value) ? value.join(", ") : value || "");